@@ -20,9 +20,18 @@
 from __future__ import absolute_import
 import base64
 import struct
+
+from numpy import frombuffer, empty, dtype as np_dtype
 from six.moves import range
 from six.moves import zip
 
+STRUCT_TO_NUMPY = {'f': 'f4', 'd': 'f8',
+                   'h': 'i2', 'H': 'u2',
+                   'i': 'i4', 'I': 'u4',
+                   'l': 'i4', 'L': 'u4',
+                   'q': 'i8', 'Q': 'u8',
+                   'b': 'i1', 'B': 'u1'}
+
 
 def format_blob(blob):
     return base64.b64decode(blob)
@@ -33,6 +42,32 @@ def encode_blob(blob):
     return base64.b64encode(blob)
 
 
+def fmt_to_dtype(fmt):
+    """
+        convert a struct format string e.g. ">ff" into an equivalent structured numpy dtype.
+        return None if the format cannot be represented
+    """
+    endianness = '='
+    if fmt and fmt[0] in '<>!=@':
+        endianness, fmt = fmt[0], fmt[1:]
+        if endianness == '!':
+            endianness = '>'
+        elif endianness == '@':
+            endianness = '='
+
+    try:
+        fields = [('f{}'.format(i), '{}{}'.format(endianness, STRUCT_TO_NUMPY[c])) for i, c in enumerate(fmt)]
+    except KeyError:
+        return
+
+    if fields:
+        return np_dtype(fields)
+
+
+def xy_dtype(endianness='>'):
+    return np_dtype([('x', '{}f4'.format(endianness)), ('y', '{}f4'.format(endianness))])
+
+
 def pack(fmt, data):
     """
     data should be something like [(x0,y0),(x1,y1), (xN,yN)]
@@ -40,9 +75,15 @@ def pack(fmt, data):
     @param data:
     @return:
     """
-    # if len(args) > 1:
-    #     args = zip(args)
-    return ''.join([struct.pack(fmt, *datum) for datum in data])
+    dt = fmt_to_dtype(fmt)
+    if dt is None:
+        return b''.join([struct.pack(fmt, *datum) for datum in data])
+
+    data = [tuple(datum) for datum in data]
+    a = empty(len(data), dtype=dt)
+    if data:
+        a[:] = data
+    return a.tobytes()
 
 
 def unpack(blob, fmt='>ff', step=8, decode=False):
@@ -50,19 +91,56 @@ def unpack(blob, fmt='>ff', step=8, decode=False):
         blob = format_blob(blob)
 
     if blob:
-        try:
-            return list(zip(*[struct.unpack(fmt, blob[i:i + step]) for i in range(0, len(blob), step)]))
-        except struct.error:
-            ret = []
-            for i in range(0, len(blob), step):
-                try:
-                    args = struct.unpack(fmt, blob[i:i+step])
-                except struct.error:
-                    break
-                ret.append(args)
-            return list(zip(*ret))
+        dt = fmt_to_dtype(fmt)
+        if dt is None or dt.itemsize != step:
+            return _struct_unpack(blob, fmt, step)
+
+        # ignore a trailing partial record
+        n = len(blob) // step
+        a = frombuffer(blob, dtype=dt, count=n)
+        return [tuple(a[name].tolist()) for name in dt.names] if n else []
+    else:
+        return [[] for _ in range(fmt.count('f'))]
+
+
+def unpack_xy(blob, endianness='>', reverse=False):
+    """
+        decode a blob of packed (x, y) float32 pairs.
+
+        the blob is viewed in place using a structured dtype and only copied once when converting
+        to native float64 arrays
 
+        raises ValueError if the blob is not a whole number of pairs
+    """
+    a = frombuffer(blob, dtype=xy_dtype(endianness))
+    xs, ys = a['x'].astype(float), a['y'].astype(float)
+    if reverse:
+        return ys, xs
     else:
-        return [[] for _ in fmt.count('f')]
+        return xs, ys
+
+
+def pack_xy(xs, ys, endianness='>'):
+    """
+        encode xs, ys as a blob of packed (x, y) float32 pairs
+    """
+    a = empty(len(xs), dtype=xy_dtype(endianness))
+    a['x'] = xs
+    a['y'] = ys
+    return a.tobytes()
+
+
+def _struct_unpack(blob, fmt, step):
+    try:
+        return list(zip(*[struct.unpack(fmt, blob[i:i + step]) for i in range(0, len(blob), step)]))
+    except struct.error:
+        ret = []
+        for i in range(0, len(blob), step):
+            try:
+                args = struct.unpack(fmt, blob[i:i + step])
+            except struct.error:
+                break
+            ret.append(args)
+        return list(zip(*ret))
 
 # ============= EOF =============================================
@@ -29,6 +29,21 @@ from six.moves import map
 from six.moves import range
 
 
+def replace_file(src, dst):
+    """
+        rename src to dst replacing dst if it exists. os.replace is not available on python 2 and os.rename does not
+        replace an existing file on windows
+    """
+    try:
+        replace = os.replace
+    except AttributeError:
+        if sys.platform == 'win32' and os.path.isfile(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+    else:
+        replace(src, dst)
+
+
 def subdirize(root, name, n=1, l=2, mode='r'):
     for i in range(n):
 
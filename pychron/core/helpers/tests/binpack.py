@@ -0,0 +1,54 @@
+from __future__ import absolute_import
+import struct
+import unittest
+
+from pychron.core.helpers.binpack import unpack, pack, unpack_xy, pack_xy
+
+
+def struct_pack_xy(xs, ys, endianness='>'):
+    return b''.join([struct.pack('{}ff'.format(endianness), x, y) for x, y in zip(xs, ys)])
+
+
+class BinpackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.xs = [0.1 * i for i in range(300)]
+        self.ys = [10.0 + 0.0137 * i ** 1.5 for i in range(300)]
+
+    def test_pack_xy(self):
+        for e in '<>':
+            self.assertEqual(pack_xy(self.xs, self.ys, e), struct_pack_xy(self.xs, self.ys, e))
+
+    def test_unpack_xy(self):
+        for e in '<>':
+            blob = struct_pack_xy(self.xs, self.ys, e)
+            x, y = zip(*[struct.unpack('{}ff'.format(e), blob[i:i + 8]) for i in range(0, len(blob), 8)])
+            xs, ys = unpack_xy(blob, e)
+            self.assertEqual(list(x), xs.tolist())
+            self.assertEqual(list(y), ys.tolist())
+
+    def test_unpack_xy_reverse(self):
+        blob = struct_pack_xy(self.xs, self.ys)
+        ys, xs = unpack_xy(blob, reverse=True)
+        self.assertAlmostEqual(xs[10], self.xs[10], 5)
+        self.assertAlmostEqual(ys[10], self.ys[10], 5)
+
+    def test_unpack_xy_partial(self):
+        blob = struct_pack_xy(self.xs, self.ys)
+        self.assertRaises(ValueError, unpack_xy, blob[:-2])
+
+    def test_unpack(self):
+        blob = struct_pack_xy(self.xs, self.ys)
+        x, y = zip(*[struct.unpack('>ff', blob[i:i + 8]) for i in range(0, len(blob), 8)])
+        self.assertEqual(unpack(blob), [x, y])
+
+        # trailing partial records are ignored
+        self.assertEqual(unpack(blob + b'\x00\x01'), [x, y])
+
+    def test_pack(self):
+        data = list(zip(self.xs, self.ys))
+        self.assertEqual(pack('<ff', data), struct_pack_xy(self.xs, self.ys, '<'))
+        self.assertEqual(unpack(pack('>HH', [(1, 2), (3, 4)]), '>HH', step=4), [(1, 3), (2, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,17 +16,49 @@
 
 # ============= enthought library imports =======================
 # ============= standard library imports ========================
+from __future__ import absolute_import
+from collections import deque
+from multiprocessing.pool import ThreadPool
+from types import GeneratorType
+
 # ============= local library imports  ==========================
 
-from __future__ import absolute_import
-from pychron.core.ui.progress_dialog import myProgressDialog
+DEFAULT_WORKERS = 4
 
 
 class CancelLoadingError(BaseException):
     pass
 
 
+class ProgressRecorder(object):
+    """
+        stand in for the progress dialog passed to func when func runs on a worker thread. calls that update the
+        dialog are recorded and replayed on the calling thread in item order. everything else, e.g. canceled, is
+        read from the dialog
+    """
+    recorded = ('change_message', 'increment', 'increase_max', 'update')
+
+    def __init__(self, progress):
+        self._progress = progress
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name in self.recorded:
+            def record(*args, **kw):
+                self.calls.append((name, args, kw))
+
+            return record
+
+        return getattr(self._progress, name)
+
+    def replay(self):
+        for name, args, kw in self.calls:
+            getattr(self._progress, name)(*args, **kw)
+
+
 def open_progress(n, close_at_end=True, busy=False, **kw):
+    from pychron.core.ui.progress_dialog import myProgressDialog
+
     if busy:
         mi, ma = 0, 0
     else:
@@ -40,9 +72,86 @@ def open_progress(n, close_at_end=True, busy=False, **kw):
     return pd
 
 
+def _use_progress(i, n, step):
+    return i == 0 or i == n - 1 or not i % step
+
+
+def _call(func, x, prog, i, n):
+    r = func(x, prog, i, n)
+    if isinstance(r, GeneratorType):
+        # consume generators on the worker not the calling thread
+        r = list(r)
+    return r
+
+
+def _make_pool(executor, workers):
+    if executor == 'process':
+        from multiprocessing import Pool
+        return Pool(workers)
+    elif executor == 'thread':
+        return ThreadPool(workers)
+    else:
+        raise ValueError('invalid executor "{}". use "thread" or "process"'.format(executor))
+
+
+def concurrent_results(xs, func, progress, n, step, executor, workers=None):
+    """
+        yield func(xi, prog, i, n) for each item of xs in order. the calls are made on a thread or process pool
+        with at most 2*workers items in flight.
+
+        with a thread pool prog is a ProgressRecorder. with a process pool func is not passed a progress dialog,
+        instead the progress message is set to "i/n"
+    """
+    workers = workers or DEFAULT_WORKERS
+    record = executor != 'process'
+    pool = _make_pool(executor, workers)
+    pending = deque()
+    items = enumerate(xs)
+    exhausted = False
+    try:
+        while 1:
+            while not exhausted and len(pending) < 2 * workers:
+                if progress:
+                    if progress.canceled:
+                        raise CancelLoadingError
+                    elif progress.accepted:
+                        exhausted = True
+                        break
+                try:
+                    i, x = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                prog = None
+                if progress and record and _use_progress(i, n, step):
+                    prog = ProgressRecorder(progress)
+
+                pending.append((i, prog, pool.apply_async(_call, (func, x, prog, i, n))))
+
+            if not pending:
+                break
+
+            i, prog, result = pending.popleft()
+            r = result.get()
+            if prog:
+                prog.replay()
+            elif progress and not record and _use_progress(i, n, step):
+                progress.change_message('{}/{}'.format(i + 1, n))
+
+            yield r
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+
 def progress_loader(xs, func, threshold=50, progress=None,
                     use_progress=True,
-                    reraise_cancel=False, n=None, busy=False, step=1):
+                    reraise_cancel=False, n=None, busy=False, step=1, executor=None, workers=None):
     """
         xs: list or tuple
         func: callable with signature func(xi, prog, i, n)
@@ -51,6 +160,8 @@ def progress_loader(xs, func, threshold=50, progress=None,
         threshold: trigger value to open a progress dialog i.e. if n>threshold open the dialog
         progress: an existing progress_dialog
         reraise_cancel: if canceled during iteration should the exception be reraised for all objects to handle
+        executor: None, "thread" or "process". call func concurrently on a pool of workers. see concurrent_results
+        workers: number of workers. default=DEFAULT_WORKERS
 
         return: list
 
@@ -68,17 +179,22 @@ def progress_loader(xs, func, threshold=50, progress=None,
 
     def gen():
         # if use_progress and (n > threshold or progress):
-        if progress:
+        if executor:
+            for r in concurrent_results(xs, func, progress, n, step, executor, workers):
+                if r:
+                    if hasattr(r, '__iter__'):
+                        for ri in r:
+                            yield ri
+                    else:
+                        yield r
+        elif progress:
             for i, x in enumerate(xs):
                 if progress.canceled:
                     raise CancelLoadingError
                 elif progress.accepted:
                     break
 
-                if i == 0 or i == n - 1:
-                    prog = progress
-                else:
-                    prog = None if i % step else progress
+                prog = progress if _use_progress(i, n, step) else None
 
                 r = func(x, prog, i, n)
                 if r:
@@ -116,7 +232,8 @@ def progress_loader(xs, func, threshold=50, progress=None,
             return []
 
 
-def progress_iterator(xs, func, threshold=50, progress=None, reraise_cancel=False):
+def progress_iterator(xs, func, threshold=50, progress=None, reraise_cancel=False, step=1, executor=None,
+                      workers=None):
     """
         see progress_loader documentation
 
@@ -125,7 +242,16 @@ def progress_iterator(xs, func, threshold=50, progress=None, reraise_cancel=Fals
 
     def gen(prog):
         n = len(xs)
-        if n > threshold or prog:
+        if executor:
+            if not prog and n > threshold:
+                prog = open_progress(n)
+
+            for _ in concurrent_results(xs, func, prog, n, step, executor, workers):
+                pass
+
+            if prog:
+                prog.close()
+        elif n > threshold or prog:
             if not prog:
                 prog = open_progress(n)
 
@@ -79,6 +79,16 @@ class OLSRegressor(BaseRegressor):
 
         return dot(exog, beta)
 
+    def get_prediction_matrix(self, exog):
+        """
+        return matrix M such that dot(M, endog) == fast_predict2(endog, exog). endog may be a 2D array with one
+        column per set of observations which allows many predictions to be made with a single product
+        """
+        if not hasattr(self, 'pinv_wexog'):
+            self.pinv_wexog = linalg.pinv(self._ols.wexog)
+
+        return dot(exog, self.pinv_wexog)
+
     def calculate(self, filtering=False):
         cxs = self.clean_xs
         cys = self.clean_ys
@@ -17,44 +17,68 @@
 # ============= enthought library imports =======================
 # ============= standard library imports ========================
 from __future__ import absolute_import
-from numpy import zeros, percentile, array, median
-from scipy.stats import norm
-from six.moves import range
+from multiprocessing import Pool
+
+from numpy import zeros, percentile, asarray, hstack
+from numpy.random import RandomState
 # ============= local library imports  ==========================
 
+MAX_SEED = 2 ** 31 - 1
 
-def monte_carlo_error_estimation(reg, nominal_ys, pts, ntrials=100):
-    exog = reg.get_exog(pts)
-    ys = reg.ys
-    yserr = reg.yserr
-    n = len(ys)
-    yes = array((ys, yserr)).T
-    ga = norm().rvs((ntrials, n))
-    yp = zeros(n)
-    res = zeros((ntrials, len(pts)))
 
-    pred = reg.fast_predict2
-    for i in range(ntrials):
-        res[i] = perturb(pred, exog, nominal_ys, yes, ga[i], yp)
+def monte_carlo_error_estimation(reg, nominal_ys, pts, ntrials=100, seed=None, processes=0, chunk_size=10000):
+    """
+        estimate the error of reg's predictions at pts by perturbing reg.ys by reg.yserr ntrials times.
 
-    res = res.T
-    ret = zeros(len(pts))
-    pct = (15.87, 84.13)
-    # pct = (2.27, 97.73)
-    for i, po in enumerate(pts):
-        ri = res[i]
-        ai, bi = percentile(ri, pct)
-        ret[i] = (abs(ai) + abs(bi)) * 0.5
+        all trials of a chunk are solved at once. the perturbed observations form a matrix and the predictions
+        are a single product with the prediction matrix of reg (see OLSRegressor.get_prediction_matrix)
+
+        seed: seed for the random number generator. results are reproducible for a given seed
+            independent of processes
+        processes: if > 1 chunks are evaluated in a process pool
+        chunk_size: maximum number of trials per chunk. bounds memory usage
+    """
+    m = reg.get_prediction_matrix(reg.get_exog(pts))
+    nominal_ys = asarray(nominal_ys, dtype=float)
+    ys = asarray(reg.ys, dtype=float)
+    yserr = asarray(reg.yserr, dtype=float)
+
+    ntrials = int(ntrials)
+    chunk_size = max(1, int(chunk_size))
+    nchunks = (ntrials + chunk_size - 1) // chunk_size
+    seeds = RandomState(seed).randint(0, MAX_SEED, nchunks)
 
-    return ret
+    args = [(m, nominal_ys, ys, yserr, min(chunk_size, ntrials - i * chunk_size), si)
+            for i, si in enumerate(seeds)]
 
+    if processes > 1 and nchunks > 1:
+        pool = Pool(processes=min(processes, nchunks))
+        try:
+            results = pool.map(_monte_carlo_chunk, args)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_monte_carlo_chunk(a) for a in args]
+
+    if not results:
+        return zeros(len(pts))
+
+    res = hstack(results)
+    pct = (15.87, 84.13)
+    # pct = (2.27, 97.73)
+    ai, bi = percentile(res, pct, axis=1)
+    return (abs(ai) + abs(bi)) * 0.5
 
-def perturb(pred, exog, nominal_ys, y_es, ga, yp):
-    for i, (y, e) in enumerate(y_es):
-        yp[i] = y + (e * ga[i])
 
-    pys = pred(yp, exog)
-    return nominal_ys - pys
+def _monte_carlo_chunk(args):
+    """
+        return array of shape (npts, ntrials) of nominal - perturbed predictions
+    """
+    m, nominal_ys, ys, yserr, ntrials, seed = args
+    ga = RandomState(seed).standard_normal((ntrials, ys.shape[0]))
+    yp = ys + yserr * ga
+    return nominal_ys[:, None] - m.dot(yp.T)
 
 
 # if __name__ == '__main__':
@@ -20,37 +20,67 @@
 from __future__ import absolute_import
 from math import pi
 
-from numpy import linspace, zeros, ones, exp
-from six.moves import zip
-
+from numpy import linspace, zeros, exp, asarray, ceil, percentile
+from six.moves import range
 
 # ============= local library imports  ==========================
 
+# maximum number of elements of the (ages x bins) array evaluated at once. bounds memory usage
+MAX_CHUNK_ELEMENTS = 2 ** 20
+
 
-def cumulative_probability(ages, errors, xmi, xma, n=100):
+def cumulative_probability(ages, errors, xmi, xma, n=100, chunk_size=None):
+    """
+        sum of the normal probability curves of ages+/-errors evaluated at n bins between xmi and xma
+
+        ages are processed in chunks of chunk_size. each chunk is evaluated by broadcasting
+        the chunk against the bins. if chunk_size is None it is chosen so that a chunk has
+        at most MAX_CHUNK_ELEMENTS elements
+    """
     bins = linspace(xmi, xma, n)
     probs = zeros(n)
 
-    for ai, ei in zip(ages, errors):
-        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
-            continue
+    ages = asarray(ages, dtype=float).ravel()
+    errors = asarray(errors, dtype=float).ravel()
+    valid = (abs(ages) >= 1e-10) & (abs(errors) >= 1e-10)
+    ages, errors = ages[valid], errors[valid]
+
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // max(n, 1))
 
+    for i in range(0, ages.shape[0], chunk_size):
         # calculate probability curve for ai+/-ei
         # p=1/(2*pi*sigma2) *exp (-(x-u)**2)/(2*sigma2)
         # see http://en.wikipedia.org/wiki/Normal_distribution
-        ds = (ones(n) * ai - bins) ** 2
-        es = ones(n) * ei
-        es2 = 2 * es * es
-        gs = (es2 * pi) ** -0.5 * exp(-ds / es2)
+        ai = ages[i:i + chunk_size, None]
+        es2 = 2 * errors[i:i + chunk_size, None] ** 2
+        gs = (es2 * pi) ** -0.5 * exp(-(ai - bins) ** 2 / es2)
 
         # cumulate probabilities
-        # numpy element_wise addition
-        probs += gs
+        probs += gs.sum(axis=0)
 
     return bins, probs
 
 
-def kernel_density(self, ages, errors, xmi, xma, n=100):
+def adaptive_bin_count(errors, xmi, xma, bins_per_sigma=4, min_n=100, max_n=5000, q=5):
+    """
+        return the number of bins required to resolve the narrowest curves between xmi and xma with
+        at least bins_per_sigma bins per sigma.
+
+        the q-th percentile of the errors is used as the narrowest error so a few very precise
+        analyses do not force the maximum bin count. the result is clipped to [min_n, max_n]
+    """
+    errors = abs(asarray(errors, dtype=float).ravel())
+    errors = errors[errors >= 1e-10]
+    if not errors.shape[0] or not xma > xmi:
+        return min_n
+
+    e = percentile(errors, q)
+    n = int(ceil((xma - xmi) * bins_per_sigma / e)) + 1
+    return max(min_n, min(max_n, n))
+
+
+def kernel_density(ages, errors, xmi, xma, n=100):
     from scipy.stats.kde import gaussian_kde
 
     pdf = gaussian_kde(ages)
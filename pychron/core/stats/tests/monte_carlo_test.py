@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+
+import unittest
+
+from numpy import array, percentile, zeros, linspace, meshgrid, allclose
+from numpy.random import RandomState
+
+from pychron.core.regression.flux_regressor import PlaneFluxRegressor
+from pychron.core.stats.monte_carlo import monte_carlo_error_estimation, MAX_SEED
+
+
+def loop_monte_carlo(reg, nominal_ys, pts, ntrials, seed, chunk_size):
+    """
+        trial by trial reference implementation using the same random draws as monte_carlo_error_estimation
+    """
+    exog = reg.get_exog(pts)
+    ys, yserr = reg.ys, reg.yserr
+    n = len(ys)
+    nchunks = (ntrials + chunk_size - 1) // chunk_size
+    seeds = RandomState(seed).randint(0, MAX_SEED, nchunks)
+
+    res = []
+    for i, si in enumerate(seeds):
+        ga = RandomState(si).standard_normal((min(chunk_size, ntrials - i * chunk_size), n))
+        for gi in ga:
+            yp = zeros(n)
+            for j in range(n):
+                yp[j] = ys[j] + yserr[j] * gi[j]
+            res.append(nominal_ys - reg.fast_predict2(yp, exog))
+
+    res = array(res).T
+    ret = zeros(len(pts))
+    for i, ri in enumerate(res):
+        a, b = percentile(ri, (15.87, 84.13))
+        ret[i] = (abs(a) + abs(b)) * 0.5
+    return ret
+
+
+class MonteCarloTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rs = RandomState(1)
+        x, y = meshgrid(linspace(-1, 1, 5), linspace(-1, 1, 5))
+        xy = array((x.ravel(), y.ravel())).T
+        j = 0.01 + 0.001 * xy[:, 0] - 0.0005 * xy[:, 1] + rs.normal(0, 1e-5, xy.shape[0])
+        je = j * 0.001
+
+        reg = PlaneFluxRegressor(xs=xy, ys=j, yserr=je, error_calc_type='SD')
+        reg.calculate()
+        cls.reg = reg
+        cls.pts = xy
+        cls.nominals = reg.predict(xy)
+
+    def test_matches_loop(self):
+        e1 = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=250, seed=123, chunk_size=100)
+        e2 = loop_monte_carlo(self.reg, self.nominals, self.pts, 250, 123, 100)
+        self.assertTrue(allclose(e1, e2, rtol=1e-10, atol=0))
+
+    def test_reproducible(self):
+        e1 = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=100, seed=5)
+        e2 = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=100, seed=5)
+        self.assertTrue((e1 == e2).all())
+
+    def test_processes(self):
+        e1 = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=400, seed=7, chunk_size=100)
+        e2 = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=400, seed=7, chunk_size=100,
+                                          processes=2)
+        self.assertTrue(allclose(e1, e2, rtol=1e-12, atol=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
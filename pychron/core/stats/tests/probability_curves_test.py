@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+
+import unittest
+from math import pi
+
+from numpy import linspace, zeros, ones, exp, allclose
+from numpy.random import RandomState
+
+from pychron.core.stats.probability_curves import cumulative_probability, adaptive_bin_count
+
+
+def loop_cumulative_probability(ages, errors, xmi, xma, n=100):
+    bins = linspace(xmi, xma, n)
+    probs = zeros(n)
+    for ai, ei in zip(ages, errors):
+        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
+            continue
+
+        ds = (ones(n) * ai - bins) ** 2
+        es = ones(n) * ei
+        es2 = 2 * es * es
+        probs += (es2 * pi) ** -0.5 * exp(-ds / es2)
+    return bins, probs
+
+
+class CumulativeProbabilityTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rs = RandomState(2)
+        cls.ages = rs.normal(100, 5, 1000)
+        cls.errors = abs(rs.normal(1, 0.3, 1000))
+        cls.ages[10] = 0
+        cls.errors[20] = 0
+
+    def test_matches_loop(self):
+        bins, probs = cumulative_probability(self.ages, self.errors, 80, 120, n=300)
+        rbins, rprobs = loop_cumulative_probability(self.ages, self.errors, 80, 120, n=300)
+        self.assertTrue(allclose(bins, rbins))
+        self.assertTrue(allclose(probs, rprobs, rtol=1e-10))
+
+    def test_chunked(self):
+        _, probs = cumulative_probability(self.ages, self.errors, 80, 120, n=300)
+        _, cprobs = cumulative_probability(self.ages, self.errors, 80, 120, n=300, chunk_size=7)
+        self.assertTrue(allclose(probs, cprobs, rtol=1e-10))
+
+    def test_empty(self):
+        bins, probs = cumulative_probability([], [], 0, 1, n=10)
+        self.assertEqual(bins.shape[0], 10)
+        self.assertFalse(probs.any())
+
+    def test_adaptive_bin_count(self):
+        self.assertEqual(adaptive_bin_count([1, 1], 0, 10, min_n=10), 41)
+        self.assertEqual(adaptive_bin_count([1, 1], 0, 10, min_n=100), 100)
+        self.assertEqual(adaptive_bin_count([0.001], 0, 10, max_n=500), 500)
+        self.assertEqual(adaptive_bin_count([0], 0, 10, min_n=100), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+
+import threading
+import time
+import unittest
+
+from pychron.core.progress import progress_loader, progress_iterator, CancelLoadingError
+
+
+class Progress(object):
+    def __init__(self):
+        self.canceled = False
+        self.accepted = False
+        self.closed = False
+        self.messages = []
+        self.threads = set()
+
+    def change_message(self, msg, auto_increment=True):
+        self.threads.add(threading.current_thread().name)
+        self.messages.append(msg)
+
+    def close(self):
+        self.closed = True
+
+
+def square(x, prog, i, n):
+    # falsy results are dropped by progress_loader
+    return x * x + 1
+
+
+def func(x, prog, i, n):
+    # finish out of order
+    time.sleep(0.001 * (10 - x % 10))
+    if prog:
+        prog.change_message('item {}'.format(i))
+    return x * 2
+
+
+class ProgressLoaderTestCase(unittest.TestCase):
+    def test_order(self):
+        xs = list(range(1, 41))
+        rs = progress_loader(xs, func, use_progress=False, executor='thread', workers=4)
+        self.assertEqual(rs, [x * 2 for x in xs])
+
+    def test_serial_parity(self):
+        xs = list(range(1, 31))
+        prog = Progress()
+        a = progress_loader(xs, func, progress=prog, step=5)
+        sprog = prog
+
+        prog = Progress()
+        b = progress_loader(xs, func, progress=prog, step=5, executor='thread')
+        self.assertEqual(a, b)
+        self.assertEqual(sprog.messages, prog.messages)
+        self.assertEqual(prog.threads, {threading.current_thread().name})
+        self.assertTrue(prog.closed)
+
+    def test_generator(self):
+        def gen(x, prog, i, n):
+            for j in range(x):
+                yield j
+
+        rs = progress_loader([1, 2, 3], gen, use_progress=False, executor='thread')
+        self.assertEqual(rs, [0, 0, 1, 0, 1, 2])
+
+    def test_cancel(self):
+        prog = Progress()
+
+        def f(x, p, i, n):
+            if i == 5:
+                prog.canceled = True
+            return x
+
+        self.assertEqual(progress_loader(list(range(100)), f, progress=prog, executor='thread', workers=2), [])
+        self.assertRaises(CancelLoadingError, progress_loader, list(range(100)), f, progress=prog,
+                          executor='thread', reraise_cancel=True)
+
+    def test_accept(self):
+        prog = Progress()
+
+        def f(x, p, i, n):
+            if i == 5:
+                prog.accepted = True
+            return x
+
+        rs = progress_loader(list(range(1, 101)), f, progress=prog, executor='thread', workers=2)
+        self.assertTrue(5 < len(rs) < 100)
+        self.assertEqual(rs, list(range(1, len(rs) + 1)))
+
+    def test_process(self):
+        prog = Progress()
+        rs = progress_loader(list(range(10)), square, progress=prog, executor='process', workers=2)
+        self.assertEqual(rs, [x * x + 1 for x in range(10)])
+        self.assertEqual(prog.messages[-1], '10/10')
+
+    def test_exception(self):
+        def f(x, p, i, n):
+            if x == 3:
+                raise ValueError('bad item')
+            return x
+
+        self.assertRaises(ValueError, progress_loader, list(range(10)), f, use_progress=False, executor='thread')
+
+    def test_iterator(self):
+        seen = []
+        lock = threading.Lock()
+
+        def f(x, p, i, n):
+            with lock:
+                seen.append(x)
+
+        progress_iterator(list(range(20)), f, threshold=100, executor='thread')
+        self.assertEqual(sorted(seen), list(range(20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -93,6 +93,12 @@ class DashboardDevice(Loggable):
             elif dt > value.period:
                 self._trigger(value)
 
+    def trigger_value(self, value, **kw):
+        """
+            read value from the hardware device now
+        """
+        self._trigger(value, **kw)
+
     def _trigger(self, value, **kw):
         try:
             self.debug('triggering value device={} value={} func={}'.format(self.hardware_device.name,
@@ -114,13 +120,15 @@ class DashboardDevice(Loggable):
             self.debug(traceback.format_exc())
             # value.use_pv = False
 
-    def add_value(self, name, tag, func_name, period, enabled, threshold, units, timeout, record, bindname):
+    def add_value(self, name, tag, func_name, period, enabled, threshold, units, timeout, record, bindname,
+                  poll_timeout=0):
         pv = ProcessValue(name=name,
                           tag=tag,
                           func_name=func_name,
                           period=period,
                           enabled=enabled,
                           timeout=float(timeout),
+                          poll_timeout=float(poll_timeout),
                           units=units,
                           change_threshold=threshold,
                           record=record)
@@ -48,6 +48,15 @@ class ProcessValue(HasTraits):
     record = Bool(False)
     display_name = Property
 
+    # polling statistics. see pychron.dashboard.scheduler
+    poll_timeout = Float
+    npolls = Int
+    overruns = Int
+    timeouts = Int
+    jitter = Float
+    max_jitter = Float
+    last_duration = Float
+
     def is_different(self, v):
         ret = None
         ct = time.time()
@@ -0,0 +1,193 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import heapq
+import time
+from itertools import count
+from threading import Thread, Event
+
+# ============= local library imports  ==========================
+from pychron.loggable import Loggable
+
+
+def value_period(value):
+    """
+        return the polling period of a process value in seconds or None if it is not polled.
+
+        "on_change" values are pushed by their device. they are only polled to force a reading if nothing was
+        pushed for timeout seconds
+    """
+    if value.period == 'on_change':
+        return value.timeout or None
+    return value.period
+
+
+def next_deadline(deadline, period, now):
+    """
+        return the next deadline on the grid deadline + k * period that is after now and the number of deadlines
+        that were missed
+    """
+    nd = deadline + period
+    missed = 0
+    if nd <= now:
+        missed = int((now - nd) // period) + 1
+        nd += missed * period
+    return nd, missed
+
+
+class DeviceWorker(object):
+    """
+        poll the values of one or more DashboardDevices sharing a hardware device. values are polled at their own
+        period on a fixed grid so a slow reading does not shift later deadlines. deadlines missed because a reading
+        took too long are skipped and counted as overruns
+    """
+
+    def __init__(self, name, devices, stagger=0, logger=None):
+        self.name = name
+        self.devices = devices
+        self.stagger = stagger
+        self.logger = logger
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = t = Thread(name='poll-{}'.format(self.name), target=self._run)
+        t.daemon = True
+        t.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        heap = self._make_schedule(time.time())
+        while heap and not self._stop.is_set():
+            deadline, i, dev, value, period = heap[0]
+            now = time.time()
+            if deadline > now:
+                self._stop.wait(deadline - now)
+                continue
+
+            heapq.heappop(heap)
+            if dev.use and value.enabled:
+                self._poll(dev, value, deadline, now)
+
+            nd, missed = next_deadline(deadline, period, time.time())
+            if missed:
+                value.overruns += missed
+                self._debug('{}.{} overrun. skipped {} reading(s)'.format(dev.name, value.name, missed))
+
+            heapq.heappush(heap, (nd, i, dev, value, period))
+
+    def _make_schedule(self, now):
+        heap = []
+        cnt = count()
+        for dev in self.devices:
+            for value in dev.values:
+                period = value_period(value)
+                if period:
+                    i = next(cnt)
+                    # spread the first readings so values with the same period are not polled in bursts
+                    heap.append((now + (i * self.stagger) % period, i, dev, value, period))
+        heapq.heapify(heap)
+        return heap
+
+    def _poll(self, dev, value, deadline, st):
+        value.jitter = st - deadline
+        value.max_jitter = max(value.max_jitter, value.jitter)
+        if value.period == 'on_change':
+            if st - value.last_time > value.timeout:
+                self._debug('Force trigger. timeout={}'.format(value.timeout))
+                dev.trigger_value(value, force=True)
+            else:
+                return
+        else:
+            dev.trigger_value(value)
+
+        dur = time.time() - st
+        value.npolls += 1
+        value.last_duration = dur
+        if value.poll_timeout and dur > value.poll_timeout:
+            value.timeouts += 1
+            self._warning('{}.{} reading took {:0.2f}s. poll_timeout={}'.format(dev.name, value.name, dur,
+                                                                              value.poll_timeout))
+
+    def _debug(self, msg):
+        if self.logger:
+            self.logger.debug(msg)
+
+    def _warning(self, msg):
+        if self.logger:
+            self.logger.warning(msg)
+
+
+class PollScheduler(Loggable):
+    """
+        poll DashboardDevices concurrently. there is one worker thread per hardware device so readings of one
+        device are serialized but a slow or timing out device does not delay the others
+    """
+    stagger = 0.05
+
+    def __init__(self, devices=None, *args, **kw):
+        super(PollScheduler, self).__init__(*args, **kw)
+        self._workers = []
+        self.devices = devices or []
+
+    def start(self):
+        self.stop()
+        groups = []
+        for dev in self.devices:
+            hd = dev.hardware_device
+            for key, ds in groups:
+                if hd is not None and key is hd:
+                    ds.append(dev)
+                    break
+            else:
+                groups.append((hd, [dev]))
+
+        for hd, ds in groups:
+            name = hd.name if hd is not None else ds[0].name
+            w = DeviceWorker(name, ds, stagger=self.stagger, logger=self)
+            w.start()
+            self._workers.append(w)
+
+        self.info('started {} poll workers for {} devices'.format(len(self._workers), len(self.devices)))
+
+    def stop(self, timeout=5):
+        for w in self._workers:
+            w.stop(timeout)
+        self._workers = []
+
+    def is_alive(self):
+        return any(w.is_alive() for w in self._workers)
+
+    def statistics(self):
+        """
+            return a list of (device, value, npolls, overruns, timeouts, max_jitter, last_duration)
+        """
+        return [(dev.name, v.name, v.npolls, v.overruns, v.timeouts, v.max_jitter, v.last_duration)
+                for dev in self.devices for v in dev.values]
+
+# ============= EOF =============================================
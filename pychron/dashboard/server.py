@@ -18,13 +18,12 @@
 from __future__ import absolute_import
 from traits.api import Instance, on_trait_change, List, Button
 # ============= standard library imports ========================
-from threading import Thread
 import os
 import pickle
-import time
 # ============= local library imports  ==========================
 from pychron.dashboard.constants import CRITICAL, NOERROR, WARNING
 from pychron.dashboard.device import DashboardDevice
+from pychron.dashboard.scheduler import PollScheduler
 from pychron.globals import globalv
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.core.helpers.filetools import add_extension
@@ -74,7 +73,7 @@ class DashboardServer(Loggable):
     labspy_client = Instance('pychron.labspy.client.LabspyClient')
 
     use_db = False
-    _alive = False
+    _scheduler = None
 
     def activate(self):
         if not self.extraction_line_manager:
@@ -90,7 +89,9 @@ class DashboardServer(Loggable):
             self.labspy_client.start()
 
     def deactivate(self):
-        pass
+        if self._scheduler:
+            self._scheduler.stop()
+            self._scheduler = None
 
     # def deactivate(self):
     # if self.use_db:
@@ -119,12 +120,11 @@ class DashboardServer(Loggable):
 
     def start_poll(self):
         self.info('starting dashboard poll')
-        self._alive = True
-        t = Thread(name='poll',
-                   target=self._poll)
+        if self._scheduler:
+            self._scheduler.stop()
 
-        t.setDaemon(1)
-        t.start()
+        self._scheduler = PollScheduler(devices=self.devices)
+        self._scheduler.start()
 
     def load_devices(self):
         dd = self._assemble_dev_dicts()
@@ -159,6 +159,7 @@ class DashboardServer(Loggable):
                 enabled = to_bool(get_xml_value(v, 'enabled', False))
                 record = to_bool(get_xml_value(v, 'record', False))
                 timeout = get_xml_value(v, 'timeout', 60)
+                poll_timeout = float(get_xml_value(v, 'poll_timeout', 0))
                 threshold = float(get_xml_value(v, 'change_threshold', 1e-20))
                 units = get_xml_value(v, 'units', '')
                 bindname = get_xml_value(v, 'bind', '')
@@ -192,6 +193,7 @@ class DashboardServer(Loggable):
                        'threshold': threshold,
                        'units': units,
                        'timeout': timeout,
+                       'poll_timeout': poll_timeout,
                        'record': record,
                        'bindname':bindname},
                       cs)
@@ -240,35 +242,6 @@ class DashboardServer(Loggable):
 
         return pickle.dumps(config)
 
-    def _poll(self):
-        if any((v.period == 'on_change' for dev in self.devices for v in dev.values)):
-            mperiod = 1
-        else:
-            mperiod = min((v.period for dev in self.devices for v in dev.values))
-
-        self.debug('min period {}'.format(mperiod))
-        while self._alive:
-            sst = time.time()
-            # self.debug('============= poll iteration start ============')
-            for dev in self.devices:
-                if not dev.use:
-                    continue
-
-                dev.trigger()
-
-            st = time.time()
-            pp = mperiod - (st - sst)
-            if pp >= 3:
-                self.debug('sleeping for {}'.format(pp))
-
-            while self._alive:
-                if time.time() - st >= pp:
-                    break
-                time.sleep(0.1)
-
-            # dur = time.time() - sst
-            # self.debug('============= poll iteration finished dur={:0.1f}============'.format(dur))
-
     # def _set_error_flag(self, obj, msg):
     # self.notifier.send_message('error {}'.format(msg))
 
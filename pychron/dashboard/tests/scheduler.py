@@ -0,0 +1,113 @@
+from __future__ import absolute_import
+
+import time
+import unittest
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.dashboard.process_value import ProcessValue
+from pychron.dashboard.scheduler import PollScheduler, next_deadline
+
+
+class HardwareDevice(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class Device(object):
+    """
+        stand in for DashboardDevice
+    """
+
+    def __init__(self, name, values, delay=0, hardware_device=None):
+        self.name = name
+        self.use = True
+        self.values = values
+        self.delay = delay
+        self.hardware_device = hardware_device or HardwareDevice(name)
+        self.triggered = []
+
+    def trigger_value(self, value, **kw):
+        self.triggered.append((time.time(), value.name, kw))
+        if self.delay:
+            time.sleep(self.delay)
+        value.last_time = time.time()
+
+
+class PollSchedulerTestCase(unittest.TestCase):
+    def _run(self, devices, duration):
+        s = PollScheduler(devices=devices)
+        s.stagger = 0
+        s.start()
+        time.sleep(duration)
+        s.stop()
+        self.assertFalse(s.is_alive())
+        return s
+
+    def test_slow_device(self):
+        fast = ProcessValue(name='fast', period=0.05, enabled=True)
+        slow = ProcessValue(name='slow', period=0.1, enabled=True, poll_timeout=0.1)
+        fdev = Device('fast', [fast])
+        sdev = Device('slow', [slow], delay=0.25)
+
+        self._run([fdev, sdev], 0.6)
+
+        # the slow device does not delay the fast one
+        self.assertGreaterEqual(fast.npolls, 9)
+        self.assertEqual(fast.overruns, 0)
+
+        self.assertLessEqual(slow.npolls, 3)
+        self.assertGreater(slow.overruns, 0)
+        self.assertEqual(slow.timeouts, slow.npolls)
+
+    def test_shared_hardware(self):
+        hd = HardwareDevice('gauge_controller')
+        a = ProcessValue(name='a', period=0.05, enabled=True)
+        b = ProcessValue(name='b', period=0.05, enabled=True)
+        da = Device('a', [a], hardware_device=hd)
+        db = Device('b', [b], hardware_device=hd)
+        s = PollScheduler(devices=[da, db])
+        s.start()
+        # readings of a shared hardware device are serialized on one worker
+        self.assertEqual(len(s._workers), 1)
+        time.sleep(0.3)
+        s.stop()
+        self.assertGreater(a.npolls, 0)
+        self.assertGreater(b.npolls, 0)
+
+    def test_own_period(self):
+        a = ProcessValue(name='a', period=0.05, enabled=True)
+        b = ProcessValue(name='b', period=10, enabled=True)
+        disabled = ProcessValue(name='c', period=0.05, enabled=False)
+        dev = Device('dev', [a, b, disabled])
+        self._run([dev], 0.5)
+
+        self.assertGreaterEqual(a.npolls, 8)
+        self.assertEqual(b.npolls, 1)
+        self.assertEqual(disabled.npolls, 0)
+
+    def test_on_change(self):
+        pushed = ProcessValue(name='pushed', period='on_change', timeout=0.1, enabled=True,
+                              last_time=time.time() + 10)
+        stale = ProcessValue(name='stale', period='on_change', timeout=0.1, enabled=True)
+        no_timeout = ProcessValue(name='no_timeout', period='on_change', timeout=0, enabled=True)
+        dev = Device('dev', [pushed, stale, no_timeout])
+        self._run([dev], 0.35)
+
+        names = [t[1] for t in dev.triggered]
+        self.assertNotIn('pushed', names)
+        self.assertNotIn('no_timeout', names)
+        self.assertIn('stale', names)
+        self.assertEqual(dev.triggered[0][2], {'force': True})
+
+    def test_next_deadline(self):
+        self.assertEqual(next_deadline(10, 1, 10.5), (11, 0))
+        self.assertEqual(next_deadline(10, 1, 11), (12, 1))
+        self.assertEqual(next_deadline(10, 1, 13.5), (14, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
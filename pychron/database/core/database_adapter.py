@@ -21,9 +21,9 @@ from __future__ import print_function
 import os
 import sys
 from datetime import datetime, timedelta
-from threading import Lock
+from threading import Lock, local
 
-from sqlalchemy import create_engine, distinct, MetaData
+from sqlalchemy import create_engine, distinct, MetaData, event
 from sqlalchemy.exc import SQLAlchemyError, InvalidRequestError, StatementError, \
     DBAPIError, OperationalError
 from sqlalchemy.orm import sessionmaker
@@ -154,6 +154,47 @@ class SessionCTX(object):
         self._psession = None
 
 
+class PoolMonitor(object):
+    """
+        track connection pool utilization of an engine
+    """
+
+    def __init__(self, engine):
+        self.pool = engine.pool
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self._lock = Lock()
+
+        event.listen(engine, 'checkout', self._checkout)
+        event.listen(engine, 'checkin', self._checkin)
+
+    def statistics(self):
+        pool = self.pool
+        with self._lock:
+            d = dict(pool=pool.__class__.__name__,
+                     checkouts=self.checkouts,
+                     checked_out=self.checked_out,
+                     peak_checked_out=self.peak_checked_out)
+
+        # only QueuePool has a fixed size and overflow
+        if hasattr(pool, 'overflow'):
+            capacity = pool.size() + pool._max_overflow
+            d.update(size=pool.size(), overflow=pool.overflow(), checked_in=pool.checkedin(),
+                     utilization=float(d['checked_out']) / capacity if capacity > 0 else 0)
+        return d
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+
 class MockQuery:
     def join(self, *args, **kw):
         return self
@@ -176,6 +217,14 @@ class MockSession:
     #     return
 
 
+class _SharedState(object):
+    """
+        session state shared by all threads. see DatabaseAdapter.scoped_sessions
+    """
+    session = None
+    session_cnt = 0
+
+
 class DatabaseAdapter(Loggable):
     """
     The DatabaseAdapter is a base class for interacting with a SQLAlchemy database.
@@ -188,8 +237,6 @@ class DatabaseAdapter(Loggable):
     ``_retrieve_items``
 
     """
-    session = None
-
     sess_stack = 0
     reraise = False
 
@@ -232,8 +279,43 @@ class DatabaseAdapter(Loggable):
     _trying_to_add = False
     _test_connection_enabled = True
 
-    # def __init__(self, *args, **kw):
-    #     super(DatabaseAdapter, self).__init__(*args, **kw)
+    # connection pool. pool_size, max_overflow and pool_timeout only apply to mysql and postgresql
+    pool_size = 5
+    max_overflow = 10
+    pool_timeout = 30
+    pool_recycle = 3600
+    pool_pre_ping = True
+
+    # give each thread its own session so the adapter can be used concurrently, e.g. from worker threads.
+    # otherwise all threads share one session
+    scoped_sessions = Bool(False)
+
+    engine = None
+    _pool_monitor = None
+    _shared = None
+
+    def __init__(self, *args, **kw):
+        self._shared = _SharedState()
+        super(DatabaseAdapter, self).__init__(*args, **kw)
+
+    def _scoped_sessions_changed(self, new):
+        self._shared = local() if new else _SharedState()
+
+    @property
+    def session(self):
+        return getattr(self._shared, 'session', None)
+
+    @session.setter
+    def session(self, v):
+        self._shared.session = v
+
+    @property
+    def _session_cnt(self):
+        return getattr(self._shared, 'session_cnt', 0)
+
+    @_session_cnt.setter
+    def _session_cnt(self, v):
+        self._shared.session_cnt = v
 
     def create_all(self, metadata):
         """
@@ -255,8 +337,6 @@ class DatabaseAdapter(Loggable):
     #             sess = self.sess
     #         return SessionCTX(sess, parent=self, commit=commit, rollback=rollback)
 
-    _session_cnt = 0
-
     def session_ctx(self, use_parent_session=True):
         with self._session_lock:
             return SessionCTX(self, use_parent_session)
@@ -349,7 +429,9 @@ class DatabaseAdapter(Loggable):
                 url = self.url
                 if url is not None:
                     self.info('{} connecting to database {}'.format(id(self), self.public_url))
-                    engine = create_engine(url, echo=self.echo)
+                    engine = create_engine(url, **self._engine_kw())
+                    self.engine = engine
+                    self._pool_monitor = PoolMonitor(engine)
                     #                     Session.configure(bind=engine)
 
                     self.session_factory = sessionmaker(bind=engine, autoflush=self.autoflush,
@@ -383,6 +465,20 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.public_url)
     # def initialize_database(self):
     # pass
 
+    def pool_statistics(self):
+        """
+        Connection pool utilization
+
+        :return: dict or None if not connected
+        """
+        if self._pool_monitor:
+            return self._pool_monitor.statistics()
+
+    def log_pool_statistics(self):
+        stats = self.pool_statistics()
+        if stats:
+            self.debug('pool statistics {}'.format(', '.join('{}={}'.format(k, stats[k]) for k in sorted(stats))))
+
     def rollback(self):
         if self.session:
             self.session.rollback()
@@ -481,6 +577,12 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.public_url)
 
         return url
 
+    def _engine_kw(self):
+        kw = dict(echo=self.echo, pool_recycle=self.pool_recycle, pool_pre_ping=self.pool_pre_ping)
+        if self.kind in ('mysql', 'postgresql'):
+            kw.update(pool_size=self.pool_size, max_overflow=self.max_overflow, pool_timeout=self.pool_timeout)
+        return kw
+
     def _import_mysql_driver(self):
         try:
             '''
@@ -0,0 +1,111 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+from threading import Thread, Barrier
+
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.ext.declarative import declarative_base
+
+from pychron.database.core.database_adapter import DatabaseAdapter
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+Base = declarative_base()
+
+
+class ItemTbl(Base):
+    __tablename__ = 'ItemTbl'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(40))
+
+
+class DatabaseAdapterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.db = db = DatabaseAdapter(kind='sqlite', path=os.path.join(self._root, 'test.db'),
+                                       scoped_sessions=True)
+        db.connect()
+        Base.metadata.create_all(db.engine)
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self._root)
+
+    def _run_threads(self, func, n=4):
+        barrier = Barrier(n)
+        results = [None] * n
+
+        def target(i):
+            barrier.wait()
+            results[i] = func(i)
+
+        ts = [Thread(target=target, args=(i,)) for i in range(n)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        return results
+
+    def test_scoped_sessions(self):
+        db = self.db
+        barrier = Barrier(4)
+
+        def func(i):
+            with db.session_ctx() as sess:
+                barrier.wait()
+                sess.add(ItemTbl(name='item{}'.format(i)))
+                sess.commit()
+                # every thread still sees its own session
+                return sess is db.session, id(sess)
+
+        results = self._run_threads(func)
+        self.assertTrue(all(r[0] for r in results))
+        self.assertEqual(len(set(r[1] for r in results)), 4)
+        self.assertIsNone(db.session)
+
+        with db.session_ctx() as sess:
+            self.assertEqual(sess.query(ItemTbl).count(), 4)
+
+    def test_shared_session(self):
+        db = self.db
+        db.scoped_sessions = False
+
+        db.create_session()
+        try:
+            ids = self._run_threads(lambda i: id(db.session))
+        finally:
+            db.close_session()
+
+        self.assertEqual(len(set(ids)), 1)
+        self.assertIsNone(db.session)
+
+    def test_pool_statistics(self):
+        db = self.db
+        with db.session_ctx() as sess:
+            sess.query(ItemTbl).count()
+            stats = db.pool_statistics()
+            self.assertEqual(stats['checked_out'], 1)
+
+        stats = db.pool_statistics()
+        self.assertEqual(stats['checked_out'], 0)
+        self.assertGreaterEqual(stats['checkouts'], 1)
+        self.assertEqual(stats['peak_checked_out'], 1)
+
+    def test_engine_kw(self):
+        db = self.db
+        self.assertNotIn('pool_size', db._engine_kw())
+
+        db.kind = 'mysql'
+        kw = db._engine_kw()
+        self.assertEqual(kw['pool_size'], db.pool_size)
+        self.assertEqual(kw['max_overflow'], db.max_overflow)
+        self.assertTrue(kw['pool_pre_ping'])
+
+
+if __name__ == '__main__':
+    unittest.main()
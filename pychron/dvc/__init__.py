@@ -23,6 +23,7 @@ from pychron import json
 from pprint import pformat
 
 from pychron.core.helpers.filetools import subdirize, add_extension
+from pychron.dvc.meta_cache import META_CACHE
 from pychron.paths import paths
 
 __version__ = '0.1'
@@ -70,15 +71,9 @@ def get_masses():
     return MASSES
 
 
-SPEC_SHAS = {}
-
-
 def get_spec_sha(p):
-    if p not in SPEC_SHAS:
-        sd = dvc_load(p)
-        SPEC_SHAS[p] = sd
-
-    return SPEC_SHAS[p]
+    repository = os.path.basename(os.path.dirname(p))
+    return META_CACHE.get(repository, ('spec', p), lambda: dvc_load(p), (p,))
 
 
 def analysis_path(runid, repository, modifier=None, extension='.json', mode='r', root=None):
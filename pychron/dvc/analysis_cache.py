@@ -0,0 +1,127 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import os
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+
+# ============= local library imports  ==========================
+from pychron.dvc import dvc_load, analysis_path
+
+DOCUMENT_MODIFIERS = (None, 'extraction', 'intercepts', 'baselines', 'blanks', 'icfactors', 'tags', 'peakcenter')
+
+
+def analysis_document_paths(runid, repository):
+    """
+        return a list of (modifier, path) for all the json files that make up an analysis.
+        the main analysis file is keyed by None
+    """
+    ps = []
+    for m in DOCUMENT_MODIFIERS:
+        p = analysis_path(runid, repository, modifier=m)
+        if p:
+            ps.append((m, p))
+    return ps
+
+
+def make_signature(paths):
+    """
+        signature used to invalidate a cached entry. a pull/checkout/dump rewrites the file so
+        the (mtime, size) of each file is sufficient and much cheaper than hashing the contents
+    """
+    sig = []
+    for m, p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        sig.append((m, st.st_mtime, st.st_size))
+    return tuple(sig)
+
+
+def load_documents(paths):
+    return {m: dvc_load(p) for m, p in paths if os.path.isfile(p)}
+
+
+class AnalysisCache(object):
+    """
+        thread-safe LRU cache of the parsed json documents of an analysis.
+
+        entries are keyed on (repository, runid) and are only served if the (mtime, size) signature
+        of the analysis files is unchanged. get_documents returns a deep copy so an analysis can modify its
+        documents without changing the cached entry or the other analyses built from it
+    """
+
+    def __init__(self, max_size=5000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def get_documents(self, runid, repository):
+        paths = analysis_document_paths(runid, repository)
+        sig = make_signature(paths)
+        key = (repository, runid)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                # move to end. most recently used
+                del self._cache[key]
+                self._cache[key] = entry
+                docs = entry[1]
+            else:
+                docs = None
+                self.misses += 1
+
+        if docs is not None:
+            return deepcopy(docs)
+
+        docs = load_documents(paths)
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = (sig, docs)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+        return deepcopy(docs)
+
+    def invalidate(self, repository, runid=None):
+        with self._lock:
+            if runid is None:
+                for k in [k for k in self._cache if k[0] == repository]:
+                    del self._cache[k]
+            else:
+                self._cache.pop((repository, runid), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return 'size={}, hits={}, misses={}'.format(len(self._cache), self.hits, self.misses)
+
+
+ANALYSIS_CACHE = AnalysisCache()
+
+# ============= EOF =============================================
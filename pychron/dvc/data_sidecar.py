@@ -0,0 +1,194 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+binary columnar sidecar for the DVC raw data files (runid.data.json).
+
+the sidecar is an uncompressed .npz written next to the .data.json file. each signal/baseline/sniff is
+stored as a pair of float32 columns plus a small json header. the header records the (mtime, size) and the
+sha1 of the json file the sidecar was generated from so a stale sidecar is never used. the json file is only
+hashed when its (mtime, size) differs, e.g. after a clone or checkout.
+
+backfill an existing repository with
+
+    python -m pychron.dvc.data_sidecar <repository path>
+"""
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+from __future__ import print_function
+import hashlib
+import os
+import sys
+
+from numpy import load, savez, array, float32
+
+# ============= local library imports  ==========================
+from pychron import json
+from pychron.core.helpers.binpack import format_blob, unpack_xy
+
+SIDECAR_VERSION = 1
+SIDECAR_EXT = '.npz'
+DATA_KINDS = ('signals', 'baselines', 'sniffs')
+
+# sidecars are committed with the repository so the (mtime, size) in the header only matches on the computer
+# that wrote the sidecar. elsewhere remember the (mtime, size) and sha1 of json files that were hashed
+VERIFIED = {}
+
+
+def sidecar_path(path):
+    """
+        path: path to a runid.data.json file
+    """
+    return '{}{}'.format(os.path.splitext(path)[0], SIDECAR_EXT)
+
+
+def source_signature(path):
+    """
+        (mtime, size) of the .data.json file at path. the mtime is stored as its repr so it survives the json
+        round trip unchanged
+    """
+    st = os.stat(path)
+    return [repr(st.st_mtime), st.st_size]
+
+
+def make_sidecar(path, force=False):
+    """
+        write the sidecar for the .data.json file at path.
+
+        return the sidecar path or None if the data file does not exist or the sidecar is already up to date
+    """
+    if not os.path.isfile(path):
+        return
+
+    spath = sidecar_path(path)
+    # stat before reading so a concurrent rewrite leaves a signature that does not match
+    signature = source_signature(path)
+    header = {} if force else _read_header(spath)
+    if header.get('source_signature') == signature:
+        return
+
+    with open(path, 'rb') as rfile:
+        txt = rfile.read()
+
+    sha = hashlib.sha1(txt).hexdigest()
+    if header.get('source_sha') == sha:
+        return
+
+    jd = json.loads(txt.decode('utf-8'))
+    endianness = jd.get('format', '>ff')[0]
+    arrays = {}
+    header = {'version': SIDECAR_VERSION, 'source_sha': sha, 'source_signature': signature}
+    for kind in DATA_KINDS:
+        items = []
+        for i, d in enumerate(jd.get(kind, [])):
+            xs, ys = unpack_xy(format_blob(d.get('blob', '')), endianness)
+            arrays['{}_{}_xs'.format(kind, i)] = xs.astype(float32)
+            arrays['{}_{}_ys'.format(kind, i)] = ys.astype(float32)
+            items.append({k: v for k, v in d.items() if k != 'blob'})
+        header[kind] = items
+
+    arrays['header'] = array(json.dumps(header))
+    with open(spath, 'wb') as wfile:
+        savez(wfile, **arrays)
+
+    return spath
+
+
+def load_sidecar(path):
+    """
+        load the sidecar for the .data.json file at path.
+
+        return a dict with the same structure as the json file except that each item has "xs" and "ys"
+        arrays instead of a "blob". return None if there is no up to date sidecar
+    """
+    spath = sidecar_path(path)
+    if not (os.path.isfile(spath) and os.path.isfile(path)):
+        return
+
+    try:
+        with load(spath) as npz:
+            header = json.loads(str(npz['header']))
+            if header.get('version') != SIDECAR_VERSION:
+                return
+
+            sha = header.get('source_sha')
+            signature = source_signature(path)
+            if signature != header.get('source_signature') and VERIFIED.get(path) != (signature, sha):
+                with open(path, 'rb') as rfile:
+                    if hashlib.sha1(rfile.read()).hexdigest() != sha:
+                        return
+                VERIFIED[path] = (signature, sha)
+
+            ret = {}
+            for kind in DATA_KINDS:
+                items = []
+                for i, d in enumerate(header.get(kind, [])):
+                    d = dict(d)
+                    d['xs'] = npz['{}_{}_xs'.format(kind, i)].astype(float)
+                    d['ys'] = npz['{}_{}_ys'.format(kind, i)].astype(float)
+                    items.append(d)
+                ret[kind] = items
+            return ret
+    except (IOError, OSError, ValueError, KeyError):
+        pass
+
+
+def _read_header(spath):
+    if os.path.isfile(spath):
+        try:
+            with load(spath) as npz:
+                return json.loads(str(npz['header']))
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+    return {}
+
+
+def iter_data_paths(root):
+    for r, ds, fs in os.walk(root):
+        if '.git' in ds:
+            ds.remove('.git')
+
+        if os.path.basename(r) == '.data':
+            for f in fs:
+                if f.endswith('.data.json'):
+                    yield os.path.join(r, f)
+
+
+def backfill_sidecars(root, force=False):
+    """
+        generate sidecars for every .data.json file in the repository at root
+
+        return list of the sidecar paths that were written
+    """
+    ps = []
+    for p in iter_data_paths(root):
+        try:
+            sp = make_sidecar(p, force=force)
+        except (ValueError, TypeError) as e:
+            print('failed making sidecar for {}. {}'.format(p, e))
+            continue
+
+        if sp:
+            ps.append(sp)
+    return ps
+
+
+if __name__ == '__main__':
+    for root in sys.argv[1:]:
+        written = backfill_sidecars(root)
+        print('{}: wrote {} sidecars'.format(root, len(written)))
+
+# ============= EOF =============================================
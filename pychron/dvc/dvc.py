@@ -22,30 +22,37 @@ import time
 from datetime import datetime
 from itertools import groupby
 from math import isnan
+from multiprocessing.pool import ThreadPool
 from git import Repo
 from uncertainties import nominal_value, std_dev, ufloat
 
 # ============= enthought library imports =======================
 from apptools.preferences.preference_binding import bind_preference
-from traits.api import Instance, Str, Set, List, provides
+from traits.api import Instance, Str, Set, List, Bool, provides
 
 from pychron.core.helpers.filetools import remove_extension, list_subdirectories
 from pychron.core.i_datastore import IDatastore
-from pychron.core.progress import progress_loader, progress_iterator
+from pychron.core.progress import progress_loader, open_progress
 from pychron.database.interpreted_age import InterpretedAge
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, repository_path, AnalysisNotAnvailableError
+from pychron.dvc.analysis_cache import ANALYSIS_CACHE
+from pychron.dvc.meta_cache import META_CACHE, META_NAMESPACE
 from pychron.dvc.defaults import TRIGA, HOLDER_24_SPOKES, LASER221, LASER65
 from pychron.dvc.dvc_analysis import DVCAnalysis, PATH_MODIFIERS
 from pychron.dvc.dvc_database import DVCDatabase
 from pychron.dvc.func import find_interpreted_age_path, GitSessionCTX, push_repositories
 from pychron.dvc.meta_repo import MetaRepo, Production
+from pychron.dvc.publish_outbox import PublishOutbox
+from pychron.dvc.repository_sync import RepositorySync, RepositorySyncResult, SYNCED, FAILED
 from pychron.envisage.browser.record_views import InterpretedAgeRecordView
 from pychron.experiment.utilities.identifier import make_runid
 from pychron.git.hosts import IGitHost, CredentialException
 from pychron.git_archive.repo_manager import GitRepoManager, format_date, get_repository_branch
+from pychron.git_archive.utils import ahead_behind
 from pychron.globals import globalv
 from pychron.loggable import Loggable
 from pychron.paths import paths, r_mkdir
+from pychron.processing.batch_age import calculate_ages
 from pychron.pychron_constants import RATIO_KEYS, INTERFERENCE_KEYS, NULL_STR
 from pychron import json
 import six
@@ -136,10 +143,19 @@ class DVC(Loggable):
     default_team = Str
 
     current_repository = Instance(GitRepoManager)
+    repository_sync = Instance(RepositorySync, ())
     auto_add = True
+    analysis_load_workers = 8
+    repository_sync_workers = 4
+    # seconds. repositories synced more recently are not checked against the remote
+    repository_sync_ttl = 60
     pulled_repositories = Set
     selected_repositories = List
 
+    # commit analyses locally and push them from a background thread
+    use_publish_outbox = Bool(False)
+    publish_outbox = Instance(PublishOutbox)
+
     def __init__(self, bind=True, *args, **kw):
         super(DVC, self).__init__(*args, **kw)
 
@@ -148,8 +164,12 @@ class DVC(Loggable):
             # self.synchronize()
             # self._defaults()
 
-    def initialize(self, inform=False):
-        self.debug('Initialize DVC')
+    def initialize(self, inform=False, pull=True):
+        """
+            pull: update the meta repo. the publish outbox rebases the meta repo before pushing so per run
+            initializations skip the pull when it is used
+        """
+        self.debug('Initialize DVC pull={}'.format(pull))
 
         if not self.meta_repo_name:
             self.warning_dialog('Need to specify Meta Repository name in Preferences')
@@ -158,7 +178,12 @@ class DVC(Loggable):
         self.open_meta_repo()
 
         # update meta repo.
-        self.meta_pull()
+        if pull:
+            with self.publish_outbox.lock(META_NAMESPACE):
+                self.meta_pull()
+
+        if self.use_publish_outbox:
+            self.publish_outbox.start()
 
         if self.db.connect():
             # self._defaults()
@@ -458,6 +483,7 @@ class DVC(Loggable):
             rm.add_paths(ps)
             rm.smart_pull()
             rm.commit(msg)
+            META_CACHE.invalidate(repo)
 
     # database
     # analysis manual edit
@@ -701,16 +727,8 @@ class DVC(Loggable):
         # load repositories
         st = time.time()
 
-        def func(xi, prog, i, n):
-            if prog:
-                prog.change_message('Syncing repository= {}'.format(xi))
-            try:
-                self.sync_repo(xi, use_progress=False)
-            except BaseException:
-                pass
-
         exps = {r.repository_identifier for r in records}
-        progress_iterator(exps, func, threshold=1)
+        self.sync_repositories(exps)
 
         # for ei in exps:
         branches = {ei: get_repository_branch(os.path.join(paths.repository_dataset_dir, ei)) for ei in exps}
@@ -735,23 +753,29 @@ class DVC(Loggable):
                 fluxes[irrad] = flux_levels
                 productions[irrad] = prod_levels
 
+        documents = self._prefetch_documents(records)
+
         make_record = self._make_record
+        age_queue = []
 
         def func(*args):
             try:
                 r = make_record(branches=branches, chronos=chronos, productions=productions,
-                                fluxes=fluxes, calculate_f_only=calculate_f_only, *args)
+                                fluxes=fluxes, documents=documents, age_queue=age_queue, *args)
                 return r
             except BaseException:
                 self.debug('make analysis exception')
                 self.debug_exception()
 
         ret = progress_loader(records, func, threshold=1, step=25)
+        self._calculate_ages(age_queue, calculate_f_only)
         et = time.time() - st
 
         n = len(records)
 
         self.debug('Make analysis time, total: {}, n: {}, average: {}'.format(et, n, et / float(n)))
+        self.debug('Analysis cache {}'.format(ANALYSIS_CACHE.stats()))
+        self.debug('Metadata cache {}'.format(META_CACHE.stats()))
         return ret
 
     # repositories
@@ -797,7 +821,62 @@ class DVC(Loggable):
     def git_session_ctx(self, repository_identifier, message):
         return GitSessionCTX(self, repository_identifier, message)
 
-    def sync_repo(self, name, use_progress=True):
+    def sync_repositories(self, names, progress=None):
+        """
+        concurrently pull the repositories in names. repositories synced within repository_sync_ttl seconds or
+        already up to date with the remote are skipped. missing repositories are cloned afterwards on the calling
+        thread
+
+        progress: an existing progress dialog. it is only updated from the calling thread
+        """
+        rs = self.repository_sync
+        rs.ttl = self.repository_sync_ttl
+        rs.max_workers = self.repository_sync_workers
+
+        names = set(names)
+        missing = sorted(ni for ni in names if not os.path.isdir(os.path.join(repository_path(ni), '.git')))
+        names = names.difference(missing)
+
+        prog = progress
+        n = len(names) + len(missing)
+        if prog is None and n > 1:
+            prog = open_progress(n)
+
+        def pull(name):
+            repo = self._get_repository(name, as_current=False)
+            repo.pull(use_progress=False)
+            self._update_cache_generation(name, repo)
+            return True
+
+        def update(r):
+            if prog:
+                prog.change_message('Syncing repository= {} {}'.format(r.name, r.status))
+
+        st = time.time()
+        results = rs.sync(names, pull, self._repository_is_current, progress=update)
+        if missing:
+            remote_names = self.remote_repository_names()
+            for name in missing:
+                if prog:
+                    prog.change_message('Cloning repository= {}'.format(name))
+
+                cst = time.time()
+                try:
+                    status = SYNCED if self._clone_repository(name, remote_names) else FAILED
+                except BaseException as e:
+                    self.debug('failed cloning {}. {}'.format(name, e))
+                    status = FAILED
+                results.append(RepositorySyncResult(name, status, time.time() - cst))
+
+        if prog and progress is None:
+            prog.close()
+
+        for r in results:
+            self.debug('sync repository {}'.format(r))
+        self.debug('synced {} repositories in {:0.2f}s'.format(len(results), time.time() - st))
+        return results
+
+    def sync_repo(self, name, use_progress=True, as_current=True):
         """
         pull or clone an repo
 
@@ -807,22 +886,13 @@ class DVC(Loggable):
         self.debug('sync repository {}. exists={}'.format(name, exists))
 
         if exists:
-            repo = self._get_repository(name)
+            repo = self._get_repository(name, as_current=as_current)
             repo.pull(use_progress=use_progress)
+            self._update_cache_generation(name, repo)
+            self.repository_sync.touch(name)
             return True
         else:
-            self.debug('getting repository from remote')
-            names = self.remote_repository_names()
-            service = self.application.get_service(IGitHost)
-            if name in names:
-                service.clone_from(name, root, self.organization)
-                return True
-            else:
-                self.debug('name={} not in available repos from service={}, organization={}'.format(name,
-                                                                                                    service.remote_url,
-                                                                                                    self.organization))
-                for ni in names:
-                    self.debug('available repo== {}'.format(ni))
+            return self._clone_repository(name, self.remote_repository_names())
 
     def rollback_repository(self, expid):
         repo = self._get_repository(expid)
@@ -855,6 +925,10 @@ class DVC(Loggable):
             self.debug('pull to remote={}, url={}'.format(gi.default_remote_name, gi.remote_url))
             repo.smart_pull(remote=gi.default_remote_name)
 
+        name = os.path.basename(repo.path)
+        self._update_cache_generation(name, repo)
+        self.repository_sync.touch(name)
+
     def push_repository(self, repo):
         if isinstance(repo, (str, six.text_type)):
             r = GitRepoManager()
@@ -866,6 +940,19 @@ class DVC(Loggable):
             self.debug('pushing to remote={}, url={}'.format(gi.default_remote_name, gi.remote_url))
             repo.push(remote=gi.default_remote_name)
 
+    def publish_repository(self, name):
+        """
+        push repository name to the remote(s) in the background. use META_NAMESPACE for the meta repository
+        """
+        self.publish_outbox.start()
+        self.publish_outbox.put(name)
+
+    def flush_publish_outbox(self, timeout=None):
+        if self.publish_outbox.pending():
+            self.info('waiting for publish outbox. {}'.format(self.publish_outbox.status()))
+            return self.publish_outbox.flush(timeout)
+        return True
+
     def push_repositories(self, changes):
         for gi in self.application.get_services(IGitHost):
             push_repositories(changes, gi.default_remote_name, quiet=False)
@@ -895,7 +982,9 @@ class DVC(Loggable):
         self.meta_commit('updated chronology for {}'.format(name))
 
     def meta_pull(self, **kw):
-        return self.meta_repo.smart_pull(**kw)
+        ret = self.meta_repo.smart_pull(**kw)
+        self._update_cache_generation(META_NAMESPACE, self.meta_repo)
+        return ret
 
     def meta_push(self):
         self.meta_repo.push()
@@ -1170,8 +1259,70 @@ class DVC(Loggable):
             prog.change_message('Loading repository {}. {}/{}'.format(expid, i, n))
         self.sync_repo(expid)
 
+    def _prefetch_documents(self, records):
+        """
+            load the json documents for records concurrently. file io releases the GIL so a thread pool
+            is sufficient. documents are served from ANALYSIS_CACHE if the files have not changed
+
+            return dict keyed by (repository_identifier, record_id)
+        """
+
+        def load(record):
+            if isinstance(record, DVCAnalysis):
+                return
+
+            expid = record.repository_identifier
+            if not expid:
+                return
+
+            rid = record.record_id
+            if record.use_repository_suffix:
+                rid = '-'.join(rid.split('-')[:-1])
+            try:
+                return (expid, rid), ANALYSIS_CACHE.get_documents(rid, expid)
+            except BaseException:
+                pass
+
+        n = min(len(records), self.analysis_load_workers)
+        if n > 1:
+            pool = ThreadPool(n)
+            try:
+                rs = pool.map(load, records)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            rs = [load(r) for r in records]
+
+        return dict(r for r in rs if r)
+
+    def _calculate_ages(self, ans, calculate_f_only=False):
+        st = time.time()
+        n = len(ans)
+        try:
+            ans = calculate_ages(ans, calculate_f_only=calculate_f_only)
+        except BaseException:
+            self.debug('batch age calculation exception')
+            self.debug_exception()
+
+        self.debug('batch age calculation n={}, not calculated={}, time={:0.3f}'.format(n, len(ans),
+                                                                                      time.time() - st))
+        for a in ans:
+            try:
+                if calculate_f_only:
+                    a.calculate_F()
+                else:
+                    a.calculate_age()
+            except BaseException:
+                self.debug('calculate age exception {}'.format(a.record_id))
+                self.debug_exception()
+
     def _make_record(self, record, prog, i, n, productions=None, chronos=None, branches=None, fluxes=None,
-                     calculate_f_only=False):
+                     calculate_f_only=False, documents=None, age_queue=None):
+        """
+            age_queue: if not None analyses requiring an age calculation are appended to this list
+            instead of being calculated here
+        """
         meta_repo = self.meta_repo
         if prog:
             # this accounts for ~85% of the time!!!
@@ -1202,7 +1353,12 @@ class DVC(Loggable):
                 rid = record.record_id
                 if record.use_repository_suffix:
                     rid = '-'.join(rid.split('-')[:-1])
-                a = DVCAnalysis(rid, expid)
+
+                docs = documents.get((expid, rid)) if documents else None
+                if docs is None:
+                    docs = ANALYSIS_CACHE.get_documents(rid, expid)
+
+                a = DVCAnalysis(rid, expid, docs=docs)
                 a.group_id = record.group_id
             except AnalysisNotAnvailableError:
                 self.info('Analysis {} not available. Trying to clone repository "{}"'.format(rid, expid))
@@ -1258,16 +1414,54 @@ class DVC(Loggable):
                 a.standard_name = fd['standard_name']
                 a.standard_material = fd['standard_material']
 
-                if calculate_f_only:
+                if age_queue is not None:
+                    age_queue.append(a)
+                elif calculate_f_only:
                     a.calculate_F()
                 else:
                     a.calculate_age()
         return a
 
     def _get_frozen_production(self, rid, repo):
-        path = analysis_path(rid, repo, 'productions')
-        if path:
-            return Production(path)
+        def factory():
+            path = analysis_path(rid, repo, 'productions')
+            if path and os.path.isfile(path):
+                return Production(path)
+
+        return META_CACHE.get(repo, ('frozen_production', rid), factory)
+
+    def _repository_is_current(self, name):
+        if not os.path.isdir(os.path.join(repository_path(name), '.git')):
+            return False
+
+        repo = self._get_repository(name, as_current=False)
+        if repo.is_current_with_remote():
+            self._update_cache_generation(name, repo)
+            return True
+
+    def _clone_repository(self, name, names):
+        self.debug('getting repository from remote')
+        service = self.application.get_service(IGitHost)
+        if name in names:
+            service.clone_from(name, repository_path(name), self.organization)
+            self.repository_sync.touch(name)
+            return True
+        else:
+            self.debug('name={} not in available repos from service={}, organization={}'.format(name,
+                                                                                                service.remote_url,
+                                                                                                self.organization))
+            for ni in names:
+                self.debug('available repo== {}'.format(ni))
+
+    def _update_cache_generation(self, namespace, repo):
+        try:
+            head = repo.get_head()
+        except BaseException:
+            self.debug('failed getting HEAD for {}'.format(namespace))
+            META_CACHE.invalidate(namespace)
+            return
+
+        META_CACHE.set_generation(namespace, head)
 
     def _get_repository(self, repository_identifier, as_current=True):
         repo = None
@@ -1286,12 +1480,44 @@ class DVC(Loggable):
 
         return repo
 
+    def _publish(self, name):
+        """
+        called from the publish outbox thread. rebase onto the remote, push and return True if no local commits
+        remain unpushed
+        """
+        if name == META_NAMESPACE:
+            repo = self.meta_repo
+            with self.publish_outbox.lock(name):
+                if not self.meta_pull(accept_our=True):
+                    return
+
+            self.meta_push()
+        else:
+            repo = GitRepoManager()
+            repo.open_repo(repository_path(name))
+            with self.publish_outbox.lock(name):
+                if not repo.smart_pull(accept_their=True):
+                    return
+
+                self._update_cache_generation(name, repo)
+
+            hosts = self.application.get_services(IGitHost) if self.application else None
+            if not hosts:
+                return True
+
+            self.push_repository(repo)
+
+        ahead, behind = ahead_behind(repo._repo, fetch=False)
+        return not ahead
+
     def _bind_preferences(self):
 
         prefid = 'pychron.dvc'
         for attr in ('meta_repo_name', 'organization', 'default_team'):
             bind_preference(self, attr, '{}.{}'.format(prefid, attr))
 
+        bind_preference(self, 'use_publish_outbox', 'pychron.dvc.experiment.use_publish_outbox')
+
         prefid = 'pychron.dvc.db'
         for attr in ('username', 'password', 'name', 'host', 'kind', 'path'):
             bind_preference(self.db, attr, '{}.{}'.format(prefid, attr))
@@ -1369,6 +1595,10 @@ class DVC(Loggable):
     def _meta_repo_default(self):
         return MetaRepo()
 
+    def _publish_outbox_default(self):
+        return PublishOutbox(path=os.path.join(paths.dvc_dir, 'publish_outbox.json'),
+                             publish_func=self._publish)
+
 
 if __name__ == '__main__':
     paths.build('_dev')
@@ -28,6 +28,8 @@ from pychron.core.helpers.datetime_tools import make_timef
 from pychron.core.helpers.filetools import add_extension
 from pychron.core.helpers.iterfuncs import partition
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, make_ref_list, get_spec_sha, get_masses
+from pychron.dvc.analysis_cache import ANALYSIS_CACHE
+from pychron.dvc.data_sidecar import load_sidecar
 from pychron.experiment.utilities.environmentals import set_environmentals
 from pychron.experiment.utilities.identifier import make_aliquot_step, make_step
 from pychron.paths import paths
@@ -72,23 +74,36 @@ class DVCAnalysis(Analysis):
     production_obj = None
     chronology_obj = None
 
-    def __init__(self, record_id, repository_identifier, *args, **kw):
+    def __init__(self, record_id, repository_identifier, docs=None, *args, **kw):
+        """
+            docs: optional dict of preloaded json documents keyed by path modifier. see analysis_cache
+        """
         super(DVCAnalysis, self).__init__(*args, **kw)
         self.record_id = record_id
         path = analysis_path(record_id, repository_identifier)
         self.repository_identifier = repository_identifier
         self.rundate = datetime.datetime.now()
-        root = os.path.dirname(path)
-        bname = os.path.basename(path)
-        head, ext = os.path.splitext(bname)
 
-        jd = dvc_load(os.path.join(root, 'extraction', '{}.extr{}'.format(head, ext)))
-        self.load_extraction(jd)
+        if docs is None:
+            root = os.path.dirname(path)
+            bname = os.path.basename(path)
+            head, ext = os.path.splitext(bname)
 
-        jd = dvc_load(path)
-        self.load_meta(jd)
+            jd = dvc_load(os.path.join(root, 'extraction', '{}.extr{}'.format(head, ext)))
+            self.load_extraction(jd)
+
+            jd = dvc_load(path)
+            self.load_meta(jd)
+
+            self.load_paths()
+        else:
+            self.load_extraction(docs.get('extraction', {}))
+
+            jd = docs.get(None, {})
+            self.load_meta(jd)
+
+            self.load_documents(docs)
 
-        self.load_paths()
         self.load_spectrometer_parameters(jd['spec_sha'])
         self.load_environmentals(jd.get('environmental'))
 
@@ -175,6 +190,19 @@ class DVCAnalysis(Analysis):
                 except BaseException as e:
                     self.warning('Failed loading {}. error={}'.format(modifier, e))
 
+    def load_documents(self, docs, modifiers=None):
+        if modifiers is None:
+            modifiers = ('intercepts', 'baselines', 'blanks', 'icfactors', 'tags', 'peakcenter')
+
+        for modifier in modifiers:
+            jd = docs.get(modifier)
+            if jd is not None:
+                func = getattr(self, '_load_{}'.format(modifier))
+                try:
+                    func(jd)
+                except BaseException as e:
+                    self.warning('Failed loading {}. error={}'.format(modifier, e))
+
     def load_spectrometer_parameters(self, spec_sha):
         name = add_extension(spec_sha, '.json')
         p = os.path.join(paths.repository_dataset_dir, self.repository_identifier, name)
@@ -194,9 +222,11 @@ class DVCAnalysis(Analysis):
     def load_raw_data(self, keys=None, n_only=False, use_name_pairs=True):
 
         path = self._analysis_path(modifier='.data')
-        isotopes = self.isotopes
 
-        jd = dvc_load(path)
+        # prefer the binary sidecar if it is up to date
+        jd = load_sidecar(path)
+        if jd is None:
+            jd = dvc_load(path)
 
         signals = jd.get('signals', [])
         baselines = jd.get('baselines', [])
@@ -227,12 +257,12 @@ class DVCAnalysis(Analysis):
             if not iso:
                 continue
 
-            iso.unpack_data(format_blob(sd.get('blob', '')), n_only)
+            self._set_raw_data(iso, sd, n_only)
 
             # det = sd['detector']
             bd = next((b for b in baselines if b.get('detector') == det), None)
             if bd:
-                iso.baseline.unpack_data(format_blob(bd.get('blob', '')), n_only)
+                self._set_raw_data(iso.baseline, bd, n_only)
 
         # loop thru keys to make sure none were missed this can happen when only loading baseline
         if keys:
@@ -241,7 +271,7 @@ class DVCAnalysis(Analysis):
                 if bd:
                     for iso in self.itervalues():
                         if iso.detector == k:
-                            iso.baseline.unpack_data(format_blob(bd.get('blob', '')), n_only)
+                            self._set_raw_data(iso.baseline, bd, n_only)
 
         for sn in sniffs:
             isok = sn.get('isotope')
@@ -252,10 +282,9 @@ class DVCAnalysis(Analysis):
             if keys and isok not in keys:
                 continue
 
-            data = format_blob(sn.get('blob', ''))
             for iso in self.itervalues():
                 if iso.detector == det:
-                    iso.sniff.unpack_data(data, n_only)
+                    self._set_raw_data(iso.sniff, sn, n_only)
 
     def set_production(self, prod, r):
         self.production_obj = r
@@ -385,6 +414,19 @@ class DVCAnalysis(Analysis):
         return self._analysis_path(modifier=modifier)
 
     # private
+    def _set_raw_data(self, measurement, d, n_only):
+        """
+            d: item from the signals, baselines or sniffs list of a raw data file. contains either a
+            base64 encoded "blob" or decoded "xs" and "ys" arrays if loaded from a sidecar
+        """
+        if 'xs' in d:
+            xs, ys = d['xs'], d['ys']
+            if measurement.reverse_unpack:
+                xs, ys = ys, xs
+            measurement.set_data(xs, ys, n_only)
+        else:
+            measurement.unpack_data(format_blob(d.get('blob', '')), n_only)
+
     def _load_peakcenter(self, jd):
 
         refdet = jd.get('reference_detector')
@@ -515,6 +557,7 @@ class DVCAnalysis(Analysis):
             path = self._analysis_path(modifier)
 
         dvc_dump(obj, path)
+        ANALYSIS_CACHE.invalidate(self.repository_identifier, self.record_id)
 
     def _analysis_path(self, repository_identifier=None, **kw):
         if repository_identifier is None:
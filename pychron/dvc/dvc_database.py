@@ -20,6 +20,7 @@ from __future__ import print_function
 from datetime import timedelta, datetime
 
 from sqlalchemy import not_, func, distinct, or_, select, and_, join
+from sqlalchemy.orm import joinedload, selectinload, contains_eager
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql.functions import count
 from sqlalchemy.util import OrderedSet
@@ -44,6 +45,36 @@ import six
 from six.moves import map
 
 
+def record_view_options(joined=()):
+    """
+    loader options for querying AnalysisTbl rows that are turned into record views.
+
+    the many-to-one chain to irradiation, level, sample, project, principal investigator and material
+    and the analysis change are joined into the main query. the collections are loaded with one
+    additional SELECT each. building record views therefore does not issue any lazy loads and the
+    number of round trips is independent of the number of analyses
+
+    joined: tables the query already joins explicitly. their relationships are populated from those joins
+    with contains_eager instead of joining the tables a second time
+    """
+
+    def load(attr, table, parent=None):
+        if table in joined:
+            return parent.contains_eager(attr) if parent is not None else contains_eager(attr)
+        else:
+            return parent.joinedload(attr) if parent is not None else joinedload(attr)
+
+    position = load(AnalysisTbl.irradiation_position, IrradiationPositionTbl)
+    sample = load(IrradiationPositionTbl.sample, SampleTbl, position)
+    project = load(SampleTbl.project, ProjectTbl, sample)
+    return (position.joinedload(IrradiationPositionTbl.level).joinedload(LevelTbl.irradiation),
+            project.joinedload(ProjectTbl.principal_investigator),
+            sample.joinedload(SampleTbl.material),
+            load(AnalysisTbl.change, AnalysisChangeTbl),
+            selectinload(AnalysisTbl.repository_associations),
+            selectinload(AnalysisTbl.measured_positions))
+
+
 def make_filter(qq, table, col='value'):
     comp = qq.comparator
     v = qq.criterion
@@ -1073,10 +1104,11 @@ class DVCDatabase(DatabaseAdapter):
                                **kw):
 
         with self.session_ctx() as sess:
-            q = sess.query(AnalysisTbl)
-            q = q.join(IrradiationPositionTbl)
+            joins = [IrradiationPositionTbl]
             if omit_key or not include_invalid:
-                q = q.join(AnalysisChangeTbl)
+                joins.append(AnalysisChangeTbl)
+
+            q = self._record_view_query(sess, joins)
 
             if repositories:
                 q = q.join(RepositoryAssociationTbl, RepositoryTbl)
@@ -1153,15 +1185,15 @@ class DVCDatabase(DatabaseAdapter):
         self.debug('-------------------------------------------------')
 
         with self.session_ctx() as sess:
-            q = sess.query(AnalysisTbl)
+            joins = []
             if exclude_invalid:
-                q = q.join(AnalysisChangeTbl)
-            if labnumber:
-                q = q.join(IrradiationPositionTbl)
+                joins.append(AnalysisChangeTbl)
+            if labnumber or project:
+                joins.append(IrradiationPositionTbl)
             if project:
-                if not labnumber:
-                    q = q.join(IrradiationPositionTbl)
-                q = q.join(SampleTbl, ProjectTbl)
+                joins.extend((SampleTbl, ProjectTbl))
+
+            q = self._record_view_query(sess, joins)
 
             if loads:
                 q = q.join(MeasuredPositionTbl)
@@ -1203,6 +1235,16 @@ class DVCDatabase(DatabaseAdapter):
 
             return self._query_all(q, verbose_query=verbose)
 
+    def _record_view_query(self, sess, joins=()):
+        """
+            query AnalysisTbl joined to each table in joins, in order, with the record view loader options
+        """
+        q = sess.query(AnalysisTbl)
+        for t in joins:
+            q = q.join(t)
+
+        return q.options(*record_view_options(joins))
+
     def _get_date_range(self, q, asc=None, desc=None, hours=0):
         if asc is None:
             asc = AnalysisTbl.timestamp.asc()
@@ -20,14 +20,16 @@ import base64
 import hashlib
 import os
 import shutil
-import struct
 from datetime import datetime
 
 from git.exc import GitCommandError
 from traits.api import Instance, Bool, Str
 from uncertainties import std_dev, nominal_value
 
+from pychron.core.helpers.binpack import pack
 from pychron.dvc import dvc_dump, analysis_path
+from pychron.dvc.data_sidecar import make_sidecar, sidecar_path
+from pychron.dvc.meta_cache import META_NAMESPACE
 from pychron.experiment.automated_run.persistence import BasePersister
 # from pychron.experiment.classifier.isotope_classifier import IsotopeClassifier
 from pychron.git_archive.repo_manager import GitRepoManager
@@ -61,6 +63,7 @@ class DVCPersister(BasePersister):
 
     macrochron_enabled = Bool(True)
     save_log_enabled = Bool(False)
+    use_data_sidecar = Bool(True)
 
     def per_spec_save(self, pr, repository_identifier=None, commit=False, commit_tag=None):
         self.per_spec = pr
@@ -82,9 +85,14 @@ class DVCPersister(BasePersister):
 
         :return:
         """
+        dvc = self.dvc
+        if dvc.use_publish_outbox:
+            # the publish outbox pulls before it pushes. do not block the run on git
+            pull = False
+
         self.debug('^^^^^^^^^^^^^ Initialize DVCPersister {} pull={}'.format(repository, pull))
 
-        self.dvc.initialize()
+        dvc.initialize(pull=pull)
 
         repository = format_repository_identifier(repository)
         self.active_repository = repo = GitRepoManager()
@@ -95,7 +103,8 @@ class DVCPersister(BasePersister):
         remote = 'origin'
         if repo.has_remote(remote) and pull:
             self.info('pulling changes from repo: {}'.format(repository))
-            self.active_repository.pull(remote=remote, use_progress=False)
+            with dvc.publish_outbox.lock(os.path.basename(root)):
+                self.active_repository.pull(remote=remote, use_progress=False)
 
     def pre_extraction_save(self):
         pass
@@ -212,53 +221,32 @@ class DVCPersister(BasePersister):
         if self.stage_files:
             if commit:
                 try:
-                    ar.smart_pull(accept_their=True)
-
-                    pms = (None, '.data', 'tags', 'peakcenter', 'extraction', 'monitor')
-                    paths = [spec_path, ] + [self._make_path(modifier=m) for m in pms]
-
-                    for p in paths:
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                        else:
-                            self.debug('not at valid file {}'.format(p))
-
-                    # commit files
-                    ar.commit('<{}>'.format(commit_tag))
-
-                    # commit default data reduction
-                    add = False
-                    p = self._make_path('intercepts')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
+                    meta_msg = 'repo updated for analysis {}'.format(self.per_spec.run_spec.runid)
+                    if dvc.use_publish_outbox:
+                        # commit locally and let the outbox pull/push in the background
+                        name = os.path.basename(ar.path)
+                        with dvc.publish_outbox.lock(name):
+                            self._commit_analysis(ar, spec_path, commit_tag)
+                        dvc.publish_repository(name)
 
-                    p = self._make_path('baselines')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
+                        with dvc.publish_outbox.lock(META_NAMESPACE):
+                            dvc.meta_commit(meta_msg)
+                        dvc.publish_repository(META_NAMESPACE)
+                    else:
+                        ar.smart_pull(accept_their=True)
 
-                    if add:
-                        ar.commit('<ISOEVO> default collection fits')
+                        self._commit_analysis(ar, spec_path, commit_tag)
 
-                    for pp, tag, msg in (('blanks', 'BLANKS',
-                                          'preceding {}'.format(self.per_spec.previous_blank_runid)),
-                                         ('icfactors', 'ICFactor', 'default')):
-                        p = self._make_path(pp)
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                            ar.commit('<{}> {}'.format(tag, msg))
+                        # push changes
+                        dvc.push_repository(ar)
 
-                    # push changes
-                    dvc.push_repository(ar)
+                        # update meta
+                        dvc.meta_pull(accept_our=True)
 
-                    # update meta
-                    dvc.meta_pull(accept_our=True)
+                        dvc.meta_commit(meta_msg)
 
-                    dvc.meta_commit('repo updated for analysis {}'.format(self.per_spec.run_spec.runid))
-
-                    # push commit
-                    dvc.meta_push()
+                        # push commit
+                        dvc.meta_push()
                 except GitCommandError as e:
                     self.warning(e)
                     if self.confirmation_dialog('NON FATAL\n\n'
@@ -280,12 +268,57 @@ class DVCPersister(BasePersister):
             npath = self._make_path('logs', '.log')
             shutil.copyfile(path, npath)
             ar = self.active_repository
-            ar.smart_pull(accept_their=True)
-            ar.add(npath, commit=False)
-            ar.commit('<COLLECTION> log')
-            self.dvc.push_repository(ar)
+            dvc = self.dvc
+            if dvc.use_publish_outbox:
+                name = os.path.basename(ar.path)
+                with dvc.publish_outbox.lock(name):
+                    ar.add(npath, commit=False)
+                    ar.commit('<COLLECTION> log')
+                dvc.publish_repository(name)
+            else:
+                ar.smart_pull(accept_their=True)
+                ar.add(npath, commit=False)
+                ar.commit('<COLLECTION> log')
+                dvc.push_repository(ar)
 
     # private
+    def _commit_analysis(self, ar, spec_path, commit_tag):
+        pms = (None, '.data', 'tags', 'peakcenter', 'extraction', 'monitor')
+        paths = [spec_path, ] + [self._make_path(modifier=m) for m in pms]
+        paths.append(sidecar_path(self._make_path(modifier='.data')))
+
+        for p in paths:
+            if os.path.isfile(p):
+                ar.add(p, commit=False)
+            else:
+                self.debug('not at valid file {}'.format(p))
+
+        # commit files
+        ar.commit('<{}>'.format(commit_tag))
+
+        # commit default data reduction
+        add = False
+        p = self._make_path('intercepts')
+        if os.path.isfile(p):
+            ar.add(p, commit=False)
+            add = True
+
+        p = self._make_path('baselines')
+        if os.path.isfile(p):
+            ar.add(p, commit=False)
+            add = True
+
+        if add:
+            ar.commit('<ISOEVO> default collection fits')
+
+        for pp, tag, msg in (('blanks', 'BLANKS',
+                              'preceding {}'.format(self.per_spec.previous_blank_runid)),
+                             ('icfactors', 'ICFactor', 'default')):
+            p = self._make_path(pp)
+            if os.path.isfile(p):
+                ar.add(p, commit=False)
+                ar.commit('<{}> {}'.format(tag, msg))
+
     def _check_repository_identifier(self):
         repo_id = self.per_spec.run_spec.repository_identifier
         db = self.dvc.db
@@ -483,11 +516,12 @@ class DVCPersister(BasePersister):
 
         # save the scripts
         ms = per_spec.run_spec.mass_spectrometer
-        for si in ('measurement', 'extraction', 'post_measurement', 'post_equilibration'):
-            name = getattr(per_spec, '{}_name'.format(si))
-            blob = getattr(per_spec, '{}_blob'.format(si))
-            self.dvc.meta_repo.update_script(ms, name, blob)
-            obj[si] = name
+        with self.dvc.publish_outbox.lock(META_NAMESPACE):
+            for si in ('measurement', 'extraction', 'post_measurement', 'post_equilibration'):
+                name = getattr(per_spec, '{}_name'.format(si))
+                blob = getattr(per_spec, '{}_blob'.format(si))
+                self.dvc.meta_repo.update_script(ms, name, blob)
+                obj[si] = name
 
         # save experiment
         self.debug('---------------- Experiment Queue saving disabled')
@@ -525,6 +559,9 @@ class DVCPersister(BasePersister):
                 'signals': signals, 'baselines': baselines, 'sniffs': sniffs}
         dvc_dump(data, p)
 
+        if self.use_data_sidecar:
+            make_sidecar(p)
+
     def _save_macrochron(self, obj):
         pass
 
@@ -533,7 +570,7 @@ class DVCPersister(BasePersister):
             p = self._make_path(modifier='monitor')
             checks = []
             for ci in self.per_spec.monitor.checks:
-                data = ''.join([struct.pack('>ff', x, y) for x, y in ci.data])
+                data = pack('>ff', ci.data)
                 params = dict(name=ci.name,
                               parameter=ci.parameter, criterion=ci.criterion,
                               comparator=ci.comparator, tripped=ci.tripped,
@@ -570,8 +607,7 @@ class DVCPersister(BasePersister):
                                             'low_signal': result.low_signal,
                                             'center_signal': result.center_signal,
                                             'high_signal': result.high_signal,
-                                            'points': base64.b64encode(''.join([struct.pack(fmt, *di)
-                                                                                for di in result.points]))}
+                                            'points': base64.b64encode(pack(fmt, result.points))}
 
             dvc_dump(obj, p)
 
@@ -0,0 +1,120 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import os
+from collections import OrderedDict
+from threading import Lock
+
+# ============= local library imports  ==========================
+
+META_NAMESPACE = 'meta'
+
+
+def file_signature(paths):
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_mtime, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class MetaCache(object):
+    """
+        size bounded LRU cache for DVC metadata i.e. fluxes, productions, chronologies and spectrometer files.
+
+        entries belong to a namespace, either META_NAMESPACE or a repository identifier. each namespace
+        has a generation, the git HEAD sha of the repository. when the generation changes, e.g. after a pull,
+        all entries of that namespace are dropped.
+
+        entries may optionally depend on a list of files. a cached value is only returned if the
+        (mtime, size) of those files is unchanged so local edits are picked up before they are committed
+    """
+
+    def __init__(self, max_size=2000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._generations = {}
+        self._lock = Lock()
+
+    def get(self, namespace, key, factory, paths=None):
+        """
+            return the cached value for (namespace, key). if not cached or stale, call factory() and cache
+            the result
+        """
+        key = (namespace, key)
+        sig = file_signature(paths) if paths else None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                del self._cache[key]
+                self._cache[key] = entry
+                return entry[1]
+
+            self.misses += 1
+
+        value = factory()
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = (sig, value)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+        return value
+
+    def set_generation(self, namespace, head):
+        """
+            set the HEAD sha of the repository for namespace. entries of this namespace are invalidated if
+            the sha changed
+        """
+        with self._lock:
+            if self._generations.get(namespace) != head:
+                self._generations[namespace] = head
+                self._invalidate(namespace)
+
+    def invalidate(self, namespace, key=None):
+        with self._lock:
+            if key is None:
+                self._invalidate(namespace)
+            else:
+                self._cache.pop((namespace, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._generations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return 'size={}, hits={}, misses={}'.format(len(self._cache), self.hits, self.misses)
+
+    def _invalidate(self, namespace):
+        for k in [k for k in self._cache if k[0] == namespace]:
+            del self._cache[k]
+
+
+META_CACHE = MetaCache()
+
+# ============= EOF =============================================
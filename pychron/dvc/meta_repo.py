@@ -29,6 +29,7 @@ from pychron.core.helpers.datetime_tools import ISO_FORMAT_STR
 from pychron.core.helpers.filetools import list_directory2, add_extension, \
     list_directory
 from pychron.dvc import dvc_dump, dvc_load
+from pychron.dvc.meta_cache import META_CACHE, META_NAMESPACE
 from pychron.git_archive.repo_manager import GitRepoManager
 from pychron.paths import paths, r_mkdir
 from pychron.pychron_constants import INTERFERENCE_KEYS, RATIO_KEYS, DEFAULT_MONITOR_NAME
@@ -665,8 +666,9 @@ class MetaRepo(GitRepoManager):
     #         prs.append(pr)
     #     return prs
     def get_flux_positions(self, irradiation, level):
-        positions = self._get_level_positions(irradiation, level)
-        return positions
+        p = self.get_level_path(irradiation, level)
+        return META_CACHE.get(META_NAMESPACE, ('flux', irradiation, level),
+                              lambda: self._get_level_positions(irradiation, level), (p,))
 
     def get_flux(self, irradiation, level, position):
         positions = self.get_flux_from_positions(irradiation, level)
@@ -721,20 +723,29 @@ class MetaRepo(GitRepoManager):
         p = self._gain_path(name)
         return Gains(p)
 
-    # @cached('clear_cache')
-    def get_production(self, irrad, level, **kw):
+    def get_production(self, irrad, level, force=False, **kw):
+        """
+            force: bypass the metadata cache and return a new Production object
+        """
         path = os.path.join(paths.meta_root, irrad, 'productions.json')
-        obj = dvc_load(path)
+        if force:
+            obj = dvc_load(path)
+        else:
+            obj = META_CACHE.get(META_NAMESPACE, ('productions', irrad), lambda: dvc_load(path), (path,))
+
         pname = obj[level]
         p = os.path.join(paths.meta_root, irrad, 'productions', add_extension(pname, ext='.json'))
 
-        ip = Production(p)
+        if force:
+            ip = Production(p)
+        else:
+            ip = META_CACHE.get(META_NAMESPACE, ('production', p), lambda: Production(p), (p,))
         # print 'new production id={}, name={}, irrad={}, level={}'.format(id(ip), pname, irrad, level)
         return pname, ip
 
-    # @cached('clear_cache')
     def get_chronology(self, name, **kw):
-        return irradiation_chronology(name)
+        p = self._chron_name(name)
+        return META_CACHE.get(META_NAMESPACE, ('chronology', name), lambda: irradiation_chronology(name), (p,))
 
     @cached('clear_cache')
     def get_irradiation_holder_holes(self, name, **kw):
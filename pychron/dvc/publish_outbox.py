@@ -0,0 +1,247 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+from __future__ import absolute_import
+
+from traits.api import Int, Float, Str, Callable
+
+# ============= standard library imports ========================
+import os
+import time
+from threading import Thread, Event, Lock, RLock
+
+# ============= local library imports  ==========================
+from pychron import json
+from pychron.core.helpers.filetools import replace_file
+from pychron.loggable import Loggable
+
+
+class PublishOutbox(Loggable):
+    """
+        durable queue of repositories that have local commits waiting to be pushed.
+
+        put(name) journals the repository name to disk and returns immediately. a worker thread calls
+        publish_func(name) once the entry has been idle for coalesce_delay seconds, so commits from consecutive
+        runs to the same repository are published with a single pull/push. a failed publish is retried with
+        exponential backoff. entries still in the journal are resumed the next time the outbox is started.
+
+        publish_func should return True if the repository was published.
+    """
+    path = Str
+    publish_func = Callable
+
+    coalesce_delay = Float(2)
+    retry_delay = Float(5)
+    max_retry_delay = Float(300)
+
+    queue_depth = Int
+    last_push_latency = Float
+    last_push_timestamp = Float
+    last_error = Str
+
+    _thread = None
+
+    def __init__(self, *args, **kw):
+        super(PublishOutbox, self).__init__(*args, **kw)
+        self._entries = []
+        self._entries_lock = Lock()
+        self._locks = {}
+        self._wake = Event()
+        self._stop = Event()
+        self._idle = Event()
+        self._idle.set()
+
+    def start(self):
+        """
+            load the journal and start the worker thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._load()
+        self._stop.clear()
+        self._thread = t = Thread(name='PublishOutbox', target=self._run)
+        t.daemon = True
+        t.start()
+
+    def stop(self, timeout=None):
+        """
+            stop the worker thread. pending entries remain in the journal
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def put(self, name):
+        """
+            add repository name to the outbox. if name is already pending its publish is pushed back by
+            coalesce_delay
+        """
+        now = time.time()
+        with self._entries_lock:
+            for e in self._entries:
+                if e['name'] == name:
+                    e['due'] = max(e['due'], now + self.coalesce_delay)
+                    e['puts'] += 1
+                    break
+            else:
+                self._entries.append({'name': name, 'due': now + self.coalesce_delay, 'attempts': 0, 'puts': 0})
+            self._idle.clear()
+            self._dump()
+
+        self._update_depth()
+        self._wake.set()
+
+    def flush(self, timeout=None):
+        """
+            publish all pending entries now and block until the outbox is empty or timeout seconds have elapsed.
+
+            return True if the outbox is empty
+        """
+        with self._entries_lock:
+            for e in self._entries:
+                e['due'] = 0
+        self._wake.set()
+        return self._idle.wait(timeout)
+
+    def pending(self):
+        with self._entries_lock:
+            return [e['name'] for e in self._entries]
+
+    def lock(self, name):
+        """
+            return the lock guarding the working tree of repository name. hold it while staging and committing so
+            the worker does not rebase the repository at the same time
+        """
+        with self._entries_lock:
+            try:
+                return self._locks[name]
+            except KeyError:
+                lock = self._locks[name] = RLock()
+                return lock
+
+    def status(self):
+        return 'queue_depth={} last_push_latency={:0.2f}s last_error={}'.format(self.queue_depth,
+                                                                                self.last_push_latency,
+                                                                                self.last_error or 'None')
+
+    # private
+    def _run(self):
+        while not self._stop.is_set():
+            entry, wait = self._next_entry()
+            if entry is None:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            self._publish(entry)
+
+    def _next_entry(self):
+        """
+            return the next due entry or None and the number of seconds until an entry becomes due
+        """
+        now = time.time()
+        with self._entries_lock:
+            if not self._entries:
+                self._idle.set()
+                return None, None
+
+            entry = min(self._entries, key=lambda e: e['due'])
+            dt = entry['due'] - now
+            if dt > 0:
+                return None, dt
+
+            return entry, 0
+
+    def _publish(self, entry):
+        name = entry['name']
+        st = time.time()
+        puts = entry['puts']
+        try:
+            ret = self.publish_func(name)
+            err = '' if ret else 'publish failed'
+        except BaseException as e:
+            ret = False
+            err = str(e)
+
+        et = time.time() - st
+        with self._entries_lock:
+            if ret:
+                # a put() during the publish means there are new commits. leave the entry for the next pass
+                if entry['puts'] == puts:
+                    self._entries.remove(entry)
+                else:
+                    entry['attempts'] = 0
+            else:
+                entry['attempts'] += 1
+                delay = min(self.max_retry_delay, self.retry_delay * 2 ** (entry['attempts'] - 1))
+                entry['due'] = max(entry['due'], time.time() + delay)
+            self._dump()
+
+        if ret:
+            self.last_push_latency = et
+            self.last_push_timestamp = time.time()
+            self.last_error = ''
+            self.debug('published {} in {:0.2f}s'.format(name, et))
+        else:
+            self.last_error = '{}: {}'.format(name, err)
+            self.warning('failed publishing {}. attempt={}. {}'.format(name, entry['attempts'], err))
+
+        self._update_depth()
+
+    def _update_depth(self):
+        with self._entries_lock:
+            n = len(self._entries)
+        self.queue_depth = n
+
+    def _load(self):
+        entries = []
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as rfile:
+                    entries = json.load(rfile)
+            except (ValueError, IOError) as e:
+                self.warning('failed loading publish outbox journal {}. {}'.format(self.path, e))
+
+        now = time.time()
+        with self._entries_lock:
+            names = [e['name'] for e in self._entries]
+            for e in entries:
+                if e['name'] not in names:
+                    self._entries.append({'name': e['name'], 'due': now, 'attempts': 0, 'puts': 0})
+
+            if self._entries:
+                self._idle.clear()
+                self.info('resuming publish of {}'.format(', '.join(e['name'] for e in self._entries)))
+
+        self._update_depth()
+
+    def _dump(self):
+        """
+            write the journal. caller must hold _entries_lock
+        """
+        if not self.path:
+            return
+
+        tmp = '{}.tmp'.format(self.path)
+        with open(tmp, 'w') as wfile:
+            json.dump([{'name': e['name'], 'attempts': e['attempts']} for e in self._entries], wfile)
+        replace_file(tmp, self.path)
+
+# ============= EOF =============================================
@@ -0,0 +1,125 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import time
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+# ============= local library imports  ==========================
+
+FRESH = 'fresh'
+CURRENT = 'current'
+SYNCED = 'synced'
+FAILED = 'failed'
+
+
+class RepositorySyncResult(object):
+    def __init__(self, name, status, elapsed):
+        self.name = name
+        self.status = status
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return '{} {} {:0.2f}s'.format(self.name, self.status, self.elapsed)
+
+
+class RepositorySync(object):
+    """
+        sync many repositories concurrently.
+
+        a repository is skipped if it was synced less than ttl seconds ago (FRESH) or if is_current reports
+        that the local repository already contains the remote HEAD (CURRENT). otherwise sync_func is called
+        (SYNCED or FAILED).
+
+        sync_func and is_current are called with the repository name from worker threads. progress is called with
+        each RepositorySyncResult from the calling thread
+    """
+
+    def __init__(self, ttl=300, max_workers=4):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._last_sync = {}
+        self._lock = Lock()
+
+    def sync(self, names, sync_func, is_current=None, progress=None):
+        """
+            return a list of RepositorySyncResult, one per name
+        """
+        names = sorted(set(names))
+
+        def func(name):
+            st = time.time()
+            status = self._sync(name, sync_func, is_current)
+            return RepositorySyncResult(name, status, time.time() - st)
+
+        n = min(len(names), self.max_workers)
+        if n > 1:
+            pool = ThreadPool(n)
+            try:
+                return self._collect(pool.imap(func, names), progress)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            return self._collect((func(ni) for ni in names), progress)
+
+    def touch(self, name):
+        """
+            mark name as synced now
+        """
+        with self._lock:
+            self._last_sync[name] = time.time()
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._last_sync.clear()
+            else:
+                self._last_sync.pop(name, None)
+
+    def _collect(self, results, progress):
+        rs = []
+        for r in results:
+            if progress is not None:
+                progress(r)
+            rs.append(r)
+        return rs
+
+    def _sync(self, name, sync_func, is_current):
+        with self._lock:
+            last = self._last_sync.get(name)
+
+        if last is not None and time.time() - last < self.ttl:
+            return FRESH
+
+        try:
+            if is_current is not None and is_current(name):
+                status = CURRENT
+            elif sync_func(name):
+                status = SYNCED
+            else:
+                status = FAILED
+        except BaseException:
+            status = FAILED
+
+        if status != FAILED:
+            self.touch(name)
+        return status
+
+# ============= EOF =============================================
@@ -69,6 +69,11 @@ class PullAction(LocalRepositoryAction):
     image = icon('arrow_down')
 
 
+class BuildDataSidecarsAction(LocalRepositoryAction):
+    name = 'Build Data Sidecars'
+    method = 'build_data_sidecars'
+
+
 class FindChangesAction(TaskAction):
     name = 'Find Changes'
     method = 'find_changes'
@@ -63,6 +63,10 @@ class DVCPlugin(BaseTaskPlugin):
         # dvc.meta_repo.cmd('push', '-u','origin','master')
 
         dvc = self.application.get_service(DVC)
+        if dvc.use_publish_outbox:
+            dvc.flush_publish_outbox(timeout=30)
+            dvc.publish_outbox.stop(timeout=5)
+
         with dvc.session_ctx(use_parent_session=False):
             names = dvc.get_usernames()
             self.debug('dumping usernames {}'.format(names))
@@ -69,6 +69,7 @@ class DVCPreferencesPane(PreferencesPane):
 class DVCExperimentPreferences(BasePreferencesHelper):
     preferences_path = 'pychron.dvc.experiment'
     use_dvc_persistence = Bool
+    use_publish_outbox = Bool
 
 
 class DVCExperimentPreferencesPane(PreferencesPane):
@@ -77,6 +78,10 @@ class DVCExperimentPreferencesPane(PreferencesPane):
 
     def traits_view(self):
         v = View(VGroup(Item('use_dvc_persistence', label='Use DVC Persistence'),
+                        Item('use_publish_outbox', label='Push in Background',
+                             enabled_when='use_dvc_persistence',
+                             tooltip='Commit analyses locally and push them to the remote in the background. '
+                                     'Unpushed commits are retried and resumed after a restart'),
                         label='DVC', show_border=True))
         return v
 
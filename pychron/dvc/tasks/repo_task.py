@@ -25,10 +25,11 @@ from pyface.tasks.task_layout import TaskLayout, PaneItem
 from traits.api import List, Str, Any, HasTraits, Bool, Instance, Int
 
 # ============= local library imports  ==========================
-from pychron.core.progress import progress_loader
+from pychron.core.progress import progress_loader, progress_iterator
+from pychron.dvc.data_sidecar import iter_data_paths, make_sidecar
 from pychron.dvc.tasks import list_local_repos
 from pychron.dvc.tasks.actions import CloneAction, AddBranchAction, CheckoutBranchAction, PushAction, PullAction, \
-    FindChangesAction, LoadOriginAction
+    FindChangesAction, LoadOriginAction, BuildDataSidecarsAction
 from pychron.dvc.tasks.panes import RepoCentralPane, SelectionPane
 from pychron.envisage.tasks.base_task import BaseTask
 # from pychron.git_archive.history import from_gitlog
@@ -72,7 +73,8 @@ class ExperimentRepoTask(BaseTask):
                           PushAction(),
                           PullAction(),
                           LoadOriginAction(),
-                          FindChangesAction())]
+                          FindChangesAction(),
+                          BuildDataSidecarsAction())]
 
     commits = List
     _repo = None
@@ -145,6 +147,28 @@ class ExperimentRepoTask(BaseTask):
             service.clone_from(name, path, self.organization)
             self.refresh_local_names()
 
+    def build_data_sidecars(self):
+        name = self.selected_local_repository_name.name
+        self.info('build data sidecars for {}'.format(name))
+
+        root = os.path.join(paths.repository_dataset_dir, name)
+        ps = list(iter_data_paths(root))
+
+        written = []
+
+        def func(p, prog, i, n):
+            if prog:
+                prog.change_message('Building sidecar {}/{}'.format(i, n))
+            sp = make_sidecar(p)
+            if sp:
+                written.append(sp)
+
+        progress_iterator(ps, func, threshold=1)
+        self.info('wrote {} sidecars'.format(len(written)))
+        if written:
+            self._repo.add_paths(written)
+            self._repo.commit('<SIDECAR> added binary data sidecars')
+
     def add_branch(self):
         self.info('add branch')
         commit = self.selected_commit
@@ -0,0 +1,70 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.dvc import dvc_dump, analysis_path
+from pychron.dvc.analysis_cache import AnalysisCache
+from pychron.paths import paths
+
+
+class AnalysisCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self._prev = paths.repository_dataset_dir
+        paths.repository_dataset_dir = self._root
+        os.mkdir(os.path.join(self._root, 'Repo'))
+
+        p = analysis_path('12345-01A', 'Repo', mode='w')
+        dvc_dump({'spec_sha': 'abc'}, p)
+        p = analysis_path('12345-01A', 'Repo', modifier='intercepts', mode='w')
+        dvc_dump({'Ar40': {'value': 1}}, p)
+        self._intercepts_path = p
+
+    def tearDown(self):
+        paths.repository_dataset_dir = self._prev
+        shutil.rmtree(self._root)
+
+    def test_hit(self):
+        cache = AnalysisCache()
+        docs = cache.get_documents('12345-01A', 'Repo')
+        self.assertEqual(docs[None]['spec_sha'], 'abc')
+        self.assertEqual(docs['intercepts']['Ar40']['value'], 1)
+        self.assertNotIn('blanks', docs)
+
+        docs2 = cache.get_documents('12345-01A', 'Repo')
+        self.assertEqual(docs, docs2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_documents_are_copies(self):
+        cache = AnalysisCache()
+        docs = cache.get_documents('12345-01A', 'Repo')
+        docs['intercepts']['Ar40']['value'] = 2
+
+        docs2 = cache.get_documents('12345-01A', 'Repo')
+        self.assertEqual(docs2['intercepts']['Ar40']['value'], 1)
+        self.assertIsNot(docs2['intercepts'], cache.get_documents('12345-01A', 'Repo')['intercepts'])
+
+    def test_invalidate_on_change(self):
+        cache = AnalysisCache()
+        cache.get_documents('12345-01A', 'Repo')
+
+        dvc_dump({'Ar40': {'value': 200}}, self._intercepts_path)
+        st = os.stat(self._intercepts_path)
+        os.utime(self._intercepts_path, (st.st_atime, st.st_mtime + 10))
+
+        docs = cache.get_documents('12345-01A', 'Repo')
+        self.assertEqual(docs['intercepts']['Ar40']['value'], 200)
+        self.assertEqual(cache.misses, 2)
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(max_size=1)
+        cache.get_documents('12345-01A', 'Repo')
+        cache.get_documents('12345-01B', 'Repo')
+        cache.get_documents('12345-01A', 'Repo')
+        self.assertEqual(cache.misses, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
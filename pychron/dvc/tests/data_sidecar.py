@@ -0,0 +1,101 @@
+from __future__ import absolute_import
+import base64
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import linspace
+
+from pychron.core.helpers.binpack import pack_xy
+from pychron.dvc import dvc_dump
+from pychron.dvc.data_sidecar import make_sidecar, load_sidecar, sidecar_path, backfill_sidecars, VERIFIED
+
+
+def encode(xs, ys):
+    return base64.b64encode(pack_xy(xs, ys)).decode('utf-8')
+
+
+class DataSidecarTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        d = os.path.join(self._root, 'a', '.data')
+        os.makedirs(d)
+        self._path = os.path.join(d, '12345-01A.data.json')
+
+        self.xs = linspace(0, 100, 300)
+        self.ys = linspace(10, 20, 300)
+        self._write()
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+
+    def _write(self, ys=None):
+        if ys is None:
+            ys = self.ys
+
+        blob = encode(self.xs, ys)
+        dvc_dump({'format': '>ff',
+                  'signals': [{'isotope': 'Ar40', 'detector': 'H1', 'blob': blob},
+                              {'isotope': 'Ar39', 'detector': 'AX', 'blob': blob}],
+                  'baselines': [{'detector': 'H1', 'blob': blob}],
+                  'sniffs': []}, self._path)
+
+    def test_roundtrip(self):
+        sp = make_sidecar(self._path)
+        self.assertEqual(sp, sidecar_path(self._path))
+
+        jd = load_sidecar(self._path)
+        self.assertEqual(len(jd['signals']), 2)
+        self.assertEqual(jd['signals'][1]['isotope'], 'Ar39')
+        self.assertEqual(jd['baselines'][0]['detector'], 'H1')
+        self.assertEqual(jd['sniffs'], [])
+        self.assertAlmostEqual(jd['signals'][0]['ys'][-1], 20, 5)
+        self.assertEqual(len(jd['signals'][0]['xs']), 300)
+
+    def test_up_to_date(self):
+        make_sidecar(self._path)
+        self.assertIsNone(make_sidecar(self._path))
+
+    def test_stale(self):
+        make_sidecar(self._path)
+        self._write(ys=self.ys * 2)
+        self.assertIsNone(load_sidecar(self._path))
+
+        make_sidecar(self._path)
+        jd = load_sidecar(self._path)
+        self.assertAlmostEqual(jd['signals'][0]['ys'][-1], 40, 5)
+
+    def test_signature(self):
+        make_sidecar(self._path)
+        st = os.stat(self._path)
+
+        # same size and mtime. the sidecar is trusted without hashing the json file
+        self._write(ys=self.ys * 2)
+        self.assertEqual(os.path.getsize(self._path), st.st_size)
+        os.utime(self._path, (st.st_atime, st.st_mtime))
+        jd = load_sidecar(self._path)
+        self.assertAlmostEqual(jd['signals'][0]['ys'][-1], 20, 5)
+
+    def test_signature_changed(self):
+        make_sidecar(self._path)
+        st = os.stat(self._path)
+
+        # e.g. a checkout rewrites the file with the same contents. the sha1 still matches
+        os.utime(self._path, (st.st_atime, st.st_mtime + 10))
+        jd = load_sidecar(self._path)
+        self.assertAlmostEqual(jd['signals'][0]['ys'][-1], 20, 5)
+        self.assertIsNone(make_sidecar(self._path))
+        self.assertIn(self._path, VERIFIED)
+
+        self._write(ys=self.ys * 2)
+        os.utime(self._path, (st.st_atime, st.st_mtime + 20))
+        self.assertIsNone(load_sidecar(self._path))
+
+    def test_backfill(self):
+        ps = backfill_sidecars(self._root)
+        self.assertEqual(ps, [sidecar_path(self._path)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from threading import Lock, Event
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.dvc import dvc_persister
+from pychron.dvc.dvc import DVC
+from pychron.dvc.dvc_database import DVCDatabase
+from pychron.dvc.dvc_persister import DVCPersister
+from pychron.dvc.meta_cache import META_NAMESPACE
+from pychron.dvc.publish_outbox import PublishOutbox
+from pychron.git_archive.repo_manager import GitRepoManager
+from pychron.paths import paths
+
+
+class Events(object):
+    def __init__(self):
+        self.events = []
+        self._lock = Lock()
+
+    def add(self, kind, name):
+        with self._lock:
+            self.events.append((kind, name, time.time()))
+
+    def kinds(self):
+        return [(k, n) for k, n, t in self.events]
+
+    def time(self, kind, name):
+        return next(t for k, n, t in self.events if k == kind and n == name)
+
+
+EVENTS = Events()
+
+
+class Repo(GitRepoManager):
+    """
+        records pulls instead of running git
+    """
+
+    def open_repo(self, root):
+        self.path = root
+
+    def has_remote(self, remote):
+        return True
+
+    def pull(self, **kw):
+        EVENTS.add('pull', os.path.basename(self.path))
+
+
+class Database(DVCDatabase):
+    def connect(self, *args, **kw):
+        return True
+
+
+class RecordingDVC(DVC):
+    def _meta_repo_name_changed(self):
+        pass
+
+    def open_meta_repo(self):
+        pass
+
+    def meta_pull(self, **kw):
+        EVENTS.add('pull', META_NAMESPACE)
+
+
+class DVCPersisterInitializeTestCase(unittest.TestCase):
+    def setUp(self):
+        EVENTS.events = []
+
+        self.root = tempfile.mkdtemp()
+        self._repository_dataset_dir = paths.repository_dataset_dir
+        paths.repository_dataset_dir = self.root
+
+        self._repo_klass = dvc_persister.GitRepoManager
+        dvc_persister.GitRepoManager = Repo
+
+        self.started = Event()
+        self.dvc = RecordingDVC(bind=False, db=Database(), meta_repo_name='meta')
+        self.dvc.publish_outbox = PublishOutbox(path=os.path.join(self.root, 'publish_outbox.json'),
+                                                publish_func=self._publish,
+                                                coalesce_delay=0, retry_delay=0.01)
+        self.persister = DVCPersister(dvc=self.dvc)
+
+    def tearDown(self):
+        self.dvc.publish_outbox.stop(timeout=1)
+        dvc_persister.GitRepoManager = self._repo_klass
+        paths.repository_dataset_dir = self._repository_dataset_dir
+        shutil.rmtree(self.root)
+
+    def _publish(self, name):
+        # rebase/push of the previous run
+        with self.dvc.publish_outbox.lock(name):
+            EVENTS.add('publish', name)
+            self.started.set()
+            time.sleep(0.2)
+            EVENTS.add('published', name)
+        return True
+
+    def _overlap(self, name, use_outbox):
+        self.dvc.use_publish_outbox = use_outbox
+
+        outbox = self.dvc.publish_outbox
+        outbox.start()
+        outbox.put(name)
+        self.assertTrue(self.started.wait(1))
+
+        self.persister.initialize('repo')
+        EVENTS.add('initialized', 'repo')
+        outbox.flush(timeout=1)
+
+    def test_outbox_skips_pull(self):
+        self._overlap('repo', True)
+        kinds = EVENTS.kinds()
+        self.assertNotIn(('pull', 'repo'), kinds)
+        self.assertNotIn(('pull', META_NAMESPACE), kinds)
+
+        # the run is not blocked by the publish of the previous run
+        self.assertLess(EVENTS.time('initialized', 'repo'), EVENTS.time('published', 'repo'))
+
+    def test_repository_pull_waits_for_publish(self):
+        self._overlap('repo', False)
+        self.assertLessEqual(EVENTS.time('published', 'repo'), EVENTS.time('pull', 'repo'))
+
+    def test_meta_pull_waits_for_publish(self):
+        self._overlap(META_NAMESPACE, False)
+        self.assertLessEqual(EVENTS.time('published', META_NAMESPACE), EVENTS.time('pull', META_NAMESPACE))
+
+
+if __name__ == '__main__':
+    unittest.main()
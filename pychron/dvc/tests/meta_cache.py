@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.dvc.meta_cache import MetaCache
+
+
+class MetaCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self._path = os.path.join(self._root, 'a.json')
+        with open(self._path, 'w') as wfile:
+            wfile.write('1')
+
+        self.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+
+    def _factory(self):
+        self.calls += 1
+        return self.calls
+
+    def test_hit(self):
+        c = MetaCache()
+        self.assertEqual(c.get('meta', 'a', self._factory), 1)
+        self.assertEqual(c.get('meta', 'a', self._factory), 1)
+        self.assertEqual((c.hits, c.misses), (1, 1))
+
+    def test_cache_none(self):
+        c = MetaCache()
+        c.get('meta', 'a', lambda: None)
+        c.get('meta', 'a', lambda: None)
+        self.assertEqual(c.hits, 1)
+
+    def test_file_changed(self):
+        c = MetaCache()
+        c.get('meta', 'a', self._factory, (self._path,))
+        with open(self._path, 'w') as wfile:
+            wfile.write('12')
+        self.assertEqual(c.get('meta', 'a', self._factory, (self._path,)), 2)
+
+    def test_generation(self):
+        c = MetaCache()
+        c.set_generation('meta', 'abc')
+        c.get('meta', 'a', self._factory)
+        c.get('repo', 'a', self._factory)
+
+        c.set_generation('meta', 'abc')
+        self.assertEqual(c.get('meta', 'a', self._factory), 1)
+
+        c.set_generation('meta', 'def')
+        self.assertEqual(c.get('meta', 'a', self._factory), 3)
+        self.assertEqual(c.get('repo', 'a', self._factory), 2)
+
+    def test_bounded(self):
+        c = MetaCache(max_size=2)
+        for k in 'abc':
+            c.get('meta', k, self._factory)
+        self.assertEqual(c.get('meta', 'a', self._factory), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from threading import Lock
+
+from pychron.core.helpers.filetools import replace_file
+from pychron.dvc.publish_outbox import PublishOutbox
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+
+class Publisher(object):
+    def __init__(self, nfail=0):
+        self.nfail = nfail
+        self.calls = []
+        self._lock = Lock()
+
+    def __call__(self, name):
+        with self._lock:
+            self.calls.append(name)
+            if self.nfail:
+                self.nfail -= 1
+                raise ValueError('remote unavailable')
+        return True
+
+
+class PublishOutboxTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.path = os.path.join(self._root, 'outbox.json')
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+
+    def _outbox(self, publisher, **kw):
+        outbox = PublishOutbox(path=self.path, publish_func=publisher, coalesce_delay=0.05, retry_delay=0.01, **kw)
+        self.addCleanup(outbox.stop, 1)
+        return outbox
+
+    def test_coalesce(self):
+        publisher = Publisher()
+        outbox = self._outbox(publisher)
+        outbox.start()
+        for i in range(3):
+            outbox.put('repo_a')
+            outbox.put('meta')
+
+        self.assertEqual(outbox.queue_depth, 2)
+        self.assertTrue(outbox.flush(5))
+        self.assertEqual(sorted(publisher.calls), ['meta', 'repo_a'])
+        self.assertEqual(outbox.queue_depth, 0)
+        self.assertEqual(outbox.pending(), [])
+
+    def test_put_is_deferred(self):
+        publisher = Publisher()
+        outbox = self._outbox(publisher)
+        outbox.coalesce_delay = 60
+        outbox.start()
+        outbox.put('repo_a')
+        time.sleep(0.1)
+        self.assertEqual(publisher.calls, [])
+        self.assertTrue(outbox.flush(5))
+        self.assertEqual(publisher.calls, ['repo_a'])
+
+    def test_retry(self):
+        publisher = Publisher(nfail=3)
+        outbox = self._outbox(publisher)
+        outbox.start()
+        outbox.put('repo_a')
+
+        st = time.time()
+        while outbox.pending() and time.time() - st < 5:
+            time.sleep(0.01)
+
+        self.assertEqual(publisher.calls, ['repo_a'] * 4)
+        self.assertEqual(outbox.last_error, '')
+        self.assertGreater(outbox.last_push_timestamp, 0)
+
+    def test_resume_from_journal(self):
+        outbox = self._outbox(Publisher())
+        outbox.put('repo_a')
+        outbox.put('repo_b')
+        self.assertTrue(os.path.isfile(self.path))
+
+        # a new outbox, e.g. after restarting the application, publishes the journaled repositories
+        publisher = Publisher()
+        outbox = self._outbox(publisher)
+        outbox.start()
+        self.assertTrue(outbox.flush(5))
+        self.assertEqual(sorted(publisher.calls), ['repo_a', 'repo_b'])
+
+        outbox = self._outbox(Publisher())
+        outbox._load()
+        self.assertEqual(outbox.pending(), [])
+
+    def test_replace_file(self):
+        src = os.path.join(self._root, 'src.txt')
+        for txt in ('a', 'b'):
+            with open(src, 'w') as wfile:
+                wfile.write(txt)
+            replace_file(src, self.path)
+
+        self.assertFalse(os.path.isfile(src))
+        with open(self.path, 'r') as rfile:
+            self.assertEqual(rfile.read(), 'b')
+
+
+if __name__ == '__main__':
+    unittest.main()
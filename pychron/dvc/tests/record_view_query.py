@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from pychron.dvc.dvc_database import record_view_options
+from pychron.dvc.dvc_orm import Base, AnalysisTbl, AnalysisChangeTbl, IrradiationPositionTbl, LevelTbl, \
+    IrradiationTbl, SampleTbl, ProjectTbl, MaterialTbl, PrincipalInvestigatorTbl, RepositoryTbl, \
+    RepositoryAssociationTbl, MeasuredPositionTbl
+
+
+class RecordViewQueryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.session = sess = sessionmaker(bind=engine)()
+
+        pi = PrincipalInvestigatorTbl(last_name='Foo', first_initial='B')
+        sess.add(RepositoryTbl(name='Repo'))
+        irrad = IrradiationTbl(name='NM-100')
+        t = datetime(2018, 1, 1)
+        for i in range(20):
+            level = LevelTbl(name='ABCD'[i % 4], irradiation=irrad)
+            project = ProjectTbl(name='Project{}'.format(i), principal_investigator=pi)
+            material = MaterialTbl(name='Material{}'.format(i))
+            sample = SampleTbl(name='Sample{}'.format(i), project=project, material=material)
+            ip = IrradiationPositionTbl(identifier='{}'.format(1000 + i), position=i, level=level, sample=sample)
+            for j in range(3):
+                an = AnalysisTbl(aliquot=j, increment=-1, irradiation_position=ip, analysis_type='unknown',
+                                 timestamp=t + timedelta(hours=i * 3 + j))
+                an.change = AnalysisChangeTbl(tag='ok')
+                an.measured_positions.append(MeasuredPositionTbl(position=i))
+                an.repository_associations.append(RepositoryAssociationTbl(repository='Repo'))
+                sess.add(an)
+        sess.commit()
+        sess.close()
+
+        self.statements = []
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+        self.session.close()
+
+    def _count(self, *args, **kw):
+        self.statements.append(args[2])
+
+    def _make_records(self, limit, options=True, joins=(IrradiationPositionTbl,)):
+        sess = self.session
+        q = sess.query(AnalysisTbl)
+        for t in joins:
+            q = q.join(t)
+        if options:
+            q = q.options(*record_view_options(joins))
+        q = q.order_by(AnalysisTbl.timestamp.asc()).limit(limit)
+
+        rs = []
+        for a in q.all():
+            for r in a.record_views:
+                rs.append((r.record_id, r.tag, r.irradiation, r.irradiation_level, r.project,
+                           r.principal_investigator, r.sample, r.material, r.position, r.repository_identifier))
+        sess.close()
+        return rs
+
+    def test_constant_round_trips(self):
+        rs = self._make_records(10)
+        n10 = len(self.statements)
+
+        del self.statements[:]
+        rs60 = self._make_records(60)
+        self.assertEqual(len(self.statements), n10)
+        self.assertLessEqual(n10, 3)
+
+        self.assertEqual(len(rs60), 60)
+        self.assertEqual(rs60[:10], rs)
+
+    def test_matches_lazy(self):
+        lazy = self._make_records(60, options=False)
+        nlazy = len(self.statements)
+
+        del self.statements[:]
+        eager = self._make_records(60)
+        self.assertEqual(lazy, eager)
+        self.assertLess(len(self.statements), nlazy)
+
+    def test_contains_eager(self):
+        joins = (AnalysisChangeTbl, IrradiationPositionTbl, SampleTbl, ProjectTbl)
+        lazy = self._make_records(60, options=False, joins=joins)
+
+        del self.statements[:]
+        eager = self._make_records(60, joins=joins)
+        self.assertEqual(lazy, eager)
+        self.assertLessEqual(len(self.statements), 3)
+
+        # the explicitly joined tables are not joined a second time
+        main = self.statements[0]
+        for t in joins:
+            self.assertEqual(main.count('JOIN "{}"'.format(t.__tablename__)), 1)
+            self.assertNotIn('"{}_1"'.format(t.__tablename__), main)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+from threading import Lock, current_thread
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.dvc.dvc import DVC
+from pychron.dvc.repository_sync import RepositorySync, FRESH, CURRENT, SYNCED, FAILED
+from pychron.paths import paths
+
+
+class RepositorySyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.synced = []
+        self._lock = Lock()
+
+    def _sync(self, name):
+        with self._lock:
+            self.synced.append(name)
+        if name == 'bad':
+            raise GitError()
+        return True
+
+    def test_sync(self):
+        rs = RepositorySync(max_workers=4)
+        results = rs.sync(['a', 'b', 'c', 'a'], self._sync)
+        self.assertEqual([r.name for r in results], ['a', 'b', 'c'])
+        self.assertEqual({r.status for r in results}, {SYNCED})
+        self.assertEqual(sorted(self.synced), ['a', 'b', 'c'])
+
+    def test_ttl(self):
+        rs = RepositorySync(ttl=100)
+        rs.sync(['a'], self._sync)
+        results = rs.sync(['a', 'b'], self._sync)
+        self.assertEqual([r.status for r in results], [FRESH, SYNCED])
+        self.assertEqual(self.synced, ['a', 'b'])
+
+        rs.invalidate('a')
+        rs.sync(['a'], self._sync)
+        self.assertEqual(self.synced, ['a', 'b', 'a'])
+
+    def test_zero_ttl(self):
+        rs = RepositorySync(ttl=0)
+        rs.sync(['a'], self._sync)
+        rs.sync(['a'], self._sync)
+        self.assertEqual(self.synced, ['a', 'a'])
+
+    def test_current(self):
+        rs = RepositorySync(ttl=0)
+        results = rs.sync(['a', 'b'], self._sync, is_current=lambda n: n == 'a')
+        self.assertEqual([r.status for r in results], [CURRENT, SYNCED])
+        self.assertEqual(self.synced, ['b'])
+
+    def test_failed(self):
+        rs = RepositorySync(ttl=100)
+        results = rs.sync(['bad'], self._sync)
+        self.assertEqual(results[0].status, FAILED)
+
+        # failed repositories are retried
+        rs.sync(['bad'], self._sync)
+        self.assertEqual(self.synced, ['bad', 'bad'])
+
+    def test_progress(self):
+        calls = []
+        rs = RepositorySync(max_workers=4)
+        results = rs.sync(['c', 'b', 'a', 'bad'], self._sync,
+                          progress=lambda r: calls.append((r.name, current_thread())))
+        self.assertEqual(calls, [(r.name, current_thread()) for r in results])
+        self.assertEqual([n for n, t in calls], ['a', 'b', 'bad', 'c'])
+
+
+class GitError(Exception):
+    pass
+
+
+class Progress(object):
+    def __init__(self):
+        self.messages = []
+        self.threads = set()
+
+    def change_message(self, msg):
+        self.threads.add(current_thread())
+        self.messages.append(msg)
+
+    def close(self):
+        pass
+
+
+class Repo(object):
+    def __init__(self, name, calls):
+        self.name = name
+        self._calls = calls
+
+    def pull(self, **kw):
+        self._calls.append(('pull', self.name, current_thread()))
+
+
+class SyncDVC(DVC):
+    """
+        records pulls and clones instead of running git
+    """
+    calls = None
+
+    def remote_repository_names(self):
+        self.calls.append(('remote', None, current_thread()))
+        return ['b']
+
+    def _get_repository(self, name, as_current=True):
+        return Repo(name, self.calls)
+
+    def _repository_is_current(self, name):
+        return False
+
+    def _update_cache_generation(self, namespace, repo):
+        pass
+
+    def _clone_repository(self, name, names):
+        self.calls.append(('clone', name, current_thread()))
+        return name in names
+
+
+class DVCSyncRepositoriesTestCase(unittest.TestCase):
+    def setUp(self):
+        self._dvc_dir = paths.dvc_dir
+        paths.dvc_dir = self.root = tempfile.mkdtemp()
+        for name in ('a', 'c'):
+            os.makedirs(os.path.join(self.root, 'repositories', name, '.git'))
+
+        self.dvc = SyncDVC(bind=False, calls=[])
+        self.dvc.repository_sync_workers = 2
+
+    def tearDown(self):
+        paths.dvc_dir = self._dvc_dir
+        shutil.rmtree(self.root)
+
+    def test_clone_on_calling_thread(self):
+        prog = Progress()
+        results = self.dvc.sync_repositories(['a', 'b', 'c', 'd'], progress=prog)
+        self.assertEqual([(r.name, r.status) for r in results],
+                         [('a', SYNCED), ('c', SYNCED), ('b', SYNCED), ('d', FAILED)])
+
+        calls = self.dvc.calls
+        self.assertEqual(sorted(n for k, n, t in calls if k == 'pull'), ['a', 'c'])
+        self.assertTrue(all(t is not current_thread() for k, n, t in calls if k == 'pull'))
+
+        # the remote is listed once, after the pulls, and clones run on the calling thread
+        kinds = [k for k, n, t in calls]
+        self.assertEqual(kinds[2:], ['remote', 'clone', 'clone'])
+        self.assertTrue(all(t is current_thread() for k, n, t in calls if k != 'pull'))
+
+        self.assertEqual(len(prog.messages), 4)
+        self.assertEqual(prog.threads, {current_thread()})
+
+
+if __name__ == '__main__':
+    unittest.main()
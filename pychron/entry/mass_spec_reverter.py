@@ -15,8 +15,6 @@
 # ===============================================================================
 from __future__ import absolute_import
 from pychron.core.ui import set_qt
-from six.moves import range
-from six.moves import zip
 
 set_qt()
 
@@ -24,9 +22,8 @@ set_qt()
 from traits.api import Any, Str
 # ============= standard library imports ========================
 import os
-import struct
-from numpy import array
 # ============= local library imports  ==========================
+from pychron.core.helpers.binpack import pack, pack_xy, unpack_xy
 from pychron.core.helpers.filetools import pathtolist
 from pychron.loggable import Loggable
 from pychron.core.helpers.logger_setup import logging_setup
@@ -118,16 +115,13 @@ class MassSpecReverter(Loggable):
         bs = bsys.mean()
         cys = ys - bs
 
-        ncblob = ''.join([struct.pack('>f', v) for v in ys])
-        cblob = ''.join([struct.pack('>ff', y, x) for y, x in zip(cys, xs)])
+        ncblob = pack('>f', [(v,) for v in ys])
+        cblob = pack_xy(cys, xs)
 
         return cblob, ncblob
 
     def _unpack_data(self, blob):
-        endianness = '>'
-        sx, sy = list(zip(*[struct.unpack('{}ff'.format(endianness),
-                                     blob[i:i + 8]) for i in range(0, len(blob), 8)]))
-        return array(sx), array(sy)
+        return unpack_xy(blob, '>')
 
     def _get_analysis_from_source(self, rid):
         if rid.count('-') > 1:
@@ -0,0 +1,130 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+    benchmark device bring-up at startup using simulated devices.
+
+    each device waits open_delay seconds to connect and initialize_delay seconds to initialize. offline devices
+    wait timeout seconds and fail, like a device that does not answer. devices are spread over channels, devices on
+    the same channel share a serial port/address and are opened one after another. the devices are opened
+    sequentially (workers=1) and concurrently, initialization is always sequential. the per device timings and the total
+    speedup are reported
+
+    python -m pychron.envisage.initialization.bringup_benchmark --devices 12 --channels 8 --offline 2 --workers 4
+"""
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+from __future__ import print_function
+
+import argparse
+import time
+
+# ============= local library imports  ==========================
+from pychron.envisage.initialization.device_bringup import DeviceBringup
+
+
+class SimulatedCommunicator(object):
+    def __init__(self, address):
+        self.address = address
+
+
+class SimulatedDevice(object):
+    """
+        minimal stand in for a CoreDevice
+    """
+
+    def __init__(self, name, address, open_delay, initialize_delay, offline=False, timeout=1.0):
+        self.name = name
+        self.communicator = SimulatedCommunicator(address)
+        self.open_delay = open_delay
+        self.initialize_delay = initialize_delay
+        self.offline = offline
+        self.timeout = timeout
+
+    def open(self, **kw):
+        if self.offline:
+            time.sleep(self.timeout)
+            return False
+
+        time.sleep(self.open_delay)
+        return True
+
+    def initialize(self, **kw):
+        if self.offline:
+            time.sleep(self.timeout)
+            return False
+
+        time.sleep(self.initialize_delay)
+        return True
+
+
+def make_devices(n, channels, offline=0, open_delay=0.2, initialize_delay=0.3, timeout=1.0):
+    return [SimulatedDevice('device{:02d}'.format(i), 'channel{}'.format(i % max(1, channels)),
+                            open_delay, initialize_delay,
+                            offline=i < offline, timeout=timeout)
+            for i in range(n)]
+
+
+def bringup(devices, workers):
+    b = DeviceBringup(devices,
+                      lambda d: d.open(),
+                      lambda d, p: d.initialize(progress=p),
+                      workers=workers)
+    rs = b.run()
+    return b.duration, rs
+
+
+def benchmark(devices, workers=4):
+    """
+        return (sequential duration, sequential results, concurrent duration, concurrent results)
+    """
+    st, srs = bringup(devices, 1)
+    ct, crs = bringup(devices, workers)
+    return st, srs, ct, crs
+
+
+def report(st, srs, ct, crs):
+    print('{:<12s} {:<10s} {:>10s} {:>10s} {:>8s}'.format('device', 'channel', 'seq (s)', 'conc (s)', 'result'))
+    for s, c in zip(srs, crs):
+        print('{:<12s} {:<10s} {:>10.2f} {:>10.2f} {:>8s}'.format(s.name, s.device.communicator.address,
+                                                                 s.open_time + s.initialize_time,
+                                                                 c.open_time + c.initialize_time,
+                                                                 str(c.result)))
+
+    print('devices={} seq={:0.2f}s conc={:0.2f}s speedup={:0.2f} parity={}'.format(
+        len(srs), st, ct, st / ct if ct else 0, all(s.result == c.result for s, c in zip(srs, crs))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark device bring-up at startup')
+    parser.add_argument('--devices', type=int, default=12)
+    parser.add_argument('--channels', type=int, default=8, help='number of distinct serial ports/addresses')
+    parser.add_argument('--offline', type=int, default=2, help='number of devices that do not answer')
+    parser.add_argument('--open-delay', type=float, default=0.2)
+    parser.add_argument('--initialize-delay', type=float, default=0.3)
+    parser.add_argument('--timeout', type=float, default=1.0, help='time an offline device takes to fail')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    devices = make_devices(args.devices, args.channels, args.offline,
+                           args.open_delay, args.initialize_delay, args.timeout)
+    report(*benchmark(devices, args.workers))
+
+
+if __name__ == '__main__':
+    main()
+
+# ============= EOF =============================================
@@ -0,0 +1,195 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import time
+from threading import Thread, Event, BoundedSemaphore
+
+# ============= local library imports  ==========================
+
+
+class DependencyError(BaseException):
+    pass
+
+
+def resource_key(dev):
+    """
+        return a key identifying the communication channel of dev. devices with the same key share a scheduler,
+        serial port or address and are opened one after another
+    """
+    name = getattr(dev, '_scheduler_name', None)
+    if name:
+        return 'scheduler:{}'.format(name)
+
+    comm = getattr(dev, 'communicator', None)
+    addr = getattr(comm, 'address', None) if comm is not None else None
+    if addr:
+        return 'address:{}'.format(addr)
+
+    return 'device:{}'.format(dev.name)
+
+
+def sort_dependencies(names, dependencies):
+    """
+        return names ordered so that every name follows its dependencies. the original order is kept otherwise.
+        dependencies not in names are ignored. raise DependencyError for cyclic dependencies
+    """
+    ordered = []
+    visiting = set()
+    done = set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise DependencyError('cyclic device dependency {}'.format(name))
+
+        visiting.add(name)
+        for d in dependencies.get(name, ()):
+            if d in names:
+                visit(d)
+        visiting.remove(name)
+        done.add(name)
+        ordered.append(name)
+
+    for n in names:
+        visit(n)
+    return ordered
+
+
+class BringupResult(object):
+    def __init__(self, device):
+        self.device = device
+        self.opened = False
+        self.result = None
+        self.error = None
+        self.open_time = 0
+        self.initialize_time = 0
+
+    @property
+    def name(self):
+        return self.device.name
+
+    def tostring(self):
+        s = '{:<30s} open={:<5s} {:6.2f}s initialize={:<5s} {:6.2f}s'.format(self.name, str(self.opened),
+                                                                          self.open_time,
+                                                                          str(self.result),
+                                                                          self.initialize_time)
+        if self.error:
+            s = '{} error={}'.format(s, self.error)
+        return s
+
+
+class DeviceBringup(object):
+    """
+        open devices concurrently then initialize them on the calling thread.
+
+        devices sharing a communication channel (see resource_key or key_func) form a group that is opened in order on
+        its own thread. a device is opened after the devices it depends on are opened and initialized after them. at
+        most workers devices are opened at the same time. workers <= 1 opens the devices one after another on the
+        calling thread.
+
+        initialize may open dialogs and keep a reference to progress so it is always called on the calling thread,
+        one device at a time, with the progress dialog passed to DeviceBringup.
+
+        open_func(dev) and initialize_func(dev, progress) return True if successful
+    """
+
+    def __init__(self, devices, open_func, initialize_func, workers=4, dependencies=None, progress=None,
+                 key_func=None):
+        self.devices = devices
+        self.key_func = key_func or resource_key
+        self.open_func = open_func
+        self.initialize_func = initialize_func
+        self.workers = workers
+        self.dependencies = dependencies or {}
+        self.progress = progress
+        self.duration = 0
+
+    def run(self):
+        """
+            return a list of BringupResults in the order of devices
+        """
+        st = time.time()
+        devs = {d.name: d for d in self.devices}
+        names = sort_dependencies([d.name for d in self.devices], self.dependencies)
+        results = {n: BringupResult(devs[n]) for n in names}
+
+        if self.workers <= 1:
+            for n in names:
+                self._open(results[n])
+        else:
+            self._open_groups(names, results)
+
+        for n in names:
+            self._initialize(results[n])
+
+        self.duration = time.time() - st
+        return [results[d.name] for d in self.devices]
+
+    def _open_groups(self, names, results):
+        groups = []
+        keys = {}
+        for n in names:
+            key = self.key_func(results[n].device)
+            try:
+                groups[keys[key]].append(n)
+            except KeyError:
+                keys[key] = len(groups)
+                groups.append([n])
+
+        opened = {n: Event() for n in names}
+        semaphore = BoundedSemaphore(self.workers)
+
+        def open_group(group):
+            for n in group:
+                for d in self.dependencies.get(n, ()):
+                    if d in opened:
+                        opened[d].wait()
+
+                try:
+                    with semaphore:
+                        self._open(results[n])
+                finally:
+                    opened[n].set()
+
+        ts = [Thread(target=open_group, args=(g,), name='bringup-{}'.format(g[0])) for g in groups]
+        for t in ts:
+            t.daemon = True
+            t.start()
+        for t in ts:
+            t.join()
+
+    def _open(self, r):
+        st = time.time()
+        try:
+            r.opened = bool(self.open_func(r.device))
+        except BaseException as e:
+            r.error = 'open: {}'.format(e)
+        r.open_time = time.time() - st
+
+    def _initialize(self, r):
+        st = time.time()
+        try:
+            r.result = self.initialize_func(r.device, self.progress)
+        except BaseException as e:
+            r.result = False
+            r.error = 'initialize: {}'.format(e)
+        r.initialize_time = time.time() - st
+
+# ============= EOF =============================================
@@ -17,10 +17,11 @@
 # ============= enthought library imports =======================
 
 from __future__ import absolute_import
-from traits.api import Any, List
+from traits.api import Any, List, Int
 
 # ============= standard library imports ========================
 # ============= local library imports  ==========================
+from pychron.envisage.initialization.device_bringup import DeviceBringup, DependencyError, resource_key
 from pychron.envisage.initialization.initialization_parser import InitializationParser
 from pychron.loggable import Loggable
 from pychron.paths import paths
@@ -38,6 +39,8 @@ class Initializer(Loggable):
     init_list = List
     parser = Any
     pd = Any
+    device_prefs = Any
+    device_workers = Int(4)
 
     def add_initialization(self, a):
         """
@@ -212,6 +215,7 @@ class Initializer(Loggable):
         """
         """
         devs = []
+        dependencies = {}
         if manager is None:
             return
 
@@ -255,15 +259,24 @@ class Initializer(Loggable):
                                                       {'display': True})
 
                 devs.append(dev)
-                self.info('opening {}'.format(dev.name))
-                if not dev.open(prefs=self.device_prefs):
-                    self.info('failed connecting to {}'.format(dev.name))
+
+                depends = pdev.find('depends')
+                if depends is not None and depends.text:
+                    dependencies[dev.name] = [d.strip() for d in depends.text.split(',') if d.strip()]
             else:
                 self.info('failed loading {}'.format(dev.name))
 
-        for od in devs:
-            self.info('Initializing {}'.format(od.name))
-            result = od.initialize(progress=self.pd)
+        if not devs:
+            return
+
+        self.info('opening and initializing {}'.format(', '.join(d.name for d in devs)))
+        for r in self._bringup_devices(devs, dependencies):
+            od = r.device
+            self.debug('bringup {}'.format(r.tostring()))
+            if not r.opened:
+                self.info('failed connecting to {}'.format(od.name))
+
+            result = r.result
             if result is not True:
                 self.warning('Failed setting up communications to {}'.format(od.name))
                 od.set_simulation(True)
@@ -277,6 +290,46 @@ class Initializer(Loggable):
 
             manager.devices.append(od)
 
+    def _bringup_devices(self, devs, dependencies):
+        """
+            open devs concurrently and initialize them on this thread. see DeviceBringup
+        """
+        prefs = self.device_prefs
+
+        def open_func(dev):
+            return dev.open(prefs=prefs)
+
+        def initialize_func(dev, progress):
+            self.info('Initializing {}'.format(dev.name))
+            return dev.initialize(progress=progress)
+
+        auto_find = False
+        if prefs is not None:
+            sp = getattr(prefs, 'serial_preference', None)
+            auto_find = sp is not None and sp.auto_find_handle
+
+        def key_func(dev):
+            # searching for a serial port may open any port so serial devices are opened one at a time
+            if auto_find and dev.communicator.__class__.__name__ == 'SerialCommunicator':
+                return 'serial'
+            return resource_key(dev)
+
+        bringup = DeviceBringup(devs, open_func, initialize_func,
+                                workers=self.device_workers,
+                                dependencies=dependencies,
+                                progress=self.pd,
+                                key_func=key_func)
+        try:
+            rs = bringup.run()
+        except DependencyError as e:
+            self.warning('{}. opening devices sequentially'.format(e))
+            bringup.dependencies = {}
+            bringup.workers = 1
+            rs = bringup.run()
+
+        self.info('opened and initialized {} devices in {:0.2f}s'.format(len(rs), bringup.duration))
+        return rs
+
     def _load_managers(self,
                        manager,
                        managers,
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+
+import time
+import unittest
+from threading import Lock, current_thread
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.envisage.initialization.bringup_benchmark import make_devices, SimulatedDevice
+from pychron.envisage.initialization.device_bringup import DeviceBringup, DependencyError, sort_dependencies, \
+    resource_key
+
+
+class DeviceBringupTestCase(unittest.TestCase):
+    def setUp(self):
+        self._lock = Lock()
+        self.events = []
+        self.initialize_threads = []
+        self.progresses = []
+
+    def _open(self, dev):
+        self._event('open', dev)
+        r = dev.open()
+        self._event('opened', dev)
+        return r
+
+    def _initialize(self, dev, progress):
+        self.initialize_threads.append(current_thread())
+        self.progresses.append(progress)
+        self._event('initialize', dev)
+        r = dev.initialize()
+        self._event('initialized', dev)
+        return r
+
+    def _event(self, kind, dev):
+        with self._lock:
+            self.events.append((kind, dev.name, time.time()))
+
+    def _bringup(self, devs, **kw):
+        b = DeviceBringup(devs, self._open, self._initialize, **kw)
+        return b, b.run()
+
+    def test_concurrent(self):
+        devs = make_devices(6, 6, open_delay=0.1, initialize_delay=0)
+        b, rs = self._bringup(devs, workers=6)
+        self.assertTrue(all(r.opened and r.result for r in rs))
+        self.assertLess(b.duration, 0.4)
+
+    def test_initialize_on_calling_thread(self):
+        devs = make_devices(4, 4, open_delay=0.02, initialize_delay=0)
+        self._bringup(devs, workers=4)
+        self.assertEqual(self.initialize_threads, [current_thread()] * 4)
+
+        # every device is opened before the first device is initialized
+        kinds = [kind for kind, name, t in self.events if kind in ('opened', 'initialize')]
+        self.assertEqual(kinds, ['opened'] * 4 + ['initialize'] * 4)
+
+    def test_sequential(self):
+        devs = make_devices(4, 4, open_delay=0.02, initialize_delay=0.02)
+        b, rs = self._bringup(devs, workers=1)
+        self.assertEqual([r.name for r in rs], [d.name for d in devs])
+        self.assertGreaterEqual(b.duration, 0.16)
+
+    def test_result_order(self):
+        devs = make_devices(5, 5, open_delay=0, initialize_delay=0)
+        devs[0].initialize_delay = 0.1
+        b, rs = self._bringup(devs, workers=4)
+        self.assertEqual([r.device for r in rs], devs)
+
+    def test_shared_channel(self):
+        devs = make_devices(3, 1, open_delay=0.02, initialize_delay=0.02)
+        self.assertEqual(len({resource_key(d) for d in devs}), 1)
+
+        self._bringup(devs, workers=4)
+        names = [name for kind, name, t in self.events if kind == 'open']
+        self.assertEqual(names, ['device00', 'device01', 'device02'])
+
+        # a device on a shared channel is opened after the previous device is opened
+        for prev, dev in zip(devs, devs[1:]):
+            self.assertLessEqual(self._time('opened', prev.name), self._time('open', dev.name))
+
+    def test_dependencies(self):
+        devs = make_devices(3, 3, open_delay=0, initialize_delay=0)
+        devs[0].open_delay = 0.1
+        self._bringup(devs, workers=4, dependencies={'device00': ['device02'], 'device01': ['device00']})
+        self.assertLessEqual(self._time('opened', 'device00'), self._time('open', 'device01'))
+        self.assertLessEqual(self._time('opened', 'device02'), self._time('open', 'device00'))
+
+        names = [name for kind, name, t in self.events if kind == 'initialize']
+        self.assertEqual(names, ['device02', 'device00', 'device01'])
+
+    def test_sort_dependencies(self):
+        self.assertEqual(sort_dependencies(['a', 'b', 'c'], {'a': ['c']}), ['c', 'a', 'b'])
+        self.assertEqual(sort_dependencies(['a', 'b'], {'a': ['x']}), ['a', 'b'])
+        with self.assertRaises(DependencyError):
+            sort_dependencies(['a', 'b'], {'a': ['b'], 'b': ['a']})
+
+    def test_offline(self):
+        devs = make_devices(2, 2, offline=1, open_delay=0, initialize_delay=0, timeout=0.01)
+        b, rs = self._bringup(devs, workers=2)
+        self.assertFalse(rs[0].opened)
+        self.assertFalse(rs[0].result)
+        self.assertTrue(rs[1].result)
+
+    def test_exception(self):
+        class BadDevice(SimulatedDevice):
+            def initialize(self, **kw):
+                raise ValueError('bad')
+
+        devs = make_devices(2, 2, open_delay=0, initialize_delay=0)
+        devs.append(BadDevice('bad', 'channel9', 0, 0))
+        b, rs = self._bringup(devs, workers=2)
+        self.assertFalse(rs[2].result)
+        self.assertIn('bad', rs[2].error)
+        self.assertTrue(rs[0].result and rs[1].result)
+
+    def test_progress(self):
+        p = object()
+        devs = make_devices(3, 3, open_delay=0, initialize_delay=0)
+        self._bringup(devs, workers=3, progress=p)
+        self.assertEqual(self.progresses, [p] * 3)
+
+    def _time(self, kind, name):
+        return next(t for k, n, t in self.events if k == kind and n == name)
+
+
+if __name__ == '__main__':
+    unittest.main()
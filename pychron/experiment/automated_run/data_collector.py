@@ -116,10 +116,12 @@ class DataCollector(Consoleable):
 
         self._alive = True
 
+        self._reserve_buffers()
         self._measure(evt)
 
         tt = time.time() - st
         self.debug('estimated time: {:0.3f} actual time: :{:0.3f}'.format(et, tt))
+        self._report_conditional_timing()
 
     def plot_data(self, *args, **kw):
         from pychron.core.ui.gui import invoke_in_main_thread
@@ -141,9 +143,14 @@ class DataCollector(Consoleable):
             writer = self.data_writer
             while not q.empty() or not evt.wait(1):
                 dets = self.detectors
+                rows = []
                 while not q.empty():
-                    x, keys, signals = q.get()
-                    writer(dets, x, keys, signals)
+                    rows.append(q.get())
+
+                if rows:
+                    writer.write_rows(dets, rows)
+
+            writer.flush()
 
         # only write to file every 1 seconds and not on main thread
         t = Thread(target=writefunc)
@@ -168,6 +175,23 @@ class DataCollector(Consoleable):
 
         self.debug('measurement finished')
 
+    def _report_conditional_timing(self):
+        if self.check_conditionals:
+            for conditionals in (self.modification_conditionals,
+                                 self.truncation_conditionals,
+                                 self.action_conditionals,
+                                 self.termination_conditionals,
+                                 self.cancelation_conditionals):
+                for ci in conditionals or []:
+                    if getattr(ci, 'neval', 0):
+                        self.debug('conditional timing {}'.format(ci.timing_str()))
+
+    def _reserve_buffers(self):
+        ig = self.isotope_group
+        if ig is not None:
+            kind = BASELINE if self.is_baseline and self.for_peak_hop else self.collection_kind
+            ig.reserve(self.ncounts, kind)
+
     def _iter(self, i):
         # st = time.time()
         result = self._check_iteration(i)
@@ -21,9 +21,11 @@ import math
 import os
 import time
 
+from numpy import empty
 from traits.api import Instance, Bool, Interface, provides, Long, Str, Float
 from xlwt import Workbook, struct
 
+from pychron.core.helpers.binpack import pack, pack_xy
 from pychron.core.helpers.datetime_tools import get_datetime
 from pychron.core.helpers.filetools import subdirize
 from pychron.core.helpers.strtools import to_bool
@@ -57,6 +59,74 @@ class IPersister(Interface):
         pass
 
 
+class H5DataWriter(object):
+    """
+    write measurement data to the tables of a group in the current hdf5 file.
+
+    tables are looked up once, queued rows are appended to each table in a single write
+    and tables are flushed every ``flush_interval`` seconds and by ``flush``
+    """
+
+    def __init__(self, persister, grpname, flush_interval=5):
+        self._persister = persister
+        self._grpname = grpname
+        self._flush_interval = flush_interval
+        self._tables = {}
+        self._dirty = set()
+        self._last_flush = time.time()
+
+    def __call__(self, dets, x, keys, signals):
+        self.write_rows(dets, [(x, keys, signals)])
+
+    def write_rows(self, dets, rows):
+        """
+        :param dets: list of detectors
+        :param rows: list of (x, keys, signals) tuples
+        """
+        data = {}
+        for x, keys, signals in rows:
+            for det in dets:
+                k = det.name
+                if k in keys:
+                    data.setdefault((det.isotope, k), []).append((x, signals[keys.index(k)]))
+
+        for (iso, k), vs in data.items():
+            t = self._get_table(iso, k)
+            if t is None:
+                continue
+
+            ts = empty(len(vs), dtype=t.dtype)
+            ts['time'], ts['value'] = list(zip(*vs))
+            t.append(ts)
+            self._dirty.add(t)
+
+        if time.time() - self._last_flush > self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        for t in self._dirty:
+            t.flush()
+        self._dirty = set()
+        self._last_flush = time.time()
+
+    def _get_table(self, iso, k):
+        grpname = self._grpname
+        if grpname == 'baseline':
+            grp = '/{}'.format(grpname)
+        else:
+            grp = '/{}/{}'.format(grpname, iso)
+
+        tag = '{}/{}'.format(grp, k)
+        try:
+            return self._tables[tag]
+        except KeyError:
+            t = self._persister.data_manager.get_table(k, grp)
+            if t is None:
+                self._persister.debug('no table for group:{} det:{} iso:{}'.format(grpname, k, iso))
+            self._tables[tag] = t
+            return t
+
+
 @provides(IPersister)
 class BasePersister(Loggable):
     per_spec = Instance('pychron.experiment.automated_run.persistence_spec.PersistenceSpec', ())
@@ -221,6 +291,7 @@ class AutomatedRunPersister(BasePersister):
     use_analysis_grouping = Bool(False)
     grouping_threshold = Float
     grouping_suffix = Str
+    data_flush_interval = Float(5)
 
     _db_extraction_id = None
     _temp_analysis_buffer = None
@@ -277,45 +348,12 @@ class AutomatedRunPersister(BasePersister):
     def get_data_writer(self, grpname):
         """
         grpname should be a str such as "signal", "baseline",etc
-        return a closure for writing the data
+        return a writer for the data
 
         :param grpname: str
-        :return: function
+        :return: ``H5DataWriter``
         """
-        tables = {}
-
-        def write_data(dets, x, keys, signals):
-            # todo: test whether saving data to h5 in real time is expansive
-
-            # disable H5 data writer
-            # self.unique_warning('NOT Writing data to H5 in real time')
-            # return
-
-            dm = self.data_manager
-            for det in dets:
-                k = det.name
-                try:
-                    if k in keys:
-                        if grpname == 'baseline':
-                            grp = '/{}'.format(grpname)
-                        else:
-                            grp = '/{}/{}'.format(grpname, det.isotope)
-
-                        tag = '{}/{}'.format(grp, k)
-                        if tag in tables:
-                            t = tables['tag']
-                        else:
-                            t = dm.get_table(k, grp)
-
-                        nrow = t.row
-                        nrow['time'] = x
-                        nrow['value'] = signals[keys.index(k)]
-                        nrow.append()
-                        t.flush()
-                except AttributeError as e:
-                    self.debug('error: {} group:{} det:{} iso:{}'.format(e, grpname, k, det.isotope))
-
-        return write_data
+        return H5DataWriter(self, grpname, flush_interval=self.data_flush_interval)
 
     def build_tables(self, grpname, detectors, n):
         """
@@ -698,7 +736,7 @@ class AutomatedRunPersister(BasePersister):
 
         self.debug('saving data {} {} xs={}'.format(iso.name, kind, len(m.xs)))
         dbiso = db.add_isotope(analysis, iso.name, dbdet, kind=kind)
-        data = ''.join([struct.pack('>ff', x, y) for x, y in zip(m.xs, m.ys)])
+        data = pack_xy(m.xs, m.ys)
         db.add_signal(dbiso, data)
 
         add_result = kind in ('baseline', 'signal')
@@ -913,7 +951,7 @@ class AutomatedRunPersister(BasePersister):
             self.info('saving monitor info')
 
             for ci in self.per_spec.monitor.checks:
-                data = ''.join([struct.pack('>ff', x, y) for x, y in ci.data])
+                data = pack('>ff', ci.data)
                 params = dict(name=ci.name,
                               parameter=ci.parameter, criterion=ci.criterion,
                               comparator=ci.comparator, tripped=ci.tripped,
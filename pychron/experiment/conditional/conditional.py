@@ -17,6 +17,7 @@
 # ============= enthought library imports =======================
 from __future__ import absolute_import
 import os
+import time
 
 from traits.api import Str, Either, Int, Callable, Bool, Float, Enum
 
@@ -163,10 +164,14 @@ class BaseConditional(Loggable):
                        ntrips=ntrips, analysis_types=analysis_types,
                        **kw)
         self._from_dict_hook(cd)
+        self.compile()
 
     def _from_dict_hook(self, cd):
         pass
 
+    def compile(self):
+        pass
+
     def to_string(self):
         raise NotImplementedError
 
@@ -214,9 +219,21 @@ class AutomatedRunConditional(BaseConditional):
     ntrips = Int(1)
     trips = 0
 
+    verbose = False
+
+    # evaluation timing. seconds
+    neval = 0
+    total_eval_time = 0
+    max_eval_time = 0
+
     _teststr = None
     _ctx = None
-    value_context = None
+
+    _compiled = None
+    _tokens = None
+    _codes = None
+    _use_std = False
+    _mapper_code = None
 
     # def __init__(self, attr, teststr,
     # start_count=0,
@@ -235,6 +252,44 @@ class AutomatedRunConditional(BaseConditional):
         self.frequency = frequency
         super(AutomatedRunConditional, self).__init__(*args, **kw)
 
+    @property
+    def value_context(self):
+        if self._ctx is not None:
+            return pprint.pformat(self._ctx, width=1)
+
+    def compile(self):
+        """
+        parse teststr and mapper once.
+
+        each token of teststr is reduced to (teststr fragment, context key, value accessor, needs interpolation,
+        operator). the joined teststr fragments are compiled on first use and cached
+        """
+        teststr = self.teststr
+        tokens = []
+        for ti, oper in tokenize(teststr):
+            ts, attr, func = get_teststr_attr_func(ti)
+
+            attr = attr.replace('(', '_').replace(')', '_')
+            ts = ts.replace('(', '_').replace(')', '_')
+            tokens.append((ts, attr, func, bool(INTERPOLATE_REGEX.search(ts)), oper))
+
+        self._tokens = tokens
+        self._use_std = bool(STD_REGEX.match(teststr))
+        self._codes = {}
+
+        self._mapper_code = None
+        if self.mapper:
+            m = MAPPER_KEY_REGEX.search(self.mapper)
+            if m:
+                self._mapper_code = m.group(0), compile(self.mapper, '<mapper>', 'eval')
+
+        self._compiled = teststr, self.mapper
+
+    def timing_str(self):
+        avg = self.total_eval_time / self.neval if self.neval else 0
+        return '{} n={} avg={:0.3f}ms max={:0.3f}ms'.format(self.teststr, self.neval, avg * 1000,
+                                                            self.max_eval_time * 1000)
+
     def to_string(self):
         s = '{} {}'.format(self.teststr, self.message)
         return s
@@ -285,46 +340,60 @@ class AutomatedRunConditional(BaseConditional):
         evaluate the teststr with the context
 
         """
+        st = time.time()
+        verbose = verbose or self.verbose
+
         teststr, ctx = self._make_context(run, data)
         self._teststr, self._ctx = teststr, ctx
 
-        self.value_context = vc = pprint.pformat(ctx, width=1)
-
-        self.debug('testing {}'.format(teststr))
         if verbose:
+            self.debug('testing {}'.format(teststr))
             self.debug('attribute context {}'.format(pprint.pformat(self._attr_dict(), width=1)))
-        msg = 'evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, vc)
-        self.debug(msg)
+            self.debug('evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, self.value_context))
+
+        ret = None
         if teststr and ctx:
-            if eval(teststr, ctx):
+            # eval adds __builtins__ to the globals so pass a copy of ctx
+            if eval(self._get_code(teststr), dict(ctx)):
                 self.trips += 1
-                self.debug('condition {} is true trips={}/{}'.format(teststr, self.trips,
-                                                                     self.ntrips))
+                self.debug('condition {} is true trips={}/{} ctx={}'.format(teststr, self.trips,
+                                                                            self.ntrips, self.value_context))
                 if self.trips >= self.ntrips:
                     self.tripped = True
                     self.message = 'condition {} is True'.format(teststr)
                     self.trips = 0
-                    return True
+                    ret = True
             else:
                 self.trips = 0
 
+        et = time.time() - st
+        self.neval += 1
+        self.total_eval_time += et
+        self.max_eval_time = max(self.max_eval_time, et)
+        return ret
+
+    def _get_code(self, teststr):
+        try:
+            return self._codes[teststr]
+        except KeyError:
+            code = self._codes[teststr] = compile(teststr, '<conditional>', 'eval')
+            return code
+
     def _make_context(self, obj, data):
-        teststr = self.teststr
+        if self._compiled != (self.teststr, self.mapper):
+            self.compile()
+
         ctx = {}
         tt = []
-        for ti, oper in tokenize(teststr):
-            ts, attr, func = get_teststr_attr_func(ti)
-
-            attr = attr.replace('(', '_').replace(')', '_')
-            ts = ts.replace('(', '_').replace(')', '_')
-
-            v = func(obj, data, self.window)
+        window = self.window
+        for ts, attr, func, interpolate, oper in self._tokens:
+            v = func(obj, data, window)
             if v is not None:
-                vv = std_dev(v) if STD_REGEX.match(teststr) else nominal_value(v)
-                vv = self._map_value(vv)
-                ctx[attr] = vv
+                vv = std_dev(v) if self._use_std else nominal_value(v)
+                ctx[attr] = self._map_value(vv)
 
-                ts = self._interpolate_teststr(ts, obj, data)
+                if interpolate:
+                    ts = self._interpolate_teststr(ts, obj, data)
                 tt.append(ts)
                 if oper:
                     tt.append(oper)
@@ -332,11 +401,9 @@ class AutomatedRunConditional(BaseConditional):
         return ' '.join(tt), ctx
 
     def _map_value(self, vv):
-        if self.mapper:
-            m = MAPPER_KEY_REGEX.search(self.mapper)
-            if m:
-                key = m.group(0)
-                vv = eval(self.mapper, {key: vv})
+        if self._mapper_code:
+            key, code = self._mapper_code
+            vv = eval(code, {key: vv})
         return vv
 
     def _interpolate_teststr(self, ts, obj, data):
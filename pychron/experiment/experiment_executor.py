@@ -155,6 +155,10 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
     measuring = Bool(False)
     extracting = Bool(False)
 
+    # dvc publish outbox
+    publish_queue_depth = Int
+    last_publish_latency = Float
+
     mode = 'normal'
     # ===========================================================================
     # preferences
@@ -862,6 +866,8 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
                 self.stats.update_run_duration(run, t)
                 self.stats.recalculate_etf()
 
+        self._update_publish_status()
+
         # write rem and ex queues
         self._write_rem_ex_experiment_queues()
 
@@ -982,6 +988,8 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
         if self.stats:
             self.stats.stop_timer()
 
+        self._update_publish_status()
+
         # self.db.close()
         self.set_extract_state(False)
         # self.extraction_state = False
@@ -1500,6 +1508,17 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
         return True
 
+    def _update_publish_status(self):
+        if not self.use_dvc_persistence:
+            return
+
+        dvc = self.datahub.mainstore
+        if dvc and dvc.use_publish_outbox:
+            outbox = dvc.publish_outbox
+            self.publish_queue_depth = outbox.queue_depth
+            self.last_publish_latency = outbox.last_push_latency
+            self.debug('publish outbox {}'.format(outbox.status()))
+
     def _check_dashboard(self, inform):
         """
         return True if dashboard has an error
@@ -310,5 +310,35 @@ class ConditionalsTestCase(unittest.TestCase):
         self.assertEqual(ret, expected)
 
 
+
+class CompiledConditionalTestCase(unittest.TestCase):
+    setUp = ConditionalsTestCase.setUp
+
+    def test_compiled_once(self):
+        c = conditional_from_dict({'check': 'age>0.1 and Ar40<100'}, 'TerminationConditional')
+        tokens = c._tokens
+        self.assertEqual(len(tokens), 2)
+
+        for i in range(3):
+            self.assertTrue(c.check(self.arun, ([], []), 1000))
+
+        self.assertIs(c._tokens, tokens)
+        self.assertEqual(list(c._codes.keys()), ['age>0.1 and Ar40<100'])
+        self.assertEqual(c.neval, 3)
+
+    def test_recompile(self):
+        c = conditional_from_dict({'check': 'Ar40<100'}, 'TerminationConditional')
+        self.assertTrue(c.check(self.arun, ([], []), 1000))
+        c.teststr = 'Ar40>100'
+        self.assertIsNone(c.check(self.arun, ([], []), 1000))
+
+    def test_value_context(self):
+        c = conditional_from_dict({'check': 'Ar40>10'}, 'TerminationConditional')
+        self.assertIsNone(c.value_context)
+        c.check(self.arun, ([], []), 1000)
+        self.assertIn("'Ar40'", c.value_context)
+        self.assertNotIn('__builtins__', c.value_context)
+
+
 if __name__ == '__main__':
     unittest.main()
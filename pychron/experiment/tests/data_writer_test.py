@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import tables
+except ImportError:
+    tables = None
+
+if tables is not None:
+    from pychron.experiment.automated_run.persistence import H5DataWriter
+    from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+
+class Detector(object):
+    def __init__(self, name, isotope):
+        self.name = name
+        self.isotope = isotope
+
+
+class Persister(object):
+    def __init__(self, dm):
+        self.data_manager = dm
+
+    def debug(self, msg):
+        pass
+
+
+@unittest.skipIf(tables is None, 'pytables not installed')
+class H5DataWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.path = os.path.join(self._root, 'frame.hdf5')
+        self.dm = dm = H5DataManager()
+        self.dets = [Detector('H1', 'Ar40'), Detector('CDD', 'Ar36')]
+        with dm.open_file(self.path, 'w'):
+            dm.new_group('signal')
+            for d in self.dets:
+                grp = dm.new_group(d.isotope, parent='/signal')
+                dm.new_table(grp, d.name)
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+
+    def test_write_rows(self):
+        dm = self.dm
+        writer = H5DataWriter(Persister(dm), 'signal', flush_interval=100)
+        keys = ['H1', 'CDD']
+        with dm.open_file(self.path):
+            writer.write_rows(self.dets, [(i, keys, (10. + i, 0.1 * i)) for i in range(5)])
+            writer(self.dets, 5, ['H1'], (15.,))
+            writer.flush()
+
+        with dm.open_file(self.path, 'r'):
+            t = dm.get_table('H1', '/signal/Ar40')
+            self.assertEqual(list(t.col('time')), [0, 1, 2, 3, 4, 5])
+            self.assertEqual(list(t.col('value')), [10, 11, 12, 13, 14, 15])
+
+            t = dm.get_table('CDD', '/signal/Ar36')
+            self.assertEqual(t.nrows, 5)
+
+    def test_missing_table(self):
+        dm = self.dm
+        writer = H5DataWriter(Persister(dm), 'signal')
+        with dm.open_file(self.path):
+            writer.write_rows([Detector('L2', 'Ar38')], [(0, ['L2'], (1.,))])
+            writer.flush()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -673,16 +673,46 @@ class GitRepoManager(Loggable):
 
         return True
 
+    def get_remote_head(self, remote='origin', branch=None):
+        """
+            return the sha of branch on remote. uses ls-remote so no objects are fetched
+        """
+        if branch is None:
+            branch = self.get_current_branch()
+
+        out = self._git_command(lambda: self._repo.git.ls_remote(remote, 'refs/heads/{}'.format(branch)),
+                                'GitRepoManager.get_remote_head')
+        if out:
+            return out.split()[0]
+
+    def is_current_with_remote(self, remote='origin', branch=None):
+        """
+            return True if the local branch already contains the HEAD of the remote branch
+        """
+        rhead = self.get_remote_head(remote, branch)
+        if rhead is None:
+            return False
+
+        head = self.get_head()
+        if rhead == head:
+            return True
+
+        try:
+            return self._repo.is_ancestor(rhead, head)
+        except (GitCommandError, ValueError):
+            # remote head is not available locally
+            return False
+
     def fetch(self, remote='origin'):
         if self._repo:
             return self._git_command(lambda: self._repo.git.fetch(remote), 'GitRepoManager.fetch')
             # return self._repo.git.fetch(remote)
 
-    def ahead_behind(self, remote='origin'):
+    def ahead_behind(self, remote='origin', fetch=True):
         self.debug('ahead behind')
 
         repo = self._repo
-        ahead, behind = ahead_behind(repo, remote)
+        ahead, behind = ahead_behind(repo, fetch=fetch, remote=remote)
 
         return ahead, behind
 
@@ -17,6 +17,7 @@
 # ============= standard library imports ========================
 from __future__ import absolute_import
 from __future__ import print_function
+import errno
 import socket
 import time
 
@@ -27,6 +28,8 @@ from traits.api import Float
 from pychron.globals import globalv
 from pychron.hardware.core.checksum_helper import computeCRC
 from pychron.hardware.core.communicators.communicator import Communicator, process_response
+from pychron.hardware.core.latency_histogram import LatencyHistogram
+import six
 from six.moves import range
 
 
@@ -57,6 +60,7 @@ class Handler(object):
     datasize = 2 ** 12
     address = None
     message_frame = None
+    timeout = None
 
     def set_frame(self, f):
         self.message_frame = MessageFrame()
@@ -72,6 +76,9 @@ class Handler(object):
     def end(self):
         pass
 
+    def is_alive(self):
+        return True
+
     # private
     def _recvall(self, recv, frame=None):
         """
@@ -108,7 +115,10 @@ class Handler(object):
             if sum >= msg_len:
                 break
 
-        data = ''.join(ss)
+        if ss and isinstance(ss[0], bytes) and not isinstance(ss[0], str):
+            data = b''.join(ss).decode('utf-8')
+        else:
+            data = ''.join(ss)
         data = data.strip()
         if frame.message_len:
             # trim off header
@@ -126,6 +136,12 @@ class Handler(object):
         return data
 
 
+def encode_packet(p):
+    if isinstance(p, six.text_type) and not isinstance(p, bytes):
+        p = p.encode('utf-8')
+    return p
+
+
 class TCPHandler(Handler):
     def open_socket(self, addr, timeout=1.0):
         self.address = addr
@@ -133,6 +149,7 @@ class TCPHandler(Handler):
         if globalv.communication_simulation:
             timeout = 0.01
 
+        self.timeout = timeout
         self.sock.settimeout(timeout)
         self.sock.connect(addr)
 
@@ -140,11 +157,27 @@ class TCPHandler(Handler):
         return self._recvall(self.sock.recv, frame=message_frame)
 
     def send_packet(self, p):
-        self.sock.send(p)
+        self.sock.send(encode_packet(p))
 
     def end(self):
         self.sock.close()
 
+    def is_alive(self):
+        """
+            return False if the peer closed the connection. unsolicited data, e.g. a late reply to a timed out
+            command, is discarded so it is not mistaken for the reply to the next command
+        """
+        sock = self.sock
+        try:
+            sock.setblocking(False)
+            while 1:
+                if not sock.recv(self.datasize):
+                    return False
+        except socket.error as e:
+            return e.errno in (errno.EAGAIN, errno.EWOULDBLOCK)
+        finally:
+            sock.settimeout(self.timeout)
+
 
 class UDPHandler(Handler):
     def open_socket(self, addr, timeout=1.0):
@@ -162,7 +195,7 @@ class UDPHandler(Handler):
         return self._recvall(recv)
 
     def send_packet(self, p):
-        self.sock.sendto(p, self.address)
+        self.sock.sendto(encode_packet(p), self.address)
 
 
 class EthernetCommunicator(Communicator):
@@ -182,6 +215,20 @@ class EthernetCommunicator(Communicator):
 
     default_timeout = 3
 
+    # keep the connection open between commands even if use_end is set. a kept connection that was idle for
+    # longer than health_check_interval seconds is checked before it is used and reopened if it was closed
+    keep_alive = False
+    health_check_interval = 5.0
+    retry_delay = 0.025
+
+    _last_used = 0
+    _batching = False
+    latency = None
+
+    def __init__(self, *args, **kw):
+        super(EthernetCommunicator, self).__init__(*args, **kw)
+        self.latency = LatencyHistogram()
+
     @property
     def address(self):
         return '{}://{}:{}'.format(self.kind, self.host, self.port)
@@ -202,6 +249,10 @@ class EthernetCommunicator(Communicator):
         self.message_frame = self.config_get(config, 'Communications', 'message_frame', optional=True, default='')
         self.default_timeout = self.config_get(config, 'Communications', 'default_timeout', cast='int',
                                                optional=True, default=3)
+        self.keep_alive = self.config_get(config, 'Communications', 'keep_alive', cast='boolean', optional=True,
+                                          default=False)
+        self.health_check_interval = self.config_get(config, 'Communications', 'health_check_interval',
+                                                     cast='float', optional=True, default=5.0)
 
         if self.kind is None:
             self.kind = 'UDP'
@@ -294,9 +345,11 @@ class EthernetCommunicator(Communicator):
         # cmd = '{}\n'.format(cmd)
         r = None
         with self._lock:
+            self._check_connection()
             if use_error_mode and self.error_mode:
                 retries = 2
 
+            st = time.time()
             re = 'ERROR: Connection refused: {}, timeout={}'.format(self.address, timeout)
             for i in range(retries):
                 r = self._ask(cmd, timeout=timeout, message_frame=message_frame, delay=delay,
@@ -304,17 +357,23 @@ class EthernetCommunicator(Communicator):
                 if r is not None:
                     break
                 else:
-                    time.sleep(0.025)
+                    # a kept connection may have been dropped by the device. reconnect immediately
+                    if not (self.keep_alive and i == 0):
+                        time.sleep(self.retry_delay)
                     self.debug('doing retry {}'.format(i))
                     # else:
                     #     self._reset_connection()
 
             if r is not None:
                 re = process_response(r)
+                self.latency.add(time.time() - st)
+            else:
+                self.latency.add_failure()
             # else:
             #     self.error_mode = True
 
-            if self.use_end:
+            self._last_used = time.time()
+            if self.use_end and not self.keep_alive and not self._batching:
                 # self.debug('ending connection. Handler: {}, cmd={}'.format(self.handler, cmd))
                 if self.handler:
                     self.handler.end()
@@ -325,11 +384,40 @@ class EthernetCommunicator(Communicator):
 
         return r
 
+    def ask_many(self, cmds, verbose=False, quiet=True, **kw):
+        """
+            send several commands over one connection while holding the lock.
+
+            return a list of responses in the same order as cmds. the response of a failed command is None
+        """
+        if self.simulation:
+            return [None for _ in cmds]
+
+        with self._lock:
+            self._batching = True
+            try:
+                rs = [self.ask(cmd, verbose=verbose, quiet=quiet, **kw) for cmd in cmds]
+            finally:
+                self._batching = False
+
+            if self.use_end and not self.keep_alive:
+                self.reset()
+        return rs
+
+    def latency_summary(self):
+        return '{} {}'.format(self.address, self.latency.summary())
+
     def reset(self):
         if self.handler:
             self.handler.end()
         self._reset_connection()
 
+    def close(self):
+        with self._lock:
+            if self.latency.n or self.latency.failures:
+                self.debug('latency {}'.format(self.latency_summary()))
+            self.reset()
+
     def read(self, *args, **kw):
         with self._lock:
             handler = self.get_handler()
@@ -338,7 +426,9 @@ class EthernetCommunicator(Communicator):
 
     def tell(self, cmd, verbose=True, quiet=False, info=None):
         with self._lock:
-            handler = self.get_handler(cmd, timeout)
+            handler = self.get_handler(cmd)
+            if not handler:
+                return
             try:
                 cmd = '{}{}'.format(cmd, self.write_terminator)
                 handler.send_packet(cmd)
@@ -349,12 +439,24 @@ class EthernetCommunicator(Communicator):
                 self.error_mode = True
 
     # private
+    def _check_connection(self):
+        """
+            reopen a kept connection that was closed by the device
+        """
+        h = self.handler
+        if self.keep_alive and h is not None and time.time() - self._last_used >= self.health_check_interval:
+            if not h.is_alive():
+                self.debug('connection to {} closed. reconnecting'.format(self.address))
+                self.reset()
+
     def _reset_connection(self):
         self.handler = None
         self.error_mode = False
 
     def _ask(self, cmd, timeout=None, message_frame=None, delay=None, use_error_mode=True):
         if self.error_mode:
+            if self.handler:
+                self.handler.end()
             self.handler = None
             if use_error_mode:
                 timeout = 0.25
@@ -374,7 +476,13 @@ class EthernetCommunicator(Communicator):
                 time.sleep(delay)
 
             try:
-                return handler.get_packet(cmd, message_frame=message_frame)
+                r = handler.get_packet(cmd, message_frame=message_frame)
+                if self.keep_alive and r == '':
+                    # an empty reply on a kept connection means the device closed it
+                    self.debug('ask. connection closed address: {}'.format(self.address))
+                    self.error_mode = True
+                    return
+                return r
             except socket.error as e:
                 self.warning('ask. get packet. error: {} address: {}'.format(e, self.address))
                 self.error_mode = True
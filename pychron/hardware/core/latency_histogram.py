@@ -0,0 +1,88 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+from bisect import bisect_left
+from threading import Lock
+
+# ============= local library imports  ==========================
+
+# upper bucket edges in seconds
+DEFAULT_EDGES = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5)
+
+
+class LatencyHistogram(object):
+    """
+        histogram of request latencies in seconds. bucket i counts latencies <= edges[i], the last bucket
+        counts everything larger than edges[-1]
+    """
+
+    def __init__(self, edges=DEFAULT_EDGES):
+        self.edges = edges
+        self._lock = Lock()
+        self._reset()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self.counts = [0] * (len(self.edges) + 1)
+        self.n = 0
+        self.total = 0
+        self.max = 0
+        self.failures = 0
+
+    def add(self, dt):
+        with self._lock:
+            self.counts[bisect_left(self.edges, dt)] += 1
+            self.n += 1
+            self.total += dt
+            self.max = max(self.max, dt)
+
+    def add_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else 0
+
+    def percentile(self, q):
+        """
+            return the upper edge of the bucket containing the q'th percentile (0-100). the maximum latency is
+            returned for the last bucket
+        """
+        with self._lock:
+            if not self.n:
+                return 0
+
+            t = q / 100. * self.n
+            c = 0
+            for edge, ci in zip(self.edges, self.counts):
+                c += ci
+                if c >= t:
+                    return edge
+            return self.max
+
+    def summary(self):
+        return 'n={} mean={:0.1f}ms p50<={:0.1f}ms p95<={:0.1f}ms max={:0.1f}ms failures={}'.format(
+            self.n, self.mean * 1000, self.percentile(50) * 1000, self.percentile(95) * 1000, self.max * 1000,
+            self.failures)
+
+# ============= EOF =============================================
@@ -0,0 +1,206 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import time
+from threading import Thread, Event, Lock
+
+from numpy import empty, float64, dtype
+
+# ============= local library imports  ==========================
+from pychron.core.helpers.datetime_tools import ISO_FORMAT_STR
+from pychron.graph.plot_record import PlotRecord
+
+
+def flatten_sample(v):
+    """
+        return a flat tuple of floats for a scan value. v can be a scalar, a tuple or a PlotRecord whose data may
+        contain tuples
+    """
+    if isinstance(v, PlotRecord):
+        v = v.as_data_tuple()
+    elif not isinstance(v, (tuple, list)):
+        v = (v,)
+
+    vs = []
+    for vi in v:
+        if isinstance(vi, (tuple, list)):
+            vs.extend(float(vii) for vii in vi)
+        else:
+            vs.append(float(vi))
+    return tuple(vs)
+
+
+class CSVScanWriter(object):
+    """
+        write blocks as "timestamp, x, v1, ..., vn" lines to the current frame of a CSVDataManager
+    """
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+
+    def write(self, block):
+        rows = [(time.strftime(ISO_FORMAT_STR, time.localtime(r[0])),
+                 '{:<8s}'.format('{:0.2f}'.format(r[1]))) + tuple(r[2:])
+                for r in block.tolist()]
+        self.data_manager.write_to_frame(rows)
+
+
+class H5ScanWriter(object):
+    """
+        append blocks to the table group/name of an H5DataManager. the table has a time column and a value column for
+        each value of a sample, i.e. value, value1, ... valueN. it is created with the first block
+    """
+
+    def __init__(self, data_manager, group, name):
+        self.data_manager = data_manager
+        self.group = group
+        self.name = name
+        self._table = None
+
+    def write(self, block):
+        tab = self._table
+        if tab is None:
+            n = block.shape[1] - 2
+            names = ['time'] + ['value{}'.format(i or '') for i in range(n)]
+            desc = dtype([(k, float64) for k in names])
+            self._table = tab = self.data_manager.new_table(self.group, self.name, description=desc)
+
+        tab.append([tuple(r[1:]) for r in block.tolist()])
+        tab.flush()
+
+
+class ScanRecorder(object):
+    """
+        buffer scan samples in preallocated arrays and write them in chunks from a background thread.
+
+        add() only copies the sample into the current chunk. a chunk is handed to the writer when it is full or at
+        the latest every flush_interval seconds. each row of a chunk is (timestamp, x, v1, ..., vn). the number of
+        values is fixed by the first sample, samples with a different number of values are dropped
+    """
+
+    def __init__(self, writer, chunk_size=256, flush_interval=5, logger=None):
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.logger = logger
+
+        self.ncols = None
+        self.nrecorded = 0
+        self.nwritten = 0
+        self.ndropped = 0
+        self.last_flush_latency = 0
+
+        self._chunk = None
+        self._n = 0
+        self._pending = []
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = t = Thread(name='ScanRecorder', target=self._run)
+        t.daemon = True
+        t.start()
+
+    def stop(self, timeout=None):
+        """
+            stop the writer thread and write all buffered samples
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def add(self, x, v, timestamp=None):
+        try:
+            vs = flatten_sample(v)
+        except (TypeError, ValueError):
+            self._drop('invalid sample {}'.format(v))
+            return
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            if self.ncols is None:
+                self.ncols = len(vs)
+            elif len(vs) != self.ncols:
+                self._drop('expected {} values got {}'.format(self.ncols, len(vs)))
+                return
+
+            if self._chunk is None:
+                self._chunk = empty((self.chunk_size, self.ncols + 2))
+
+            row = self._chunk[self._n]
+            row[0] = timestamp
+            row[1] = x
+            row[2:] = vs
+            self._n += 1
+            self.nrecorded += 1
+
+            full = self._n == self.chunk_size
+            if full:
+                self._pending.append(self._chunk)
+                self._chunk = None
+                self._n = 0
+
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                blocks, self._pending = self._pending, []
+                if self._n:
+                    blocks.append(self._chunk[:self._n].copy())
+                    self._n = 0
+
+            for block in blocks:
+                st = time.time()
+                try:
+                    self.writer.write(block)
+                except BaseException as e:
+                    self.ndropped += len(block)
+                    self._warning('failed writing {} scan samples. {}'.format(len(block), e))
+                    continue
+
+                self.last_flush_latency = time.time() - st
+                self.nwritten += len(block)
+
+    # private
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _drop(self, msg):
+        self.ndropped += 1
+        self._warning('dropping scan sample. {}'.format(msg))
+
+    def _warning(self, msg):
+        if self.logger:
+            self.logger.warning(msg)
+
+# ============= EOF =============================================
@@ -18,7 +18,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 import time
 
-from traits.api import Event, Property, Any, Bool, Float, Str, Instance, List
+from traits.api import Event, Property, Any, Bool, Float, Str, Instance, List, Int
 from traitsui.api import HGroup, VGroup, Item, spring, ButtonEditor
 
 # ============= standard library imports ========================
@@ -30,8 +30,8 @@ from pychron.graph.plot_record import PlotRecord
 from pychron.paths import paths
 from pychron.database.data_warehouse import DataWarehouse
 from pychron.managers.data_managers.csv_data_manager import CSVDataManager
-from pychron.core.helpers.datetime_tools import generate_datetimestamp
 from pychron.hardware.core.alarm import Alarm
+from pychron.hardware.core.scan_recorder import ScanRecorder, CSVScanWriter, H5ScanWriter
 from six.moves import zip
 
 
@@ -50,6 +50,8 @@ class ScanableDevice(ViewableDevice):
     scan_width = Float(5, enter_set=True, auto_set=False)
     scan_units = 'ms'
     record_scan_data = Bool(False)
+    scan_flush_interval = Float(5)
+    scan_chunk_size = Int(256)
     graph_scan_data = Bool(False)
     scan_path = Str
     auto_start = Bool(False)
@@ -60,6 +62,7 @@ class ScanableDevice(ViewableDevice):
     graph_ytitle = Str
 
     data_manager = None
+    scan_recorder = None
     time_dict = dict(ms=1, s=1000, m=60.0 * 1000, h=60.0 * 60.0 * 1000)
 
     dm_kind = 'csv'
@@ -88,6 +91,10 @@ class ScanableDevice(ViewableDevice):
                 self.set_attribute(config, 'scan_width', 'Scan', 'width', cast='float')
                 self.set_attribute(config, 'scan_units', 'Scan', 'units')
                 self.set_attribute(config, 'record_scan_data', 'Scan', 'record', cast='boolean')
+                self.set_attribute(config, 'scan_flush_interval', 'Scan', 'flush_interval', cast='float',
+                                   optional=True, default=5)
+                self.set_attribute(config, 'scan_chunk_size', 'Scan', 'chunk_size', cast='int',
+                                   optional=True, default=256)
                 self.set_attribute(config, 'graph_scan_data', 'Scan', 'graph', cast='boolean')
                 # self.set_attribute(config, 'use_db', 'DataManager', 'use_db', cast='boolean', default=False)
                 # self.set_attribute(config, 'dm_kind', 'DataManager', 'kind', default='csv')
@@ -132,22 +139,11 @@ class ScanableDevice(ViewableDevice):
                     else:
                         x = self.graph.record(v)
                         v = (v,)
-                if self.record_scan_data:
+                if self.record_scan_data and self.scan_recorder:
                     if x is None:
                         x = time.time()
 
-                    if self.dm_kind == 'csv':
-                        ts = generate_datetimestamp()
-
-                        self.data_manager.write_to_frame((ts, '{:<8s}'.format('{:0.2f}'.format(x))) + v)
-                    else:
-                        tab = self.data_manager.get_table('scan1', '/scans')
-                        if tab is not None:
-                            r = tab.row
-                            r['time'] = x
-                            r['value'] = v[0]
-                            r.append()
-                            tab.flush()
+                    self.scan_recorder.add(x, v)
 
                 self._scan_hook(v)
 
@@ -183,6 +179,10 @@ class ScanableDevice(ViewableDevice):
             self.timer.Stop()
             self.timer.wait_for_completion()
 
+        if self.scan_recorder is not None:
+            self.scan_recorder.stop()
+            self.scan_recorder = None
+
         d = self.scan_width * 60 #* 1000/self.scan_period
         # print self.scan_width, self.scan_period
         self.graph.set_scan_width(d)
@@ -210,7 +210,15 @@ class ScanableDevice(ViewableDevice):
 
             if self.dm_kind == 'h5':
                 g = dm.new_group('scans')
-                dm.new_table(g, 'scan1')
+                writer = H5ScanWriter(dm, g, 'scan1')
+            else:
+                writer = CSVScanWriter(dm)
+
+            self.scan_recorder = ScanRecorder(writer,
+                                              chunk_size=self.scan_chunk_size,
+                                              flush_interval=self.scan_flush_interval,
+                                              logger=self)
+            self.scan_recorder.start()
 
             if self.auto_start:
                 self.save_scan_to_db()
@@ -245,6 +253,12 @@ class ScanableDevice(ViewableDevice):
         if self.timer is not None:
             self.timer.Stop()
 
+        if self.scan_recorder is not None:
+            self.scan_recorder.stop()
+            self.info('recorded {} scan samples. dropped {}'.format(self.scan_recorder.nwritten,
+                                                                    self.scan_recorder.ndropped))
+            self.scan_recorder = None
+
         if self.record_scan_data and not self._auto_started:
             if self.use_db:
                 if self.confirmation_dialog('Save to Database'):
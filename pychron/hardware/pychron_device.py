@@ -32,6 +32,7 @@ class EthernetDeviceMixin(Loggable):
     kind = Str
     message_frame = Str
     use_end = Bool
+    keep_alive = Bool
 
     def setup_communicator(self):
         host = self.host
@@ -40,6 +41,7 @@ class EthernetDeviceMixin(Loggable):
                                                       port=port,
                                                       kind=self.kind,
                                                       use_end=self.use_end,
+                                                      keep_alive=self.keep_alive,
                                                       message_frame=self.message_frame)
 
         r = ec.open()
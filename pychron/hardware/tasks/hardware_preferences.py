@@ -41,6 +41,8 @@ class HardwarePreferences(BasePreferencesHelper):
     auto_find_handle = Bool
     auto_write_handle = Bool
 
+    device_bringup_workers = Int(4)
+
     system_lock_name = String
     system_lock_address = String
     enable_system_lock = Bool
@@ -108,7 +110,11 @@ class HardwarePreferencesPane(PreferencesPane):
         #               Item('auto_write_handle', enabled_when='auto_find_handle'),
         #               show_border=True, label='Serial')
         # v = View(VGroup(ehs_grp, sgrp))
-        v = View(ehs_grp)
+        sgrp = VGroup(Item('device_bringup_workers', label='Device Workers',
+                           tooltip='Number of devices opened at the same time during startup. '
+                                   'Set to 1 to open devices one after another'),
+                      show_border=True, label='Startup')
+        v = View(VGroup(ehs_grp, sgrp))
         return v
 
 # ============= EOF =============================================
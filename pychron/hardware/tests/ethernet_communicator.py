@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+
+import threading
+import unittest
+
+from six.moves import socketserver
+
+from pychron.globals import globalv
+from pychron.hardware.core.communicators.ethernet_communicator import EthernetCommunicator
+from pychron.hardware.core.latency_histogram import LatencyHistogram
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+
+class EchoHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        buf = b''
+        while 1:
+            try:
+                data = self.request.recv(1024)
+            except OSError:
+                break
+            if not data:
+                break
+
+            buf += data
+            while b'\r' in buf:
+                cmd, buf = buf.split(b'\r', 1)
+                self.request.sendall(b'echo ' + cmd)
+                if server.close_after_reply:
+                    return
+
+
+class EchoServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    connections = 0
+    close_after_reply = False
+
+
+class EthernetCommunicatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = server = EchoServer(('127.0.0.1', 0), EchoHandler)
+        t = threading.Thread(target=server.serve_forever)
+        t.daemon = True
+        t.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _communicator(self, **kw):
+        c = EthernetCommunicator(host='127.0.0.1', port=self.server.server_address[1], kind='TCP',
+                                 use_end=True, **kw)
+        c.simulation = False
+        return c
+
+    def test_use_end(self):
+        c = self._communicator()
+        for i in range(5):
+            self.assertEqual(c.ask('a{}'.format(i), verbose=False), 'echo a{}'.format(i))
+        self.assertEqual(self.server.connections, 5)
+
+    def test_keep_alive(self):
+        c = self._communicator(keep_alive=True)
+        for i in range(5):
+            self.assertEqual(c.ask('a{}'.format(i), verbose=False), 'echo a{}'.format(i))
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(c.latency.n, 5)
+
+    def test_reconnect(self):
+        self.server.close_after_reply = True
+        c = self._communicator(keep_alive=True, health_check_interval=0)
+        for i in range(3):
+            self.assertEqual(c.ask('a{}'.format(i), verbose=False), 'echo a{}'.format(i))
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(c.latency.failures, 0)
+
+    def test_reconnect_without_health_check(self):
+        self.server.close_after_reply = True
+        c = self._communicator(keep_alive=True, health_check_interval=1000)
+        for i in range(3):
+            self.assertEqual(c.ask('a{}'.format(i), verbose=False), 'echo a{}'.format(i))
+
+    def test_ask_many(self):
+        c = self._communicator()
+        cmds = ['a', 'b', 'c', 'd']
+        self.assertEqual(c.ask_many(cmds), ['echo a', 'echo b', 'echo c', 'echo d'])
+        self.assertEqual(self.server.connections, 1)
+        self.assertIsNone(c.handler)
+
+
+class LatencyHistogramTestCase(unittest.TestCase):
+    def test_histogram(self):
+        h = LatencyHistogram(edges=(0.01, 0.1, 1))
+        for dt in (0.005, 0.005, 0.05, 0.5, 2):
+            h.add(dt)
+        h.add_failure()
+
+        self.assertEqual(h.counts, [2, 1, 1, 1])
+        self.assertEqual(h.percentile(40), 0.01)
+        self.assertEqual(h.percentile(60), 0.1)
+        self.assertEqual(h.percentile(100), 2)
+        self.assertAlmostEqual(h.mean, 0.512)
+        self.assertEqual(h.failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.graph.plot_record import PlotRecord
+from pychron.hardware.core.scan_recorder import ScanRecorder, CSVScanWriter, flatten_sample
+from pychron.managers.data_managers.csv_data_manager import CSVDataManager
+from pychron.paths import paths
+
+
+class Writer(object):
+    def __init__(self):
+        self.blocks = []
+
+    def write(self, block):
+        self.blocks.append(block.copy())
+
+
+class ScanRecorderTestCase(unittest.TestCase):
+    def test_flatten_sample(self):
+        self.assertEqual(flatten_sample(1), (1.0,))
+        self.assertEqual(flatten_sample((1, 2)), (1.0, 2.0))
+        r = PlotRecord([1, (2, 3)], (0, 1), ('a', 'b'))
+        self.assertEqual(flatten_sample(r), (1.0, 2.0, 3.0))
+
+    def test_chunks(self):
+        w = Writer()
+        rec = ScanRecorder(w, chunk_size=4, flush_interval=60)
+        for i in range(10):
+            rec.add(i, (i, i * 2), timestamp=100 + i)
+
+        self.assertEqual(w.blocks, [])
+        rec.flush()
+        self.assertEqual([len(b) for b in w.blocks], [4, 4, 2])
+        self.assertEqual(w.blocks[2][1].tolist(), [109, 9, 9, 18])
+        self.assertEqual(rec.nwritten, 10)
+
+    def test_background_write(self):
+        w = Writer()
+        rec = ScanRecorder(w, chunk_size=2, flush_interval=60)
+        rec.start()
+        try:
+            rec.add(0, 1)
+            rec.add(1, 2)
+            st = time.time()
+            while not w.blocks and time.time() - st < 5:
+                time.sleep(0.01)
+            self.assertEqual(len(w.blocks), 1)
+        finally:
+            rec.stop()
+
+    def test_drop_mismatched(self):
+        w = Writer()
+        rec = ScanRecorder(w, chunk_size=4)
+        rec.add(0, (1, 2))
+        rec.add(1, 3)
+        rec.add(2, 'a')
+        rec.stop()
+        self.assertEqual(rec.ndropped, 2)
+        self.assertEqual(rec.nwritten, 1)
+
+
+class CSVScanWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self._data_dir = paths.data_dir
+        paths.data_dir = self._root
+
+    def tearDown(self):
+        paths.data_dir = self._data_dir
+        shutil.rmtree(self._root)
+
+    def test_write(self):
+        dm = CSVDataManager()
+        dm.delimiter = '\t'
+        dm.new_frame(directory=self._root, base_frame_name='scan')
+
+        rec = ScanRecorder(CSVScanWriter(dm), chunk_size=2)
+        rec.add(0.5, PlotRecord([1.5, 2.5], (0, 1), ('a', 'b')))
+        rec.add(1.5, PlotRecord([3.5, 4.5], (0, 1), ('a', 'b')))
+        rec.add(2.5, PlotRecord([5.5, 6.5], (0, 1), ('a', 'b')))
+        rec.stop()
+
+        with open(dm.get_current_path(), 'r') as rfile:
+            lines = [l.strip().split('\t') for l in rfile]
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0][1].strip(), '0.50')
+        self.assertEqual(lines[2][2:], ['5.5', '6.5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,8 +29,9 @@ from traits.api import Instance, Bool, Int
 from pychron.core.helpers.logger_setup import logging_setup
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.labspy.database_adapter import LabspyDatabaseAdapter
+from pychron.labspy.measurement_buffer import MeasurementBuffer
 from pychron.loggable import Loggable
-from pychron.paths import paths
+from pychron.paths import paths, r_mkdir
 from pychron.pychron_constants import SCRIPT_NAMES, NULL_STR
 from six.moves import map
 from six.moves import range
@@ -86,8 +87,14 @@ class LabspyClient(Loggable):
     use_connection_status = Bool
     connection_status_period = Int
 
+    buffer_measurements = Bool(True)
+    measurement_flush_period = Int(5)
+    measurement_flush_size = Int(200)
+
     _timer = None
     session_lock = None
+    _measurement_buffer = None
+    _notification_triggers = None
 
     def __init__(self, bind=True, *args, **kw):
         super(LabspyClient, self).__init__(*args, **kw)
@@ -95,6 +102,7 @@ class LabspyClient(Loggable):
             self.bind_preferences()
             # self.start()
         self.session_lock = Lock()
+        self._buffer_lock = Lock()
 
     def bind_preferences(self):
         self.db.bind_preferences()
@@ -102,6 +110,12 @@ class LabspyClient(Loggable):
                         'pychron.labspy.use_connection_status')
         bind_preference(self, 'connection_status_period',
                         'pychron.labspy.connection_status_period')
+        bind_preference(self, 'buffer_measurements',
+                        'pychron.labspy.buffer_measurements')
+        bind_preference(self, 'measurement_flush_period',
+                        'pychron.labspy.measurement_flush_period')
+        bind_preference(self, 'measurement_flush_size',
+                        'pychron.labspy.measurement_flush_size')
 
     def test_connection(self, **kw):
         return self.db.connect(**kw)
@@ -124,6 +138,26 @@ class LabspyClient(Loggable):
             else:
                 self.debug('No devices to check for connection status')
 
+    def stop(self):
+        """
+            write any buffered measurements
+        """
+        with self._buffer_lock:
+            buf, self._measurement_buffer = self._measurement_buffer, None
+
+        if buf:
+            self.debug('flushing measurements. {}'.format(buf.status()))
+            buf.stop(timeout=10)
+
+    def measurement_status(self):
+        """
+            return (backlog, last flush latency) of the measurement buffer
+        """
+        buf = self._measurement_buffer
+        if buf:
+            return buf.backlog, buf.last_flush_latency
+        return 0, 0
+
     def get_latest_lab_temperatures(self):
         return self.db.get_latest_lab_temperatures()
 
@@ -247,8 +281,24 @@ class LabspyClient(Loggable):
                     
                 self.db.add_measurement('{}Monitor'.format(ms), '{}{}'.format(ms, name), v, units)
 
-    @auto_connect
     def add_measurement(self, dev, tag, val, unit):
+        """
+            if buffer_measurements the measurement is written with the next bulk insert, otherwise immediately.
+            notifications are checked immediately in both cases
+        """
+        if not self.buffer_measurements:
+            self._add_measurement(dev, tag, val, unit)
+            return
+
+        val = float(val)
+        self._get_measurement_buffer().add(dev, tag, val, unit)
+        try:
+            self._check_notifications(dev, tag, val, unit)
+        except BaseException as e:
+            self.debug('failed checking notifications. {}'.format(e))
+
+    @auto_connect
+    def _add_measurement(self, dev, tag, val, unit):
         val = float(val)
         self.debug(
             'adding measurement dev={} process={} value={} ({})'.format(dev,
@@ -261,17 +311,48 @@ class LabspyClient(Loggable):
         except BaseException as e:
             self.debug('failed adding measurement. {}'.format(e))
 
+    @auto_connect
+    def _write_measurements(self, rows):
+        self.db.add_measurements(rows)
+        return True
+
     def connect(self):
         self.warning('not connected to db {}'.format(self.db.public_url))
         return self.db.connect()
 
     @property
     def notification_triggers(self):
+        """
+            triggers are reloaded only if the notification triggers file changed
+        """
         p = paths.notification_triggers
-        with open(p, 'r') as rfile:
-            return [NotificationTrigger(i) for i in yaml.load(rfile)]
+        st = os.stat(p)
+        sig = (st.st_mtime, st.st_size)
+        if self._notification_triggers is None or self._notification_triggers[0] != sig:
+            with open(p, 'r') as rfile:
+                self._notification_triggers = (sig, [NotificationTrigger(i) for i in yaml.load(rfile)])
+
+        return self._notification_triggers[1]
 
     # private
+    def _get_measurement_buffer(self):
+        with self._buffer_lock:
+            return self._make_measurement_buffer()
+
+    def _make_measurement_buffer(self):
+        buf = self._measurement_buffer
+        if buf is None:
+            r_mkdir(paths.labspy_dir)
+            spool = os.path.join(paths.labspy_dir, 'measurement_spool.jsonl') if paths.labspy_dir else None
+            buf = MeasurementBuffer(self._write_measurements,
+                                    spool_path=spool,
+                                    flush_interval=self.measurement_flush_period or 5,
+                                    flush_size=self.measurement_flush_size or 200,
+                                    logger=self)
+            buf.start()
+            self._measurement_buffer = buf
+        return buf
+
     def _get_configuration(self):
         """
         eg;
@@ -32,6 +32,8 @@ from pychron.labspy.orm import Measurement, ProcessInfo, Version, \
 class LabspyDatabaseAdapter(DatabaseAdapter):
     kind = 'mysql'
 
+    _process_info_ids = None
+
     def bind_preferences(self):
         bind_preference(self, 'host', 'pychron.labspy.host')
         # bind_preference(self, 'port', 'pychron.labspy.port')
@@ -106,6 +108,39 @@ class LabspyDatabaseAdapter(DatabaseAdapter):
         else:
             self.warning('ProcessInfo={} Device={} not available'.format(name, dev))
 
+    def add_measurements(self, rows):
+        """
+            insert rows of (device, name, value, unit, timestamp) with a single bulk insert.
+            rows with an unknown ProcessInfo are dropped. SQLAlchemyErrors are reraised after rolling back
+        """
+        if self._process_info_ids is None:
+            self._process_info_ids = {}
+
+        ms = []
+        for dev, name, value, unit, timestamp in rows:
+            key = (dev, name)
+            pid = self._process_info_ids.get(key)
+            if pid is None:
+                pinfo = self.get_process_info(dev, name)
+                if not pinfo:
+                    self.warning('ProcessInfo={} Device={} not available'.format(name, dev))
+                    continue
+
+                pid = self._process_info_ids[key] = pinfo.id
+
+            ms.append({'value': value, 'process_info_id': pid, 'pub_date': timestamp})
+
+        if ms:
+            sess = self.session
+            try:
+                sess.bulk_insert_mappings(Measurement, ms)
+                sess.commit()
+            except SQLAlchemyError:
+                sess.rollback()
+                raise
+
+        return len(ms)
+
     def add_process_info(self, dev, name, unit):
         self.debug('add process info {} {} {}'.format(dev, name, unit))
         dbdev = self.get_device(dev)
@@ -0,0 +1,305 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import os
+import time
+from datetime import datetime
+from threading import Thread, Event, Lock
+
+# ============= local library imports  ==========================
+from pychron import json
+from pychron.core.helpers.filetools import replace_file
+
+TIMESTAMP_FMT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+class MeasurementBuffer(object):
+    """
+        accumulate measurements in memory and write them with write_func(rows) from a background thread, either
+        every flush_interval seconds or as soon as flush_size measurements are pending.
+
+        a row is (device, tag, value, units, timestamp). write_func should return True if the rows were written.
+        if a write fails the rows are appended to the spool file and written after the next successful write.
+
+        spooled rows are replayed in chunks of flush_size and the position of the first unwritten row is saved after
+        each chunk. a chunk that failed max_replay_attempts times is written one row at a time. rows that are
+        rejected while the database is reachable are moved to the dead letter file so they do not block the spool
+    """
+
+    def __init__(self, write_func, spool_path=None, flush_interval=5, flush_size=200, max_replay_attempts=3,
+                 logger=None):
+        self.write_func = write_func
+        self.spool_path = spool_path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_replay_attempts = max_replay_attempts
+        self.logger = logger
+
+        self.nwritten = 0
+        self.nspooled = 0
+        self.ndead = 0
+        self.last_flush_latency = 0
+        self.last_error = None
+        self._replay_failures = 0
+
+        self._rows = []
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def offset_path(self):
+        if self.spool_path:
+            return '{}.offset'.format(self.spool_path)
+
+    @property
+    def dead_letter_path(self):
+        if self.spool_path:
+            return '{}.dead'.format(self.spool_path)
+
+    @property
+    def backlog(self):
+        """
+            number of measurements waiting to be written, including spooled measurements
+        """
+        with self._lock:
+            return len(self._rows) + self.nspooled
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self.nspooled = self._count_spooled()
+        self._stop.clear()
+        self._thread = t = Thread(name='MeasurementBuffer', target=self._run)
+        t.daemon = True
+        t.start()
+
+    def stop(self, timeout=None):
+        """
+            stop the writer thread and flush pending measurements
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def add(self, dev, tag, value, units, timestamp=None):
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        with self._lock:
+            self._rows.append((dev, tag, value, units, timestamp))
+            n = len(self._rows)
+
+        if n >= self.flush_size:
+            self._wake.set()
+
+    def flush(self):
+        """
+            write pending measurements. return True if all measurements, including spooled ones, were written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+
+            ret = True
+            if rows:
+                ret = self._write(rows)
+                if not ret:
+                    self._spool(rows)
+
+            if ret and self.nspooled:
+                ret = self._replay(reachable=bool(rows))
+            return ret
+
+    def status(self):
+        return 'backlog={} spooled={} dead={} written={} last_flush_latency={:0.3f}s'.format(self.backlog,
+                                                                                             self.nspooled,
+                                                                                             self.ndead,
+                                                                                             self.nwritten,
+                                                                                             self.last_flush_latency)
+
+    # private
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, rows):
+        st = time.time()
+        try:
+            ret = self.write_func(rows)
+        except BaseException as e:
+            ret = False
+            self.last_error = str(e)
+
+        if ret:
+            self.last_flush_latency = time.time() - st
+            self.nwritten += len(rows)
+            self.last_error = None
+            self._debug('wrote {} measurements in {:0.3f}s'.format(len(rows), self.last_flush_latency))
+        else:
+            self._warning('failed writing {} measurements. {}'.format(len(rows), self.last_error or ''))
+
+        return ret
+
+    def _spool(self, rows):
+        if not self.spool_path:
+            self._warning('no spool file. dropping {} measurements'.format(len(rows)))
+            return
+
+        with open(self.spool_path, 'a') as wfile:
+            for row in rows:
+                wfile.write('{}\n'.format(self._dumps(row)))
+        self.nspooled += len(rows)
+
+    def _replay(self, reachable=False):
+        """
+            write the spooled rows in chunks. return False if a chunk could not be written.
+
+            reachable is True if the database accepted a write during this flush
+        """
+        offset = self._load_offset()
+        while 1:
+            rows, lines, end = self._read_spooled(offset, self.flush_size)
+            if not lines:
+                break
+
+            if rows:
+                if self._write(rows):
+                    reachable = True
+                    self._replay_failures = 0
+                else:
+                    self._replay_failures += 1
+                    if self._replay_failures < self.max_replay_attempts:
+                        return False
+
+                    reachable = self._write_rows(rows, reachable)
+                    if not reachable:
+                        return False
+                    self._replay_failures = 0
+
+            offset = end
+            self._dump_offset(offset)
+            self.nspooled = max(0, self.nspooled - lines)
+
+        for p in (self.spool_path, self.offset_path):
+            if os.path.isfile(p):
+                os.remove(p)
+        self.nspooled = 0
+        return True
+
+    def _write_rows(self, rows, reachable):
+        """
+            write rows one at a time. rows that fail are moved to the dead letter file if the database is reachable.
+            return False if no row could be written and the database is not known to be reachable
+        """
+        failed = []
+        for row in rows:
+            if self._write([row]):
+                reachable = True
+            else:
+                failed.append(row)
+
+        if failed:
+            if not reachable:
+                return False
+
+            self._dead_letter([self._dumps(r) for r in failed])
+        return True
+
+    def _dead_letter(self, lines):
+        self._warning('moving {} measurements to {}'.format(len(lines), self.dead_letter_path))
+        with open(self.dead_letter_path, 'a') as wfile:
+            for line in lines:
+                wfile.write('{}\n'.format(line))
+        self.ndead += len(lines)
+
+    def _read_spooled(self, offset, n):
+        """
+            return up to n rows starting at the byte offset, the number of lines read and the offset after them
+        """
+        rows, invalid = [], []
+        nlines = 0
+        if self.spool_path and os.path.isfile(self.spool_path):
+            with open(self.spool_path, 'rb') as rfile:
+                rfile.seek(offset)
+                while nlines < n:
+                    line = rfile.readline()
+                    if not line:
+                        break
+
+                    nlines += 1
+                    offset = rfile.tell()
+                    line = line.decode('utf-8').strip()
+                    try:
+                        dev, tag, value, units, timestamp = json.loads(line)
+                        rows.append((dev, tag, value, units, datetime.strptime(timestamp, TIMESTAMP_FMT)))
+                    except ValueError:
+                        self._warning('invalid spooled measurement {}'.format(line))
+                        invalid.append(line)
+
+        if invalid:
+            self._dead_letter(invalid)
+        return rows, nlines, offset
+
+    def _load_offset(self):
+        p = self.offset_path
+        if p and os.path.isfile(p):
+            with open(p, 'r') as rfile:
+                try:
+                    return int(rfile.read())
+                except ValueError:
+                    pass
+        return 0
+
+    def _dump_offset(self, offset):
+        p = self.offset_path
+        tmp = '{}.tmp'.format(p)
+        with open(tmp, 'w') as wfile:
+            wfile.write(str(offset))
+        replace_file(tmp, p)
+
+    def _count_spooled(self):
+        n = 0
+        if self.spool_path and os.path.isfile(self.spool_path):
+            with open(self.spool_path, 'rb') as rfile:
+                rfile.seek(self._load_offset())
+                n = sum(1 for _ in rfile)
+        return n
+
+    def _dumps(self, row):
+        dev, tag, value, units, timestamp = row
+        return json.dumps([dev, tag, value, units, timestamp.strftime(TIMESTAMP_FMT)])
+
+    def _debug(self, msg):
+        if self.logger:
+            self.logger.debug(msg)
+
+    def _warning(self, msg):
+        if self.logger:
+            self.logger.warning(msg)
+
+# ============= EOF =============================================
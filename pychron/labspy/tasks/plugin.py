@@ -65,6 +65,11 @@ class LabspyClientPlugin(BaseTaskPlugin):
     def _preferences_panes_default(self):
         return [LabspyPreferencesPane, LabspyExperimentPreferencesPane]
 
+    def stop(self):
+        client = self.application.get_service(LabspyClient)
+        if client:
+            client.stop()
+
     def test_communication(self):
         lc = self.application.get_service(LabspyClient)
         return lc.test_connection(warn=False)
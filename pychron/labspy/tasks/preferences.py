@@ -37,6 +37,10 @@ class LabspyPreferences(BasePreferencesHelper, ConnectionMixin):
     use_connection_status = Bool
     connection_status_period = Int
 
+    buffer_measurements = Bool(True)
+    measurement_flush_period = Int(5)
+    measurement_flush_size = Int(200)
+
     def _get_connection_dict(self):
         return dict(username=self.username,
                     host=self.host,
@@ -74,9 +78,24 @@ class LabspyPreferencesPane(PreferencesPane):
                        label='Connection Status',
                        show_border=True)
 
+        bgrp = VGroup(Item('buffer_measurements', label='Buffer Measurements',
+                           tooltip='Write measurements to the database in bulk from a background thread. '
+                                   'Measurements are spooled to disk if the database is not available'),
+                      Item('measurement_flush_period',
+                           label='Flush Period (s)',
+                           tooltip='Write buffered measurements every X seconds',
+                           enabled_when='buffer_measurements'),
+                      Item('measurement_flush_size',
+                           label='Flush Size',
+                           tooltip='Write buffered measurements as soon as X measurements are pending',
+                           enabled_when='buffer_measurements'),
+                      label='Measurements',
+                      show_border=True)
+
         v = View(VGroup(
             dbconngrp,
-            csgrp))
+            csgrp,
+            bgrp))
         return v
 
 
@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.labspy.database_adapter import LabspyDatabaseAdapter
+from pychron.labspy.measurement_buffer import MeasurementBuffer
+from pychron.labspy.orm import Base, Device, ProcessInfo, Measurement
+
+
+class Writer(object):
+    def __init__(self):
+        self.ok = True
+        self.writes = []
+        self.nok = None
+
+    def __call__(self, rows):
+        if self.nok is not None:
+            if not self.nok:
+                return
+            self.nok -= 1
+
+        if self.ok and not any(r[2] == 'bad' for r in rows):
+            self.writes.append(rows)
+            return True
+
+
+class MeasurementBufferTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.spool = os.path.join(self._root, 'spool.jsonl')
+        self.writer = Writer()
+        self.buf = MeasurementBuffer(self.writer, spool_path=self.spool, flush_interval=60, flush_size=3)
+
+    def tearDown(self):
+        self.buf.stop()
+        shutil.rmtree(self._root)
+
+    def test_flush_single_write(self):
+        for i in range(2):
+            self.buf.add('Environmental', 'temperature', i, 'C')
+
+        self.assertEqual(self.buf.backlog, 2)
+        self.assertTrue(self.buf.flush())
+        self.assertEqual(len(self.writer.writes), 1)
+        self.assertEqual([r[2] for r in self.writer.writes[0]], [0, 1])
+        self.assertEqual(self.buf.backlog, 0)
+
+    def test_flush_size(self):
+        self.buf.start()
+        for i in range(3):
+            self.buf.add('Environmental', 'temperature', i, 'C')
+
+        st = time.time()
+        while not self.writer.writes and time.time() - st < 5:
+            time.sleep(0.01)
+        self.assertEqual(len(self.writer.writes), 1)
+        self.assertEqual(len(self.writer.writes[0]), 3)
+
+    def test_spool_and_replay(self):
+        self.writer.ok = False
+        self.buf.add('Environmental', 'temperature', 1.5, 'C', datetime(2018, 1, 1, 12))
+        self.assertFalse(self.buf.flush())
+        self.assertTrue(os.path.isfile(self.spool))
+        self.assertEqual(self.buf.backlog, 1)
+
+        self.writer.ok = True
+        self.buf.add('Environmental', 'humidity', 50, '%')
+        self.assertTrue(self.buf.flush())
+        self.assertFalse(os.path.isfile(self.spool))
+        self.assertEqual(self.buf.backlog, 0)
+
+        replayed = self.writer.writes[1]
+        self.assertEqual(replayed, [('Environmental', 'temperature', 1.5, 'C', datetime(2018, 1, 1, 12))])
+
+    def test_resume_spool(self):
+        self.writer.ok = False
+        self.buf.add('Environmental', 'temperature', 1, 'C')
+        self.buf.flush()
+
+        writer = Writer()
+        buf = MeasurementBuffer(writer, spool_path=self.spool, flush_interval=60)
+        buf.start()
+        self.assertEqual(buf.backlog, 1)
+        buf.stop()
+        self.assertEqual(len(writer.writes), 1)
+        self.assertEqual(buf.backlog, 0)
+
+    def _spool_rows(self, n, bad=None):
+        self.writer.ok = False
+        for i in range(n):
+            self.buf.add('Environmental', 'temperature', 'bad' if i == bad else i, 'C')
+        self.buf.flush()
+        self.writer.ok = True
+        self.assertEqual(self.buf.nspooled, n)
+
+    def test_replay_chunks(self):
+        self._spool_rows(7)
+        self.assertTrue(self.buf.flush())
+        self.assertEqual([len(w) for w in self.writer.writes], [3, 3, 1])
+        self.assertFalse(os.path.isfile(self.spool))
+        self.assertFalse(os.path.isfile(self.buf.offset_path))
+
+    def test_replay_resume_offset(self):
+        self._spool_rows(7)
+        self.writer.nok = 1
+        self.assertFalse(self.buf.flush())
+        self.assertEqual(self.buf.nspooled, 4)
+
+        # a new buffer, e.g. after restarting, continues after the rows that were written
+        writer = Writer()
+        buf = MeasurementBuffer(writer, spool_path=self.spool, flush_interval=60, flush_size=3)
+        buf.nspooled = buf._count_spooled()
+        self.assertEqual(buf.nspooled, 4)
+        self.assertTrue(buf.flush())
+        self.assertEqual([r[2] for w in writer.writes for r in w], [3, 4, 5, 6])
+
+    def test_dead_letter(self):
+        self._spool_rows(5, bad=1)
+        for i in range(self.buf.max_replay_attempts - 1):
+            self.assertFalse(self.buf.flush())
+            self.assertEqual(self.buf.nspooled, 5)
+
+        self.assertTrue(self.buf.flush())
+        self.assertEqual(self.buf.nspooled, 0)
+        self.assertEqual(self.buf.ndead, 1)
+        self.assertEqual(sorted(r[2] for w in self.writer.writes for r in w), [0, 2, 3, 4])
+        with open(self.buf.dead_letter_path, 'r') as rfile:
+            self.assertIn('"bad"', rfile.read())
+
+    def test_outage_is_not_dead_lettered(self):
+        self._spool_rows(3)
+        self.writer.ok = False
+        for i in range(self.buf.max_replay_attempts + 2):
+            self.assertFalse(self.buf.flush())
+
+        self.assertEqual(self.buf.nspooled, 3)
+        self.assertEqual(self.buf.ndead, 0)
+        self.assertFalse(os.path.isfile(self.buf.dead_letter_path))
+
+    def test_write_exception(self):
+        def func(rows):
+            raise IOError('database unavailable')
+
+        buf = MeasurementBuffer(func, spool_path=self.spool)
+        buf.add('Environmental', 'temperature', 1, 'C')
+        self.assertFalse(buf.flush())
+        self.assertEqual(buf.last_error, 'database unavailable')
+        self.assertEqual(buf.nspooled, 1)
+
+
+class AddMeasurementsTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.db = db = LabspyDatabaseAdapter(kind='sqlite', path=os.path.join(self._root, 'labspy.db'))
+        db.connect(test=False)
+        Base.metadata.create_all(db.engine)
+        with db.session_ctx() as sess:
+            dev = Device(name='Environmental')
+            sess.add(dev)
+            sess.add(ProcessInfo(name='temperature', units='C', device=dev))
+            sess.commit()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        shutil.rmtree(self._root)
+
+    def test_bulk_insert(self):
+        db = self.db
+        ts = datetime(2018, 1, 1, 12)
+        rows = [('Environmental', 'temperature', i, 'C', ts) for i in range(5)]
+        rows.append(('Environmental', 'pressure', 1, 'PSI', ts))
+        with db.session_ctx():
+            self.assertEqual(db.add_measurements(rows), 5)
+
+        with db.session_ctx() as sess:
+            ms = sess.query(Measurement).all()
+            self.assertEqual(len(ms), 5)
+            self.assertTrue(all(m.pub_date == ts for m in ms))
+            self.assertEqual(ms[0].process.name, 'temperature')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -377,6 +377,9 @@ class VideoStageManager(StageManager):
 
         self.stop_timer = True
 
+        if self.autocenter_manager:
+            self.autocenter_manager.kill()
+
         self.canvas.close_video()
         if self.video:
             self.video.close(force=True)
@@ -106,7 +106,7 @@ class BaseLaserPlugin(BaseTaskPlugin):
         if mode == 'client':
             try:
                 tag = ip.get_parameter(plugin, 'communications', element=True)
-                for attr in ['host', 'port', 'kind', 'message_frame', ('use_end', to_bool)]:
+                for attr in ['host', 'port', 'kind', 'message_frame', ('use_end', to_bool), ('keep_alive', to_bool)]:
                     func = None
                     if isinstance(attr, tuple):
                         attr, func = attr
@@ -155,14 +155,18 @@ class H5DataManager(DataManager):
 
         return grp
 
-    def new_table(self, group, table_name, n=None, table_style='TimeSeries'):
+    def new_table(self, group, table_name, n=None, table_style='TimeSeries', description=None):
         """
-            if table already exists return it otherwise create a new table
+            if table already exists return it otherwise create a new table.
+            description, e.g. a numpy dtype, overrides table_style
         """
         tab = self.get_table(table_name, group)
         if tab is None:
+            if description is None:
+                description = table_description_factory(table_style)
+
             tab = self._frame.create_table(group, table_name,
-                                           table_description_factory(table_style),
+                                           description,
                                            expectedrows=n or 10000)
 
         tab.flush()
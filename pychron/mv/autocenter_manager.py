@@ -37,6 +37,7 @@ class AutoCenterManager(MachineVisionManager):
     use_hough_circle = Bool(False)
 
     display_image = Instance(FrameImage, ())
+    _locator = None
 
     def calculate_new_center(self, cx, cy, offx, offy, dim=1.0,
                              open_image=True,
@@ -44,7 +45,7 @@ class AutoCenterManager(MachineVisionManager):
                              auto_close_image=True):
         frame = self.new_image_frame()
 
-        loc = self._get_locator()
+        loc = self.locator
 
         if self.use_target_radius:
             dim = self.target_radius
@@ -82,6 +83,22 @@ class AutoCenterManager(MachineVisionManager):
                                                        self.pxpermm))
             return (cx + mdx, cy + mdy), frm
 
+    def kill(self):
+        if self._locator is not None:
+            self._locator.close()
+            self._locator = None
+
+    @property
+    def locator(self):
+        """
+            the locator is kept so its threshold window workers are reused between calls
+        """
+        loc = self._locator
+        if loc is None:
+            loc = self._locator = self._get_locator()
+        loc.pxpermm = self.pxpermm
+        return loc
+
     # private
     def _get_locator(self):
         raise NotImplementedError
@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import print_function
 from traits.api import Float
 # ============= standard library imports ========================
+from multiprocessing.pool import ThreadPool
+
 from numpy import array, histogram, argmax, zeros, asarray, ones_like, \
     nonzero, max, arange, argsort, invert
 from skimage.feature import peak_local_max
@@ -38,6 +40,7 @@ from pychron.image.cv_wrapper import grayspace, draw_contour_list, contour, \
     draw_lines, \
     draw_polygons, crop
 from pychron.mv.target import Target
+from pychron.mv.window_sweep import iter_windows
 # from pychron.image.image import StandAloneImage
 from pychron.core.geometry.geometry import approximate_polygon_center, \
     calc_length
@@ -67,6 +70,19 @@ class Locator(Loggable):
     use_histogram = False
     use_circle_minimization = True
     step_signal = None
+    # number of threshold windows evaluated concurrently by _find_targets. 1 = sequential
+    threshold_workers = 4
+    _pool = None
+    _pool_workers = 0
+
+    def close(self):
+        """
+            stop the threshold window workers
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
 
     def wait(self):
         if self.step_signal:
@@ -214,23 +230,23 @@ class Locator(Loggable):
         if start is None:
             start = int(array(src).mean()) - 3 * w
 
-        seg = RegionSegmenter(use_adaptive_threshold=False)
         fa = self._get_filter_target_area(dim)
 
-        for i in range(n):
+        # the edge map only depends on src so calculate it once for all threshold windows
+        elmap = canny(src, sigma=1)
+
+        def test_window(i):
+            seg = RegionSegmenter(use_adaptive_threshold=False)
             seg.threshold_low = max((0, start + i * step - w))
             seg.threshold_high = max((1, min((255, start + i * step + w))))
 
-            seg.block_size += 5
-            nsrc = seg.segment(src)
+            seg.block_size += 5 * (i + 1)
+            nsrc = seg.segment(src, elmap=elmap)
 
             nf = colorspace(nsrc)
 
             # draw contours
             targets = self._find_polygon_targets(nsrc, frame=nf)
-            if set_image and image is not None:
-                image.set_frame(nf)
-
             if targets:
 
                 # filter targets
@@ -241,9 +257,35 @@ class Locator(Loggable):
                     #     print t.convexity, t.area, t.min_enclose_area, t.perimeter_convexity
                     targets = [t for t in targets if t.perimeter_convexity > convexity_filter]
 
+            return targets, nf
+
+        for targets, nf in self._iter_windows(test_window, n):
+            if set_image and image is not None:
+                image.set_frame(nf)
+
             if targets:
                 return targets
 
+    def _iter_windows(self, func, n):
+        """
+            yield func(i) for i in range(n) in order.
+
+            if threshold_workers > 1 windows are evaluated concurrently in batches of threshold_workers. the
+            segmentation and contouring release the GIL
+        """
+        nworkers = min(n, self.threshold_workers)
+        if nworkers > 1:
+            return iter_windows(func, n, self._get_pool(), nworkers)
+        else:
+            return iter_windows(func, n)
+
+    def _get_pool(self):
+        if self._pool is None or self._pool_workers != self.threshold_workers:
+            self.close()
+            self._pool = ThreadPool(self.threshold_workers)
+            self._pool_workers = self.threshold_workers
+        return self._pool
+
     def _mask(self, src, radius=None):
 
         radius *= self.pxpermm
@@ -32,9 +32,11 @@ class RegionSegmenter(BaseSegmenter):
     threshold_high = 255
     block_size = 20
 
-    def segment(self, image):
+    def segment(self, image, elmap=None):
         """
             pychron: preprocessing cv.Mat
+
+            elmap: optional precalculated edge map of image. use when segmenting the same image repeatedly
         """
         # image = src[:]
         if self.use_adaptive_threshold:
@@ -52,7 +54,8 @@ class RegionSegmenter(BaseSegmenter):
             markers[image > self.threshold_high] = 255
 
         # elmap = sobel(image, mask=image)
-        elmap = canny(image, sigma=1)
+        if elmap is None:
+            elmap = canny(image, sigma=1)
         wsrc = watershed(elmap, markers, mask=image)
 
         return invert(wsrc)
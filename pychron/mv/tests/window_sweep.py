@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+
+import time
+import unittest
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+from pychron.mv.window_sweep import iter_windows
+
+
+class WindowSweepTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ThreadPool(4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.pool.join()
+
+    def setUp(self):
+        self.calls = []
+        self._lock = Lock()
+
+    def _window(self, i):
+        with self._lock:
+            self.calls.append(i)
+        # later windows finish first
+        time.sleep(0.002 * (10 - i))
+        return i * i
+
+    def _first(self, accept, **kw):
+        for r in iter_windows(self._window, 10, **kw):
+            if accept(r):
+                return r
+
+    def test_parity(self):
+        expected = [i * i for i in range(10)]
+        self.assertEqual(list(iter_windows(self._window, 10)), expected)
+        for batch in (2, 3, 4):
+            self.assertEqual(list(iter_windows(self._window, 10, self.pool, batch)), expected)
+
+    def test_early_stop(self):
+        r = self._first(lambda x: x > 10)
+        self.assertEqual(r, 16)
+        self.assertEqual(self.calls, [0, 1, 2, 3, 4])
+
+        for batch in (2, 3, 4):
+            self.calls = []
+            self.assertEqual(self._first(lambda x: x > 10, pool=self.pool, batch=batch), r)
+
+            # only the batch containing the first acceptable window is evaluated past it
+            n = (4 // batch + 1) * batch
+            self.assertEqual(sorted(self.calls), list(range(n)))
+
+    def test_no_window(self):
+        self.assertIsNone(self._first(lambda x: x > 100, pool=self.pool, batch=4))
+        self.assertEqual(sorted(self.calls), list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+
+from six.moves import range
+
+
+# ============= local library imports  ==========================
+
+
+def iter_windows(func, n, pool=None, batch=1):
+    """
+        yield func(i) for i in range(n) in order.
+
+        with a pool the windows are evaluated concurrently in batches of batch windows. the next batch is only
+        submitted when the caller asks for it, so a caller that stops iterating at the first acceptable window
+        evaluates at most batch - 1 windows unnecessarily
+    """
+    if pool is None or batch < 2:
+        for i in range(n):
+            yield func(i)
+    else:
+        for i in range(0, n, batch):
+            for r in pool.map(func, range(i, min(n, i + batch))):
+                yield r
+
+# ============= EOF =============================================
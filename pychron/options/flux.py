@@ -40,6 +40,8 @@ class FluxOptions(FigureOptions):
     use_weighted_fit = Bool(False)
     monte_carlo_ntrials = Int(10)
     use_monte_carlo = Bool(False)
+    monte_carlo_seed = Int(0)
+    monte_carlo_processes = Int(0)
     monitor_sample_name = Str
     plot_kind = Enum('1D', '2D')
 
@@ -47,6 +47,10 @@ class FluxSubOptions(SubOptions):
                      Item('use_weighted_fit', ),
                      Item('monte_carlo_ntrials', ),
                      Item('use_monte_carlo', ),
+                     Item('monte_carlo_seed', enabled_when='use_monte_carlo',
+                          tooltip='Seed for the random number generator. 0=unseeded'),
+                     Item('monte_carlo_processes', enabled_when='use_monte_carlo',
+                          tooltip='Number of processes used to run the trials. 0=run in this process'),
                      label='Fits',
                      show_border=True)
 
@@ -309,13 +309,16 @@ class FluxResultsEditor(BaseTraitsEditor, SelectionFigure):
             self.information_dialog(msg)
             return
 
-        if self.plotter_options.use_monte_carlo:
+        po = self.plotter_options
+        if po.use_monte_carlo:
             # from pychron.core.stats.monte_carlo import monte_carlo_error_estimation
             for positions in (self.unknown_positions, self.monitor_positions):
                 pts = array([[p.x, p.y] for p in positions])
                 nominals = reg.predict(pts)
                 errors = monte_carlo_error_estimation(reg, nominals, pts,
-                                                      ntrials=self.plotter_options.monte_carlo_ntrials)
+                                                      ntrials=po.monte_carlo_ntrials,
+                                                      seed=po.monte_carlo_seed or None,
+                                                      processes=po.monte_carlo_processes)
                 for p, j, je in zip(positions, nominals, errors):
                     oj = p.saved_j
 
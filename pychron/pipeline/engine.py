@@ -48,6 +48,7 @@ from pychron.pipeline.plot.inspector_item import BaseInspectorItem
 from pychron.pipeline.state import EngineState, get_detector_set
 from pychron.pipeline.template import PipelineTemplate, PipelineTemplateSaveView, PipelineTemplateGroup, \
     PipelineTemplateRoot
+from pychron.processing.isotope import FIT_STATISTICS
 
 
 class ActiveCTX(object):
@@ -621,6 +622,7 @@ class PipelineEngine(Loggable):
         state.canceled = False
 
         ost = time.time()
+        FIT_STATISTICS.reset()
         for idx, node in enumerate(self.pipeline.iternodes(None)):
             if node.enabled:
                 with ActiveCTX(node):
@@ -653,6 +655,7 @@ class PipelineEngine(Loggable):
         else:
             self.debug('pipeline run finished')
             self.debug('pipeline runtime {}'.format(time.time() - ost))
+            self.debug('pipeline {}'.format(FIT_STATISTICS))
             if post_run:
                 self.post_run(state)
             return True
@@ -663,6 +666,7 @@ class PipelineEngine(Loggable):
             self.state = state
 
         ost = time.time()
+        FIT_STATISTICS.reset()
 
         self.dvc.create_session(force=True)
 
@@ -712,6 +716,7 @@ class PipelineEngine(Loggable):
         else:
             self.debug('pipeline run finished')
             self.debug('pipeline runtime {}'.format(time.time() - ost))
+            self.debug('pipeline {}'.format(FIT_STATISTICS))
 
             self.post_run(state)
 
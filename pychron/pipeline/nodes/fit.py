@@ -313,7 +313,7 @@ class FitIsotopeEvolutionNode(FitNode):
             if self.check_refit(unks):
                 return
 
-            fs = progress_loader(unks, self._assemble_result, threshold=1, step=10)
+            fs = progress_loader(unks, self._assemble_result, threshold=1, step=10, executor='thread')
 
             if self.editor:
                 self.editor.analysis_groups = [(ai,) for ai in unks]
@@ -43,6 +43,7 @@ from pychron.pipeline.plot.editors.interpreted_age_editor import InterpretedAgeE
 from pychron.pipeline.state import get_isotope_set
 from pychron.pipeline.tables.xlsx_table_writer import XLSXTableWriter
 from pychron.pipeline.tasks.interpreted_age_factory import set_interpreted_age
+from pychron.processing.batch_age import recalculate_ages, update_ages
 from six.moves import zip
 
 from pychron.processing.analyses.analysis import EXTRACTION_ATTRS, META_ATTRS
@@ -159,6 +160,9 @@ class BlanksPersistNode(DVCPersistNode):
 
         self._persist(state, msg)
 
+        # the saved blanks are now the blanks of the unknowns. update the ages used by the figures
+        update_ages(state.unknowns, logger=self.dvc)
+
     def _save_blanks(self, ai, prog, i, n, saveable_keys, references):
         if prog:
             prog.change_message('Save Blanks {} {}/{}'.format(ai.record_id, i, n))
@@ -227,11 +231,13 @@ class FluxPersistNode(DVCPersistNode):
                         add=False)
 
         j = ufloat(irp.j, irp.jerr, tag='j')
-        for i in state.unknowns:
-            if i.identifier == irp.identifier:
-                i.j = j
-                i.arar_constants.lambda_k = decay['lambda_k_total']
-                i.recalculate_age()
+        ans = [i for i in state.unknowns if i.identifier == irp.identifier]
+        for i in ans:
+            i.j = j
+            i.arar_constants.lambda_k = decay['lambda_k_total']
+
+        for i in recalculate_ages(ans):
+            i.recalculate_age()
 
 
 class XLSXTablePersistNode(BaseNode):
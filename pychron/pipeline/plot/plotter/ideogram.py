@@ -17,21 +17,24 @@
 # ============= enthought library imports =======================
 from __future__ import absolute_import
 from __future__ import print_function
+
+from collections import OrderedDict
+
 from chaco.abstract_overlay import AbstractOverlay
 from chaco.array_data_source import ArrayDataSource
 from chaco.data_label import DataLabel
 from chaco.scatterplot import render_markers
 from chaco.tooltip import ToolTip
 from enable.colors import ColorTrait
-from numpy import array, arange, Inf, argmax
+from numpy import array, arange, Inf, argmax, asarray
 from pyface.message_dialog import warning
-from traits.api import Array, Event
+from traits.api import Array, Event, Instance
 from uncertainties import nominal_value, std_dev
 
 from pychron.core.codetools.inspection import caller
 from pychron.core.helpers.formatting import floatfmt
 from pychron.core.stats.peak_detection import fast_find_peaks
-from pychron.core.stats.probability_curves import cumulative_probability, kernel_density
+from pychron.core.stats.probability_curves import cumulative_probability, kernel_density, adaptive_bin_count
 from pychron.graph.ticks import IntTickGenerator
 from pychron.pipeline.plot.flow_label import FlowPlotLabel
 from pychron.pipeline.plot.overlays.ideogram_inset_overlay import IdeogramInset, IdeogramPointsInset
@@ -45,6 +48,8 @@ from six.moves import range
 from six.moves import zip
 
 N = 500
+MAX_N = 5000
+CURVE_CACHE_SIZE = 16
 
 
 class PeakLabel(DataLabel):
@@ -121,6 +126,8 @@ class Ideogram(BaseArArFigure):
     xes = Array
     ytitle = 'Relative Probability'
 
+    _curve_cache = Instance(OrderedDict, ())
+
     # xlimits_updated = Event
     # ylimits_updated = Event
 
@@ -423,7 +430,7 @@ class Ideogram(BaseArArFigure):
                                     location=self.options.inset_location)
             plot.overlays.append(o)
 
-            cfunc = lambda x1, x2: cumulative_probability(self.xs, self.xes, x1, x2, n=N)
+            cfunc = self._cumulative_probability_func(self.xs, self.xes)
             xs, ys, xmi, xma = self._calculate_asymptotic_limits(cfunc,
                                                                  # asymptotic_width=10,
                                                                  tol=self.options.asymptotic_height_percent)
@@ -730,21 +737,56 @@ class Ideogram(BaseArArFigure):
                 xmi, xma = self.xmi, self.xma
 
         opt = self.options
+        ages = asarray(ages, dtype=float)
+        errors = asarray(errors, dtype=float)
 
-        if opt.probability_curve_kind == 'kernel':
-            return kernel_density(ages, errors, xmi, xma, n=N)
+        kind = opt.probability_curve_kind
+        if kind != 'kernel' and opt.use_asymptotic_limits and calculate_limits:
+            tol = opt.asymptotic_height_percent or 10
+            key = ('asymptotic', opt.index_attr, tol)
+        else:
+            key = (kind, xmi, xma)
+
+        # curves are cached per group. the key includes the ages and errors so the cached curve is
+        # dropped when the analyses or their omit state change
+        key += (ages.tobytes(), errors.tobytes())
+        cache = self._curve_cache
+        try:
+            bins, probs, limits = cache.pop(key)
+        except KeyError:
+            bins, probs, limits = self._make_probability_curve(ages, errors, xmi, xma, key[0] == 'asymptotic')
+            if len(cache) >= CURVE_CACHE_SIZE:
+                cache.popitem(last=False)
+        cache[key] = (bins, probs, limits)
 
+        if limits:
+            self.trait_setq(xmi=limits[0], xma=limits[1])
+        return bins, probs
+
+    def _make_probability_curve(self, ages, errors, xmi, xma, asymptotic):
+        """
+            return bins, probs, limits. limits is None unless the asymptotic limits were calculated
+        """
+        opt = self.options
+        if opt.probability_curve_kind == 'kernel':
+            bins, probs = kernel_density(ages, errors, xmi, xma, n=N)
+            return bins, probs, None
+
+        cfunc = self._cumulative_probability_func(ages, errors)
+        if asymptotic:
+            bins, probs, x1, x2 = self._calculate_asymptotic_limits(cfunc,
+                                                                    tol=(opt.asymptotic_height_percent or 10))
+            return bins, probs, (x1, x2)
         else:
-            if opt.use_asymptotic_limits and calculate_limits:
-                cfunc = lambda x1, x2: cumulative_probability(ages, errors, x1, x2, n=N)
+            bins, probs = cfunc(xmi, xma)
+            return bins, probs, None
 
-                bins, probs, x1, x2 = self._calculate_asymptotic_limits(cfunc,
-                                                                        tol=(opt.asymptotic_height_percent or 10))
-                self.trait_setq(xmi=x1, xma=x2)
+    def _cumulative_probability_func(self, ages, errors):
+        def cfunc(x1, x2):
+            n = adaptive_bin_count(errors, x1, x2, min_n=N, max_n=MAX_N)
+            return cumulative_probability(ages, errors, x1, x2, n=n)
 
-                return bins, probs
-            else:
-                return cumulative_probability(ages, errors, xmi, xma, n=N)
+        return cfunc
 
     def _calculate_nominal_xlimits(self):
         return self.min_x(self.options.index_attr), self.max_x(self.options.index_attr)
@@ -24,10 +24,10 @@ import os
 from datetime import datetime
 from six.moves import range
 
-import struct
 import time
 from uncertainties import ufloat
 # ============= local library imports  ==========================
+from pychron.core.helpers.binpack import unpack_xy
 from pychron.core.helpers.filetools import remove_extension
 from pychron.core.helpers.isotope_utils import sort_detectors
 from pychron.database.orms.isotope.meas import meas_AnalysisTable
@@ -717,8 +717,7 @@ class DBAnalysis(Analysis):
         if pc:
             center = float(pc.center)
             packed_xy = pc.points
-            return center, zip(*[struct.unpack('<ff', packed_xy[i:i + 8])
-                                 for i in range(0, len(packed_xy), 8)])
+            return center, unpack_xy(packed_xy, '<')
         else:
             return 0.0, None
 
@@ -30,7 +30,7 @@ from pychron.processing.argon_calculations import calculate_F, abundance_sensiti
     calculate_decay_factor, calculate_flux
 from pychron.processing.isotope import Blank
 from pychron.processing.isotope_group import IsotopeGroup
-from pychron.pychron_constants import ARGON_KEYS
+from pychron.pychron_constants import ARGON_KEYS, INTERFERENCE_KEYS
 import six
 
 
@@ -285,6 +285,70 @@ class ArArAge(IsotopeGroup):
             self._calculate_kca()
             self._calculate_kcl()
 
+    def get_batch_age_inputs(self):
+        """
+            return the inputs of pychron.processing.batch_age.calculate_ages i.e.
+            (isotope intensities, input variables ordered as batch_age.PARAMETERS, constants)
+            or None if the age cannot be calculated
+        """
+        self.calculate_decay_factors()
+        iso_intensities = self._assemble_isotope_intensities()
+        if not iso_intensities:
+            return
+
+        arc = self.arar_constants
+        normal = arc.k3739_mode.lower() == 'normal' and not self.fixed_k3739
+        if normal:
+            fixed_k3739 = 0
+        else:
+            fixed_k3739 = self.fixed_k3739 or arc.fixed_k3739
+
+        pr = self.interference_corrections
+        prs = [pr.get(k, 1 if k == 'Ca3937' and not normal else 0) for k in INTERFERENCE_KEYS]
+
+        variables = iso_intensities + prs + [fixed_k3739, self._get_j()]
+        constants = (self.decay_days, nominal_value(arc.atm4036), nominal_value(arc.atm3836),
+                     nominal_value(arc.lambda_Cl36), normal, arc.allow_negative_ca_correction,
+                     nominal_value(arc.lambda_k), float(arc.age_scalar))
+        return iso_intensities, variables, constants
+
+    def get_batch_j_inputs(self):
+        """
+            return the inputs of pychron.processing.batch_age.recalculate_ages i.e.
+            ([F, J], lambda_k, age_scalar) or None if F is not calculated
+        """
+        if self.uF:
+            arc = self.arar_constants
+            return [self.uF, self._get_j()], nominal_value(arc.lambda_k), float(arc.age_scalar)
+
+    def set_batch_age(self, iso_intensities, f, f_err, f_err_wo_irrad, non_ar_isotopes=None, computed=None,
+                      interference_corrected=None, age=None):
+        """
+            set the values calculated by pychron.processing.batch_age.calculate_ages.
+            only F is set if non_ar_isotopes is None
+        """
+        self._set_F_values(f, f_err, f_err_wo_irrad)
+        if non_ar_isotopes is not None:
+            self._set_corrected_intensities(iso_intensities)
+            self._set_interference_values(non_ar_isotopes, computed, interference_corrected)
+            self.set_age_values(*age)
+            self._calculate_kca()
+            self._calculate_kcl()
+
+    def set_age_values(self, uage_w_j_err, uage, age_err):
+        self.uage_w_j_err = uage_w_j_err
+        self.uage = uage
+
+        self.age = nominal_value(uage)
+        self.age_err = age_err
+        self.age_err_wo_j = age_err
+
+        # self.uage = ufloat(self.age, self.age_err)
+        self.uage_wo_j_err = ufloat(self.age, self.age_err_wo_j)
+
+        for iso in self.itervalues():
+            iso.age_error_component = self.get_error_component(iso.name)
+
     def calculate_decay_factors(self):
         arc = self.arar_constants
         # only calculate decayfactors once
@@ -376,12 +440,21 @@ class ArArAge(IsotopeGroup):
                                                                                   arar_constants=self.arar_constants,
                                                                                   fixed_k3739=self.fixed_k3739)
 
-            self.uF = f
-            self.F = nominal_value(f)
-            self.F_err = std_dev(std_dev)
-            self.F_err_wo_irrad = std_dev(f_wo_irrad)
+            self._set_F_values(f, std_dev(f), std_dev(f_wo_irrad))
             return f, f_wo_irrad, non_ar, computed, interference_corrected
 
+    def _set_F_values(self, f, f_err, f_err_wo_irrad):
+        self.uF = f
+        self.F = nominal_value(f)
+        self.F_err = f_err
+        self.F_err_wo_irrad = f_err_wo_irrad
+
+    def _get_j(self):
+        if self.j is not None:
+            return copy(self.j)
+        else:
+            return ufloat(1e-4, 1e-7)
+
     def _assemble_isotope_intensities(self):
         iso_intensities = self._assemble_ar_ar_isotopes()
         if not iso_intensities:
@@ -410,6 +483,15 @@ class ArArAge(IsotopeGroup):
         if not iso_intensities:
             return
 
+        self._set_corrected_intensities(iso_intensities)
+
+        f, f_wo_irrad, non_ar, computed, interference_corrected = self._calculate_F(iso_intensities,
+                                                                                    interferences=interferences)
+
+        self._set_interference_values(non_ar, computed, interference_corrected)
+        self._set_age_values(f, include_decay_error)
+
+    def _set_corrected_intensities(self, iso_intensities):
         self.Ar39_decay_corrected = iso_intensities[1]
         self.Ar37_decay_corrected = iso_intensities[3]
 
@@ -423,9 +505,7 @@ class ArArAge(IsotopeGroup):
                                           Ar37=iso_intensities[3],
                                           Ar36=iso_intensities[4])
 
-        f, f_wo_irrad, non_ar, computed, interference_corrected = self._calculate_F(iso_intensities,
-                                                                                    interferences=interferences)
-
+    def _set_interference_values(self, non_ar, computed, interference_corrected):
         self.non_ar_isotopes = non_ar
         self.computed = computed
         self.rad40_percent = computed['rad40_percent']
@@ -434,40 +514,22 @@ class ArArAge(IsotopeGroup):
         for k, v in interference_corrected.items():
             isotopes[k].interference_corrected_value = v
 
-        self._set_age_values(f, include_decay_error)
-
     def _set_age_values(self, f, include_decay_error=False):
-        if self.j is not None:
-            j = copy(self.j)
-        else:
-            j = ufloat(1e-4, 1e-7)
+        j = self._get_j()
 
         arc = self.arar_constants
         age = age_equation(j, f, include_decay_error=include_decay_error,
                            # lambda_k=self.lambda_k,
                            arar_constants=arc)
         # age = ufloat((1, 0.1))
-        self.uage_w_j_err = age
-        # self.age = age.nominal_value
-        # self.age_err = age.std_dev
-
-        if self.j is not None:
-            j = copy(self.j)
-        else:
-            j = ufloat(1e-4, 1e-7)
+        uage_w_j_err = age
 
+        j = self._get_j()
         j.std_dev = 0
         age = age_equation(j, f, include_decay_error=include_decay_error,
                            # lambda_k=self.lambda_k,
                            arar_constants=arc)
-        self.uage = age
-
-        self.age = nominal_value(age)
-        self.age_err = std_dev(age)
-        self.age_err_wo_j = std_dev(age)
-
-        # self.uage = ufloat(self.age, self.age_err)
-        self.uage_wo_j_err = ufloat(self.age, self.age_err_wo_j)
+        self.set_age_values(uage_w_j_err, age, std_dev(age))
 
         # if self.j is not None:
         # j = copy(self.j)
@@ -480,9 +542,6 @@ class ArArAge(IsotopeGroup):
         # self.age_err_wo_irrad = age.std_dev
         # j.std_dev = 0
         # self.age_err_wo_j_irrad = age.std_dev
-        #
-        for iso in self.itervalues():
-            iso.age_error_component = self.get_error_component(iso.name)
 
     # def _get_isotope_keys(self):
     #     keys = self.isotopes.keys()
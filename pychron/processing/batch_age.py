@@ -0,0 +1,378 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+
+from numpy import asarray, zeros, where, log, sqrt, einsum, errstate, isfinite, array
+from uncertainties import UFloat, ufloat
+
+# ============= local library imports  ==========================
+from pychron.pychron_constants import INTERFERENCE_KEYS, ARGON_KEYS
+
+# order of the input variables of a batch age calculation
+PARAMETERS = ARGON_KEYS + INTERFERENCE_KEYS + ('fixed_k3739', 'j')
+INTERFERENCE_INDICES = list(range(5, 5 + len(INTERFERENCE_KEYS)))
+J_INDEX = PARAMETERS.index('j')
+
+
+class LinearArray(object):
+    """
+        first order uncertainty propagation for N analyses at once.
+
+        value is an array of N nominal values and jac the (N, P) array of the partial derivatives with respect to
+        P input variables. this is the same linear approximation used by the uncertainties package so
+        errors gives the same errors as the equivalent ufloat calculation
+    """
+    # let numpy defer to the reflected operators, e.g. ndarray * LinearArray
+    __array_ufunc__ = None
+
+    def __init__(self, value, jac):
+        self.value = value
+        self.jac = jac
+
+    @classmethod
+    def variables(cls, values):
+        """
+            values: (N, P) array. return a list of P LinearArrays, one per input variable
+        """
+        values = asarray(values, dtype=float)
+        n, p = values.shape
+        vs = []
+        for i in range(p):
+            jac = zeros((n, p))
+            jac[:, i] = 1
+            vs.append(cls(values[:, i], jac))
+        return vs
+
+    def __add__(self, other):
+        if isinstance(other, LinearArray):
+            return LinearArray(self.value + other.value, self.jac + other.jac)
+        return LinearArray(self.value + other, self.jac)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, LinearArray):
+            return LinearArray(self.value - other.value, self.jac - other.jac)
+        return LinearArray(self.value - other, self.jac)
+
+    def __rsub__(self, other):
+        return LinearArray(other - self.value, -self.jac)
+
+    def __neg__(self):
+        return LinearArray(-self.value, -self.jac)
+
+    def __mul__(self, other):
+        if isinstance(other, LinearArray):
+            return LinearArray(self.value * other.value,
+                               self.jac * other.value[:, None] + other.jac * self.value[:, None])
+        other = asarray(other, dtype=float)
+        return LinearArray(self.value * other, self.jac * (other[:, None] if other.ndim else other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, LinearArray):
+            v = self.value / other.value
+            return LinearArray(v, (self.jac - other.jac * v[:, None]) / other.value[:, None])
+        return self * (1 / asarray(other, dtype=float))
+
+    def __rtruediv__(self, other):
+        v = other / self.value
+        return LinearArray(v, -self.jac * (v / self.value)[:, None])
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def log(self):
+        return LinearArray(log(self.value), self.jac / self.value[:, None])
+
+    def where(self, mask, other):
+        """
+            return self where mask is True otherwise other
+        """
+        if not isinstance(other, LinearArray):
+            other = LinearArray(zeros(self.value.shape) + other, zeros(self.jac.shape))
+        return LinearArray(where(mask, self.value, other.value), where(mask[:, None], self.jac, other.jac))
+
+    def errors(self, covariance, exclude=None):
+        """
+            covariance: (N, P, P) covariance of the input variables
+            exclude: indices of input variables to treat as exact
+
+            return the 1 sigma errors
+        """
+        jac = self.jac
+        if exclude:
+            jac = jac.copy()
+            jac[:, exclude] = 0
+        return sqrt(einsum('np,npq,nq->n', jac, covariance, jac))
+
+    def to_ufloat(self, i, variables, exclude=None):
+        """
+            return analysis i as a ufloat that is a linear combination of its input variables. this preserves
+            the correlations with the quantities the inputs were calculated from
+        """
+        uv = ufloat(float(self.value[i]), 0)
+        for k, (d, v) in enumerate(zip(self.jac[i], variables)):
+            if d and isinstance(v, UFloat) and not (exclude and k in exclude):
+                uv += float(d) * (v - v.nominal_value)
+        return uv
+
+
+def covariance_matrix(variables):
+    """
+        return the (P, P) covariance of a list of ufloats. floats are treated as exact
+    """
+    idx = {}
+    rows = []
+    for v in variables:
+        row = {}
+        if isinstance(v, UFloat):
+            for var, d in v.derivatives.items():
+                if var.std_dev:
+                    row[idx.setdefault(var, len(idx))] = d * var.std_dev
+        rows.append(row)
+
+    m = zeros((len(variables), len(idx)))
+    for i, row in enumerate(rows):
+        for j, d in row.items():
+            m[i, j] = d
+    return m.dot(m.T)
+
+
+def nominal_values(variables):
+    return [float(getattr(v, 'nominal_value', v)) for v in variables]
+
+
+def interference_corrections_batch(a40, a39, a38, a37, a36, pr, normal_k3739, fixed_k3739,
+                                   allow_negative_ca_correction):
+    """
+        vectorized argon_calculations.interference_corrections.
+
+        pr: dict of LinearArrays keyed by INTERFERENCE_KEYS
+        normal_k3739: boolean array. False to use fixed_k3739
+    """
+    k37 = 0
+    for _ in range(5):
+        ca37 = a37 - k37
+        ca39 = pr['Ca3937'] * ca37
+        k39 = a39 - ca39
+        k37 = pr['K3739'] * k39
+
+    # argon_calculations.apply_fixed_k3739
+    x = fixed_k3739
+    y = 1 / pr['Ca3937']
+    fca37 = (a39 * x * y) / (x + y)
+    fca39 = pr['Ca3937'] * fca37
+    fk39 = a39 - fca39
+    fk37 = x * fk39
+
+    ca37 = ca37.where(normal_k3739, fca37)
+    ca39 = ca39.where(normal_k3739, fca39)
+    k39 = k39.where(normal_k3739, fk39)
+    k37 = k37.where(normal_k3739, fk37)
+
+    k38 = pr['K3839'] * k39
+    ca37 = ca37.where(allow_negative_ca_correction | (ca37.value > 0), 0)
+
+    ca36 = pr['Ca3637'] * ca37
+    ca38 = pr['Ca3837'] * ca37
+    return k37, k38, k39, ca36, ca37, ca38, ca39
+
+
+def calculate_atmospheric_batch(a38, a36, k38, ca38, ca36, decay_time, cl3638, lambda_cl36, atm3836):
+    """
+        vectorized argon_calculations.calculate_atmospheric
+    """
+    m = cl3638 * (lambda_cl36 * decay_time)
+    atm36 = 0
+    for _ in range(5):
+        ar38atm = atm36 * atm3836
+        cl38 = a38 - ar38atm - k38 - ca38
+        cl36 = cl38 * m
+        atm36 = a36 - ca36 - cl36
+    return atm36, cl36, cl38
+
+
+def calculate_F_batch(values, decay_time, atm4036, atm3836, lambda_cl36,
+                      normal_k3739, allow_negative_ca_correction):
+    """
+        vectorized argon_calculations.calculate_F for N analyses.
+
+        values: (N, P) nominal values of the input variables ordered as PARAMETERS
+        the remaining arguments are scalars or arrays of length N
+
+        return f, non_ar_isotopes, computed, interference_corrected as dicts of LinearArrays with the same keys
+        as calculate_F. The error of F without irradiation uncertainties is
+        f.errors(cov, exclude=INTERFERENCE_INDICES)
+    """
+    vs = LinearArray.variables(values)
+    a40, a39, a38, a37, a36 = vs[:5]
+    pr = dict(zip(INTERFERENCE_KEYS, vs[5:12]))
+    fixed_k3739 = vs[12]
+
+    n = len(a40.value)
+    normal_k3739 = asarray(normal_k3739, dtype=bool) | zeros(n, dtype=bool)
+    allow_negative_ca_correction = asarray(allow_negative_ca_correction, dtype=bool) | zeros(n, dtype=bool)
+
+    with errstate(divide='ignore', invalid='ignore'):
+        k37, k38, k39, ca36, ca37, ca38, ca39 = interference_corrections_batch(a40, a39, a38, a37, a36, pr,
+                                                                               normal_k3739, fixed_k3739,
+                                                                               allow_negative_ca_correction)
+        atm36, cl36, cl38 = calculate_atmospheric_batch(a38, a36, k38, ca38, ca36, decay_time, pr['Cl3638'],
+                                                        lambda_cl36, atm3836)
+
+        atm40 = atm36 * atm4036
+        k40 = k39 * pr['K4039']
+
+        rad40 = a40 - atm40 - k40
+        f = rad40 / k39
+        rp = rad40 / a40 * 100
+
+    nar = {'k40': k40, 'ca39': ca39, 'k38': k38, 'ca38': ca38, 'cl38': cl38, 'k37': k37, 'ca37': ca37, 'ca36': ca36,
+           'cl36': cl36}
+    comp = {'rad40': rad40, 'rad40_percent': rp, 'ca37': ca37, 'ca39': ca39, 'ca36': ca36, 'k39': k39,
+            'atm40': atm40}
+    ifc = {'Ar40': a40 - k40, 'Ar39': k39, 'Ar38': a38, 'Ar37': a37, 'Ar36': atm36}
+    return f, nar, comp, ifc
+
+
+def age_equation_batch(j, f, lambda_k, scalar):
+    """
+        vectorized argon_calculations.age_equation without decay constant errors
+    """
+    with errstate(divide='ignore', invalid='ignore'):
+        return (1 + j * f).log() * (1 / (asarray(lambda_k, dtype=float) * scalar))
+
+
+def calculate_ages(analyses, calculate_f_only=False, force=False):
+    """
+        calculate F and ages for many ArArAge analyses with calculate_F_batch and age_equation_batch
+
+        return the analyses that were not calculated, e.g. because of missing isotopes or a division by zero.
+        use calculate_age/calculate_F for those
+    """
+    if not force and not calculate_f_only:
+        analyses = [a for a in analyses if not a.age]
+
+    rows, failed = [], []
+    for a in analyses:
+        inputs = a.get_batch_age_inputs()
+        if inputs is None:
+            failed.append(a)
+        else:
+            rows.append((a, inputs))
+
+    if not rows:
+        return failed
+
+    ans, inputs = list(zip(*rows))
+    iso_intensities, variables, constants = list(zip(*inputs))
+    decay_time, atm4036, atm3836, lambda_cl36, normal_k3739, allow_negative, lambda_k, scalar = \
+        [array(c) for c in zip(*constants)]
+
+    values = array([nominal_values(v) for v in variables])
+    cov = array([covariance_matrix(v) for v in variables])
+
+    f, nar, comp, ifc = calculate_F_batch(values, decay_time, atm4036, atm3836, lambda_cl36,
+                                          normal_k3739, allow_negative)
+    f_err = f.errors(cov)
+    f_err_wo_irrad = f.errors(cov, exclude=INTERFERENCE_INDICES)
+
+    ok = isfinite(f.value) & isfinite(f.jac).all(axis=1)
+    if not calculate_f_only:
+        j = LinearArray.variables(values)[J_INDEX]
+        age = age_equation_batch(j, f, lambda_k, scalar)
+        age_err = age.errors(cov, exclude=[J_INDEX])
+
+        quantities = list(nar.values()) + list(comp.values()) + list(ifc.values())
+        for q in quantities + [age]:
+            ok &= isfinite(q.value) & isfinite(q.jac).all(axis=1)
+
+    for i, (a, v) in enumerate(zip(ans, variables)):
+        if not ok[i]:
+            failed.append(a)
+            continue
+
+        uf = f.to_ufloat(i, v)
+        if calculate_f_only:
+            a.set_batch_age(iso_intensities[i], uf, f_err[i], f_err_wo_irrad[i])
+        else:
+            a.set_batch_age(iso_intensities[i], uf, f_err[i], f_err_wo_irrad[i],
+                            non_ar_isotopes={k: q.to_ufloat(i, v) for k, q in nar.items()},
+                            computed={k: q.to_ufloat(i, v) for k, q in comp.items()},
+                            interference_corrected={k: q.to_ufloat(i, v) for k, q in ifc.items()},
+                            age=(age.to_ufloat(i, v), age.to_ufloat(i, v, exclude=(J_INDEX,)), age_err[i]))
+
+    return failed
+
+
+def recalculate_ages(analyses):
+    """
+        recalculate the ages of analyses with an existing F e.g. after J changed.
+
+        return the analyses that were not calculated. use recalculate_age for those
+    """
+    rows, failed = [], []
+    for a in analyses:
+        inputs = a.get_batch_j_inputs()
+        if inputs is None:
+            failed.append(a)
+        else:
+            rows.append((a, inputs))
+
+    if not rows:
+        return failed
+
+    ans, inputs = list(zip(*rows))
+    variables, lambda_k, scalar = list(zip(*inputs))
+
+    values = array([nominal_values(v) for v in variables])
+    cov = array([covariance_matrix(v) for v in variables])
+
+    f, j = LinearArray.variables(values)
+    age = age_equation_batch(j, f, array(lambda_k), array(scalar))
+    age_err = age.errors(cov, exclude=[1])
+    ok = isfinite(age.value) & isfinite(age.jac).all(axis=1)
+
+    for i, (a, v) in enumerate(zip(ans, variables)):
+        if ok[i]:
+            a.set_age_values(age.to_ufloat(i, v), age.to_ufloat(i, v, exclude=(1,)), age_err[i])
+        else:
+            failed.append(a)
+
+    return failed
+
+
+def update_ages(analyses, logger=None):
+    """
+        recalculate the ages of analyses e.g. after their blanks changed. analyses calculate_ages cannot calculate are
+        calculated one at a time with calculate_age
+    """
+    try:
+        analyses = calculate_ages(analyses, force=True)
+    except BaseException:
+        if logger:
+            logger.debug('batch age calculation exception')
+            logger.debug_exception()
+
+    for a in analyses:
+        a.calculate_age(force=True)
+
+# ============= EOF =============================================
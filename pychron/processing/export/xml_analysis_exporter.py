@@ -19,10 +19,10 @@ from __future__ import absolute_import
 from traits.api import Instance
 # ============= standard library imports ========================
 import base64
-import struct
 import os
 # ============= local library imports  ==========================
 from uncertainties import nominal_value, std_dev
+from pychron.core.helpers.binpack import pack_xy
 from pychron.processing.export.destinations import XMLDestination
 from pychron.processing.export.export_spec import XMLExportSpec
 from pychron.processing.export.exporter import Exporter
@@ -76,10 +76,7 @@ class XMLAnalysisExporter(Exporter):
             self._parser.save(self.destination.destination)
 
     def _make_timeblob(self, t, v):
-        blob = ''
-        for ti, vi in zip(t, v):
-            blob += struct.pack('>ff', float(vi), float(ti))
-        return blob
+        return pack_xy(v, t)
 
     def _make_xml_analysis(self, xmlp, spec):
         vertag = xmlp.add('version', '', None)
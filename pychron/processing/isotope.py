@@ -21,22 +21,40 @@
 from __future__ import absolute_import
 from __future__ import print_function
 import re
-import struct
 from binascii import hexlify
 from six.moves import map
 from six.moves import range
 
 
-from numpy import array, Inf, polyfit
+from numpy import array, asarray, Inf, polyfit, empty
 from uncertainties import ufloat, nominal_value, std_dev
 
 from pychron.core.geometry.geometry import curvature_at
+from pychron.core.helpers.binpack import unpack_xy, pack_xy
 from pychron.core.helpers.fits import natural_name_fit, fit_to_degree
 from pychron.core.regression.mean_regressor import MeanRegressor
 import six
 from six.moves import zip
 
 
+class FitStatistics(object):
+    """
+        number of regressions computed and served from the fit cache. see IsotopicMeasurement.regressor
+    """
+    computed = 0
+    cached = 0
+
+    def reset(self):
+        self.computed = 0
+        self.cached = 0
+
+    def __str__(self):
+        return 'fits computed={} cached={}'.format(self.computed, self.cached)
+
+
+FIT_STATISTICS = FitStatistics()
+
+
 def fit_abbreviation(fit, ):
     f = ''
     if fit:
@@ -52,6 +70,8 @@ class BaseMeasurement(object):
     use_manual_error = False
 
     _n = None
+    _xbuf = None
+    _ybuf = None
 
     @property
     def n(self):
@@ -79,8 +99,7 @@ class BaseMeasurement(object):
         if endianness is None:
             endianness = self.endianness
 
-        fmt = '{}ff'.format(endianness)
-        txt = ''.join((struct.pack(fmt, x, y) for x, y in zip(self.xs, self.ys)))
+        txt = pack_xy(self.xs, self.ys, endianness)
         if as_hex:
             txt = hexlify(txt)
         return txt
@@ -93,28 +112,76 @@ class BaseMeasurement(object):
             print(e)
             return
 
+        self.set_data(xs, ys, n_only)
+
+    def set_data(self, xs, ys, n_only=False):
         if n_only:
             self.n = len(xs)
         else:
-            self.xs = array(xs)
-            self.ys = array(ys)
+            self.xs = asarray(xs)
+            self.ys = asarray(ys)
+            self.invalidate_fit()
 
             # print self.name, self.xs.shape, self.ys.shape
             # print self.name, self.ys
 
+    def append_data(self, x, y):
+        """
+            append a point to xs and ys.
+
+            points are written into preallocated buffers that grow geometrically. xs and ys are views
+            of the buffers so the cost of an append is independent of the number of points
+        """
+        n = self._sync_buffers(1)
+        self._xbuf[n] = x
+        self._ybuf[n] = y
+        n += 1
+        self.xs = self._xbuf[:n]
+        self.ys = self._ybuf[:n]
+
+    def invalidate_fit(self):
+        """
+            call after modifying xs or ys in place
+        """
+        pass
+
+    def reserve(self, n):
+        """
+            make room for n more points. call before a measurement with the number of counts
+        """
+        self._sync_buffers(n)
+
+    def _sync_buffers(self, extra):
+        """
+            make sure the buffers hold the current xs, ys and have room for extra points.
+            the buffers are rebuilt if xs or ys was replaced e.g. by set_data
+
+            return the current number of points
+        """
+        xs, ys = self.xs, self.ys
+        n = xs.shape[0]
+        xbuf, ybuf = self._xbuf, self._ybuf
+        if xbuf is None or xs.base is not xbuf or ys.base is not ybuf or ys.shape[0] != n:
+            xbuf, ybuf = None, None
+
+        if xbuf is None or xbuf.shape[0] < n + extra:
+            size = n + extra
+            if xbuf is not None:
+                size = max(size, 2 * xbuf.shape[0])
+
+            nxbuf, nybuf = empty(size), empty(size)
+            nxbuf[:n] = xs
+            nybuf[:n] = ys
+            self._xbuf, self._ybuf = nxbuf, nybuf
+            self.xs, self.ys = nxbuf[:n], nybuf[:n]
+
+        return n
+
     def _unpack_blob(self, blob, endianness=None):
         if endianness is None:
             endianness = self.endianness
 
-        try:
-            x, y = zip(*[struct.unpack('{}ff'.format(endianness), blob[i:i + 8]) for i in range(0, len(blob), 8)])
-            if self.reverse_unpack:
-                return y, x
-            else:
-                return x, y
-
-        except struct.error as e:
-            print('unpack_blob', e)
+        return unpack_xy(blob, endianness, self.reverse_unpack)
 
     def get_slope(self, n=-1):
         if self.xs.shape[0] and self.ys.shape[0] and self.xs.shape[0] == self.ys.shape[0]:
@@ -156,6 +223,10 @@ class IsotopicMeasurement(BaseMeasurement):
     _regressor = None
     _fit = None
 
+    use_fit_cache = True
+    _fit_version = 0
+    _fit_state = None
+
     _oerror = None
     _ovalue = None
 
@@ -179,6 +250,9 @@ class IsotopicMeasurement(BaseMeasurement):
     def fn(self, v):
         self._fn = v
 
+    def invalidate_fit(self):
+        self._fit_version += 1
+
     def set_filtering(self, d):
         self.filter_outliers_dict = d.copy()
 
@@ -353,6 +427,10 @@ class IsotopicMeasurement(BaseMeasurement):
 
     @property
     def regressor(self):
+        """
+            the regressor is only recalculated if the data, fit, error type, time zero offset, filtering or the
+            user/truncate exclusions of the regressor changed since the last calculation
+        """
         # print self.name, self.fit, self.__class__.__name__
         fit = self.fit
         if fit is None:
@@ -362,7 +440,7 @@ class IsotopicMeasurement(BaseMeasurement):
 
         is_mean = 'average' in fit.lower()
         reg = self._regressor
-        if reg is None:
+        if reg is None or (not is_mean and isinstance(reg, MeanRegressor)):
             if is_mean:
                 reg = self._mean_regressor_factory()
             else:
@@ -380,16 +458,37 @@ class IsotopicMeasurement(BaseMeasurement):
         elif is_mean and not isinstance(reg, MeanRegressor):
             reg = self._mean_regressor_factory()
 
+        key = self._fit_key(reg)
+        if self.use_fit_cache and reg is self._regressor and self._is_fit_current(key):
+            FIT_STATISTICS.cached += 1
+            return reg
+
         if not is_mean:
             reg.set_degree(fit_to_degree(fit), refresh=False)
         reg.filter_outliers_dict = self.filter_outliers_dict
 
         reg.trait_set(xs=self.offset_xs, ys=self.ys)
         reg.calculate()
+        FIT_STATISTICS.computed += 1
 
         self._regressor = reg
+        self._fit_state = (key, self.xs, self.ys)
         return reg
 
+    def _fit_key(self, reg):
+        fod = self.filter_outliers_dict or {}
+        return (self._fit_version, self.fit, self.error_type, self.time_zero_offset,
+                tuple(sorted(fod.items())),
+                tuple(reg.user_excluded), tuple(reg.truncate_excluded))
+
+    def _is_fit_current(self, key):
+        """
+            xs and ys are compared by identity. they are replaced, not modified, by set_data and append_data.
+            invalidate_fit must be called if they are modified in place
+        """
+        state = self._fit_state
+        return state is not None and state[1] is self.xs and state[2] is self.ys and state[0] == key
+
     # @cached_property
     @property
     def uvalue(self):
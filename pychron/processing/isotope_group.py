@@ -20,7 +20,6 @@ import logging
 import os
 from six.moves.configparser import ConfigParser
 
-from numpy import append as npappend
 from traits.api import Property, Dict, Str
 from traits.has_traits import HasTraits
 from uncertainties import ufloat
@@ -241,13 +240,7 @@ class IsotopeGroup(HasTraits):
             if kind == 'sniff':
                 isotope._value = signal
 
-            xs = npappend(isotope.xs, x)
-            ys = npappend(isotope.ys, signal)
-            isotope.xs = xs
-            isotope.ys = ys
-            # isotope.trait_setq(xs=xs, ys=ys)
-            # isotope.xs = hstack((isotope.xs, (x,)))
-            # isotope.ys = hstack((isotope.ys, (signal,)))
+            isotope.append_data(x, signal)
             isotope.dirty = True
 
         isotopes = self.isotopes
@@ -266,6 +259,15 @@ class IsotopeGroup(HasTraits):
                     _append(isotopes[i])
                     return True
 
+    def reserve(self, n, kind):
+        """
+            preallocate room for n points of kind for every isotope
+        """
+        for iso in self.itervalues():
+            if kind in ('sniff', 'baseline', 'whiff'):
+                iso = getattr(iso, kind)
+            iso.reserve(n)
+
     def clear_baselines(self):
         for k in self.isotopes:
             self.set_baseline(k, None, (0, 0))
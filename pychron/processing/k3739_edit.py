@@ -28,6 +28,7 @@ from uncertainties import ufloat
 from pychron.core.ui.progress_dialog import myProgressDialog
 from pychron.envisage.browser.adapters import AnalysisAdapter
 from pychron.paths import paths
+from pychron.processing.batch_age import update_ages
 # from pychron.processing.tasks.browser.panes import AnalysisAdapter
 from pychron.pychron_constants import PLUSMINUS_ONE_SIGMA
 
@@ -56,7 +57,8 @@ class K3739EditModel(HasTraits):
         for ai in ans:
             pd.change_message('Modifying k3739 for {}'.format(ai.record_id))
             ai.fixed_k3739 = v
-            ai.calculate_age(force=True)
+
+        update_ages(ans)
         pd.close()
 
         self.dump()
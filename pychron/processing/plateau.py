@@ -16,34 +16,26 @@
 
 # ============= enthought library imports =======================
 from __future__ import absolute_import
-from numpy import argmax, array
+from numpy import argmax, array, asarray, zeros, ones, where, triu, minimum, arange, cumsum, full, \
+    count_nonzero, nan
 from traits.api import HasTraits, List, Array
 
-from pychron.core.stats.core import validate_mswd, calculate_mswd
+from pychron.core.stats.core import validate_mswd, calculate_mswd, get_mswd_limits
 from six.moves import range
+from six.moves import zip
 
 
-def memoize(function):
-    cache = {}
-
-    def closure(*args):
-        # return function(*args)
-        if args not in cache:
-            cache[args] = function(*args)
-        return cache[args]
-
-    return closure
-
-
-class Log():
-    def debug(self, txt):
-        pass
-        # print 'debug --- {}'.format(txt)
-
-log = Log()
+class Plateau(HasTraits):
+    """
+        find the longest plateau of a step heating spectrum.
 
+        a plateau is a run of at least nsteps contiguous steps that contains at least gas_fraction percent
+        of the signal and whose ages either pairwise overlap at overlap_sigma (Fleck 1977) or have an
+        acceptable MSWD (Mahon 1996).
 
-class Plateau(HasTraits):
+        the search is vectorized. the pairwise overlap matrix, the cumulative signal and a running MSWD are
+        computed once per start step instead of re-checking every candidate window
+    """
     ages = Array
     errors = Array
     signals = Array
@@ -68,108 +60,104 @@ class Plateau(HasTraits):
             self.use_mswd = False
             self.use_overlap = True
 
-        n = len(self.ages)
-        excludes = self.excludes
-        ss = [s for i, s in enumerate(self.signals) if i not in excludes]
+        ages = asarray(self.ages, dtype=float)
+        errors = asarray(self.errors, dtype=float)
+        n = len(ages)
 
-        self.total_signal = float(sum(ss))
-        # log.info(self.total_signal)
+        excluded = zeros(n, dtype=bool)
+        for i in self.excludes:
+            if 0 <= i < n:
+                excluded[i] = True
 
-        idxs = []
-        spans = []
-
-        overlap_func = memoize(self._overlap)
-        for i in range(n):
-            if i in excludes:
-                continue
-            idx = self._find_plateaus(n, i, excludes, overlap_func)
-            if idx:
-                # log.debug('found {} {}'.format(*idx))
-                idxs.append(idx)
-                spans.append(idx[1] - idx[0])
+        signals = where(excluded, 0, self.signals)
+        self.total_signal = total = float(sum(signals))
 
-        if spans:
-            return idxs[argmax(array(spans))]
-
-        return idxs
-
-    def _find_plateaus(self, n, start, excludes, overlap_func):
-        potential_end = None
-        for i in range(start, n, 1):
-            if i in excludes:
-                continue
+        if self.use_overlap:
+            overlap_limits = self._overlap_limits(ages, errors)
+        else:
+            overlap_limits = full(n, n)
 
-            if not self.check_nsteps(start, i):
-                log.debug('{} {} nsteps failed'.format(start, i))
-                continue
+        if self.use_mswd:
+            mswd_limits = self._mswd_limits(n)
 
-            if self.use_overlap and not self.check_overlap(start, i, overlap_func):
-                log.debug('{} {} overlap failed'.format(start, i))
-                # potential_end=None
-                break
+        gas_fraction = self.gas_fraction / 100.
 
-            if self.use_mswd and not self.check_mswd(start, i):
+        idxs = []
+        spans = []
+        for start in range(n):
+            if excluded[start]:
                 continue
 
-            if not self.check_percent_released(start, i):
-                log.debug('{} {} percent failed'.format(start, i))
+            ends = arange(max(start, start + self.nsteps - 1), overlap_limits[start])
+            ends = ends[~excluded[ends]]
+            if not ends.shape[0]:
                 continue
 
-            potential_end = i
-
-        if potential_end:
-            return start, potential_end
+            released = cumsum(signals[start:])[ends - start]
+            valid = released / total >= gas_fraction
+            if self.use_mswd:
+                valid &= self._valid_mswds(ages, errors, start, ends, mswd_limits)
 
-    def check_percent_released(self, start, end):
-        ss = sum([(s if not i in self.excludes else 0)
-                  for i, s in enumerate(self.signals)][start:end + 1])
+            if valid.any():
+                end = ends[valid][-1]
+                if end:
+                    idxs.append((start, end))
+                    spans.append(end - start)
 
-        log.debug('percent {} {} {}'.format(start, end, ss / self.total_signal))
+        if spans:
+            return idxs[argmax(array(spans))]
 
-        return ss / self.total_signal >= self.gas_fraction/100.
+        return idxs
 
-    def check_mswd(self, start, end):
+    def _overlap_limits(self, ages, errors):
         """
-            return False if not valid
+            return array where the ith element is the first end index for which the steps i..end no longer all
+            pairwise overlap
         """
-        ages = self.ages[start, end + 1]
-        errors = self.errors[start, end + 1]
-        mswd = calculate_mswd(ages, errors)
-        return validate_mswd(mswd, len(ages))
-
-    def check_overlap(self, start, end, overlap_func):
-        overlap_sigma = self.overlap_sigma
-        for c, i in enumerate(range(start, end, 1)):
-            for j in range(start + c, end + 1, 1):
-                if i == j:
-                    continue
-
-                try:
-                    if not overlap_func(i, j, overlap_sigma):
-                        return
-                except BaseException as e:
-                    import traceback
-                    log.debug('Overlap exception: {}'.format(e, traceback.format_exc()))
-                    continue
-        else:
-            return True
+        n = ages.shape[0]
+        e = errors * self.overlap_sigma
+        lo = ages - e
+        hi = ages + e
 
-    def _overlap(self, start, end, overlap_sigma):
-        # log.debug('checking overlap {} {} '.format(start, end))
+        overlap = (lo[:, None] < hi[None, :]) & (hi[:, None] > lo[None, :])
+        bad = ~overlap & triu(ones((n, n), dtype=bool), k=1)
+        first_bad = where(bad.any(axis=1), bad.argmax(axis=1), n)
 
-        a1 = self.ages[start]
-        a2 = self.ages[end]
-        e1 = self.errors[start]
-        e2 = self.errors[end]
+        # a window start..end is valid if no step in it is incompatible with a later step in it
+        return minimum.accumulate(first_bad[::-1])[::-1]
 
-        e1 *= overlap_sigma
-        e2 *= overlap_sigma
+    def _mswd_limits(self, n):
+        lows, highs = full(n + 1, nan), full(n + 1, nan)
+        for i in range(2, n + 1):
+            lows[i], highs[i] = get_mswd_limits(i)
+        return lows, highs
 
-        # log.debug('{}<{} {}>{}'.format(a1 - e1 , a2 + e2, a1 + e1 , a2 - e2))
-        return a1 - e1 < a2 + e2 and a1 + e1 > a2 - e2
-
-    def check_nsteps(self, start, end):
-        return (end - start) + 1 >= self.nsteps
+    def _valid_mswds(self, ages, errors, start, ends, limits):
+        """
+            running MSWD of the windows start..end for each end in ends
+        """
+        a = ages[start:ends[-1] + 1]
+        e = errors[start:ends[-1] + 1]
+        k = ends - start
+        ns = k + 1
+
+        if count_nonzero(e) != e.shape[0]:
+            # zero errors. fall back to the direct calculation
+            mswds = array([calculate_mswd(a[:ki + 1], e[:ki + 1]) for ki in k])
+            return array([validate_mswd(m, ni) for m, ni in zip(mswds, ns)], dtype=bool)
+
+        x = a - a[0]
+        w = 1 / e ** 2
+        sw = cumsum(w)[k]
+        swx = cumsum(w * x)[k]
+        swxx = cumsum(w * x ** 2)[k]
+
+        mswds = zeros(k.shape[0])
+        m = ns >= 2
+        mswds[m] = (swxx[m] - swx[m] ** 2 / sw[m]) / (ns[m] - 1)
+
+        lows, highs = limits
+        return m & (lows[ns] <= mswds) & (mswds <= highs[ns])
 
 # ============= EOF =============================================
 
@@ -0,0 +1,156 @@
+from __future__ import absolute_import
+
+import unittest
+
+from numpy import allclose
+from uncertainties import ufloat, nominal_value, std_dev, covariance_matrix
+
+from pychron.globals import globalv
+from pychron.processing.arar_age import ArArAge
+from pychron.processing.batch_age import calculate_ages, recalculate_ages, update_ages
+from pychron.processing.isotope import Isotope
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+SIGNALS = (('Ar40', 100, 0.1), ('Ar39', 10, 0.05), ('Ar38', 0.2, 0.01), ('Ar37', 1, 0.02), ('Ar36', 0.05, 0.001))
+PRODUCTION = (('K4039', 0.01), ('K3839', 0.012), ('K3739', 0.0002), ('Ca3937', 0.0007),
+              ('Ca3637', 0.00027), ('Ca3837', 0.00001), ('Cl3638', 200))
+
+
+def make_analysis(i, k3739_mode='Normal', allow_negative_ca_correction=True, ar37=None, isotopes=SIGNALS):
+    a = ArArAge()
+    a.arar_constants.k3739_mode = k3739_mode
+    a.arar_constants.allow_negative_ca_correction = allow_negative_ca_correction
+
+    # shared ic factor to introduce correlations between the isotopes
+    ic = ufloat(1.01, 0.001, tag='IC')
+    for k, v, e in isotopes:
+        if k == 'Ar37' and ar37 is not None:
+            v = ar37
+        iso = Isotope(k, 'H1')
+        iso.set_uvalue((v * (1 + 0.01 * i), e))
+        iso.set_baseline(0.01, 0.001)
+        iso.set_blank(0.02, 0.002)
+        iso.ic_factor = ic
+        a.isotopes[k] = iso
+
+    a.j = ufloat(0.001, 1e-6, tag='j')
+    a.interference_corrections = {k: ufloat(v, v * 0.05, tag=k) for k, v in PRODUCTION}
+    a.production_ratios = {'Ca_K': 1.96, 'Cl_K': 0.25}
+    a.chron_segments = [(1, 10, 5)]
+    a.timestamp = 86400 * 30
+    return a
+
+
+class BatchAgeTestCase(unittest.TestCase):
+    def _compare(self, ans, bns):
+        for a, b in zip(ans, bns):
+            for attr in ('age', 'age_err', 'age_err_wo_j', 'F', 'F_err', 'F_err_wo_irrad'):
+                self.assertAlmostEqual(getattr(a, attr), getattr(b, attr), delta=abs(getattr(a, attr)) * 1e-10)
+
+            for attr in ('uage_w_j_err', 'uF', 'kca', 'kcl', 'rad40_percent'):
+                ua, ub = getattr(a, attr), getattr(b, attr)
+                self.assertAlmostEqual(nominal_value(ua), nominal_value(ub), delta=abs(nominal_value(ua)) * 1e-10)
+                self.assertAlmostEqual(std_dev(ua), std_dev(ub), delta=std_dev(ua) * 1e-10)
+
+            for k in ('Ar40', 'Ar39', 'Ar36'):
+                ia, ib = a.isotopes[k], b.isotopes[k]
+                self.assertAlmostEqual(ia.age_error_component, ib.age_error_component, places=8)
+                self.assertAlmostEqual(std_dev(ia.get_interference_corrected_value()),
+                                       std_dev(ib.get_interference_corrected_value()))
+
+            # correlations between the calculated values are preserved
+            ca = covariance_matrix([a.uage, a.kca, a.isotopes['Ar39'].get_interference_corrected_value()])
+            cb = covariance_matrix([b.uage, b.kca, b.isotopes['Ar39'].get_interference_corrected_value()])
+            self.assertTrue(allclose(ca, cb, rtol=1e-8, atol=0))
+
+    def _test(self, **kw):
+        ans = [make_analysis(i, **kw) for i in range(10)]
+        for a in ans:
+            a.calculate_age()
+
+        bns = [make_analysis(i, **kw) for i in range(10)]
+        self.assertEqual(calculate_ages(bns), [])
+        self._compare(ans, bns)
+
+    def test_normal(self):
+        self._test()
+
+    def test_fixed_k3739(self):
+        self._test(k3739_mode='Fixed')
+
+    def test_negative_ca(self):
+        self._test(allow_negative_ca_correction=False, ar37=0.01)
+
+    def test_calculate_f_only(self):
+        a = make_analysis(0)
+        a.calculate_F()
+        b = make_analysis(0)
+        calculate_ages([b], calculate_f_only=True)
+        self.assertAlmostEqual(a.F, b.F, delta=a.F * 1e-12)
+        self.assertAlmostEqual(std_dev(a.uF), b.F_err, delta=b.F_err * 1e-10)
+        self.assertIsNone(b.age)
+
+    def test_not_calculated(self):
+        a = make_analysis(0, isotopes=SIGNALS[:-1])
+        self.assertEqual(calculate_ages([a]), [a])
+
+    def test_recalculate_ages(self):
+        ans = [make_analysis(i) for i in range(5)]
+        bns = [make_analysis(i) for i in range(5)]
+        calculate_ages(ans)
+        calculate_ages(bns)
+
+        for a, b in zip(ans, bns):
+            a.j = b.j = ufloat(0.0011, 2e-6, tag='j')
+            a.recalculate_age()
+
+        self.assertEqual(recalculate_ages(bns), [])
+        self._compare(ans, bns)
+
+    def test_update_ages(self):
+        ans = [make_analysis(i) for i in range(5)]
+        bns = [make_analysis(i) for i in range(5)]
+        calculate_ages(ans)
+        calculate_ages(bns)
+
+        for a, b in zip(ans, bns):
+            for x in (a, b):
+                x.isotopes['Ar36'].set_blank(0.03, 0.003)
+            a.calculate_age(force=True)
+
+        age = bns[0].age
+        update_ages(bns)
+        self.assertNotAlmostEqual(age, bns[0].age)
+        self._compare(ans, bns)
+
+    def test_shared_covariance(self):
+        def make():
+            # analyses from the same irradiation position share J and the production ratios
+            j = ufloat(0.001, 1e-6, tag='j')
+            pr = {k: ufloat(v, v * 0.05, tag=k) for k, v in PRODUCTION}
+            ans = [make_analysis(i) for i in range(4)]
+            for a in ans:
+                a.j = j
+                a.interference_corrections = pr
+            return ans
+
+        ans = make()
+        for a in ans:
+            a.calculate_age()
+
+        bns = make()
+        self.assertEqual(calculate_ages(bns), [])
+
+        for attr in ('uage_w_j_err', 'uage', 'uF'):
+            ca = covariance_matrix([getattr(a, attr) for a in ans])
+            cb = covariance_matrix([getattr(b, attr) for b in bns])
+            self.assertTrue(allclose(ca, cb, rtol=1e-8, atol=0))
+
+        # the ages are correlated through J
+        self.assertTrue(covariance_matrix([b.uage_w_j_err for b in bns])[0][1] > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,10 @@ __author__ = 'ross'
 
 import unittest
 
-from numpy import linspace
+from numpy import linspace, array, arange
 
-from pychron.processing.isotope import Isotope
+from pychron.processing.isotope import Isotope, FIT_STATISTICS
+from pychron.processing.isotope_group import IsotopeGroup
 
 
 class IsotopeTestCase(unittest.TestCase):
@@ -39,5 +40,132 @@ class IsotopeTestCase(unittest.TestCase):
         # self.assertEqual(v, 99)
 
 
+
+class AppendDataTestCase(unittest.TestCase):
+    def test_append(self):
+        iso = Isotope('Ar40', 'H1')
+        for i in range(100):
+            iso.append_data(i, 2 * i)
+
+        self.assertEqual(iso.n, 100)
+        self.assertEqual(list(iso.xs), list(range(100)))
+        self.assertEqual(list(iso.ys), list(range(0, 200, 2)))
+
+    def test_reserve(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.reserve(50)
+        buf = iso._xbuf
+        for i in range(50):
+            iso.append_data(i, i)
+
+        self.assertIs(iso._xbuf, buf)
+        self.assertEqual(iso.xs.shape[0], 50)
+
+    def test_set_data_resets(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.append_data(0, 0)
+        iso.append_data(1, 1)
+
+        iso.set_data(array([5., 6., 7.]), array([1., 2., 3.]))
+        iso.append_data(8, 4)
+        self.assertEqual(list(iso.xs), [5, 6, 7, 8])
+        self.assertEqual(list(iso.ys), [1, 2, 3, 4])
+
+    def test_set_data_sequence(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.time_zero_offset = 1
+        iso.set_data([1, 2, 3], (4, 5, 6))
+        self.assertEqual(iso.xs.shape, (3,))
+        self.assertEqual(list(iso.offset_xs), [0, 1, 2])
+
+        iso.append_data(4, 7)
+        self.assertEqual(list(iso.ys), [4, 5, 6, 7])
+
+    def test_set_data_no_copy(self):
+        iso = Isotope('Ar40', 'H1')
+        xs, ys = array([1., 2.]), array([3., 4.])
+        iso.set_data(xs, ys)
+        self.assertIs(iso.xs, xs)
+        self.assertIs(iso.ys, ys)
+
+    def test_group_append(self):
+        ig = IsotopeGroup()
+        ig.isotopes['Ar40'] = Isotope('Ar40', 'H1')
+        ig.isotopes['Ar36'] = Isotope('Ar36', 'CDD')
+        ig.reserve(10, 'baseline')
+
+        for x in arange(10):
+            self.assertTrue(ig.append_data('Ar40', 'H1', x, 1.0, 'signal'))
+            self.assertTrue(ig.append_data(None, 'CDD', x, 0.1, 'baseline'))
+
+        self.assertEqual(ig.isotopes['Ar40'].n, 10)
+        self.assertEqual(ig.isotopes['Ar36'].baseline.n, 10)
+        self.assertEqual(ig.isotopes['Ar36'].n, 0)
+
+
+class FitCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.iso = iso = Isotope('Ar40', 'H1')
+        xs = linspace(10, 410, 100)
+        iso.set_data(xs, 1000 - 2 * xs)
+        iso.fit = 'linear'
+        FIT_STATISTICS.reset()
+
+    def test_cached(self):
+        iso = self.iso
+        v = iso.value
+        iso.error
+        iso.uvalue
+        iso.noutliers()
+        self.assertAlmostEqual(v, 1000)
+        self.assertEqual(FIT_STATISTICS.computed, 1)
+        self.assertEqual(FIT_STATISTICS.cached, 5)
+
+    def test_fit_changed(self):
+        iso = self.iso
+        iso.value
+        iso.fit = 'parabolic'
+        iso.value
+        iso.fit = 'average'
+        self.assertAlmostEqual(iso.value, iso.ys.mean())
+        self.assertEqual(FIT_STATISTICS.computed, 3)
+
+    def test_filtering_changed(self):
+        iso = self.iso
+        iso.value
+        iso.set_filter_outliers_dict(filter_outliers=True, iterations=1, std_devs=2)
+        iso.value
+        iso.value
+        self.assertEqual(FIT_STATISTICS.computed, 2)
+
+    def test_data_changed(self):
+        iso = self.iso
+        iso.value
+        iso.append_data(420, 160)
+        iso.value
+        self.assertEqual(FIT_STATISTICS.computed, 2)
+
+        iso.ys[0] = 0
+        iso.invalidate_fit()
+        iso.value
+        self.assertEqual(FIT_STATISTICS.computed, 3)
+
+    def test_user_excluded(self):
+        iso = self.iso
+        iso.ys[:5] = 0
+        v = iso.value
+        iso.regressor.user_excluded = [0, 1, 2, 3, 4]
+        self.assertAlmostEqual(iso.value, 1000)
+        self.assertNotAlmostEqual(v, 1000)
+        self.assertEqual(FIT_STATISTICS.computed, 2)
+
+    def test_disabled(self):
+        iso = self.iso
+        iso.use_fit_cache = False
+        iso.value
+        iso.value
+        self.assertEqual(FIT_STATISTICS.computed, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
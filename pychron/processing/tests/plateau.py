@@ -117,5 +117,110 @@ class PlateauTestCase(unittest.TestCase):
         return ages, errors, signals, exclude, idx
 
 
+def reference_find_plateaus(ages, errors, signals, excludes=None, nsteps=3, overlap_sigma=2, gas_fraction=50,
+                            method=''):
+    """
+        brute force implementation the vectorized Plateau.find_plateaus is checked against
+    """
+    from pychron.core.stats.core import validate_mswd, calculate_mswd
+
+    if excludes is None:
+        excludes = []
+
+    use_mswd = method.lower() == 'mahon 1996'
+    n = len(ages)
+    total_signal = float(sum([s for i, s in enumerate(signals) if i not in excludes]))
+
+    def overlap(i, j):
+        e1 = errors[i] * overlap_sigma
+        e2 = errors[j] * overlap_sigma
+        return ages[i] - e1 < ages[j] + e2 and ages[i] + e1 > ages[j] - e2
+
+    def check_overlap(start, end):
+        for i in range(start, end):
+            for j in range(i + 1, end + 1):
+                if not overlap(i, j):
+                    return False
+        return True
+
+    def check_percent_released(start, end):
+        ss = sum([(s if i not in excludes else 0) for i, s in enumerate(signals)][start:end + 1])
+        return ss / total_signal >= gas_fraction / 100.
+
+    def check_mswd(start, end):
+        a = ages[start:end + 1]
+        e = errors[start:end + 1]
+        return validate_mswd(calculate_mswd(a, e), len(a))
+
+    idxs = []
+    spans = []
+    for start in range(n):
+        if start in excludes:
+            continue
+
+        potential_end = None
+        for end in range(start, n):
+            if end in excludes:
+                continue
+            if (end - start) + 1 < nsteps:
+                continue
+            if not use_mswd and not check_overlap(start, end):
+                break
+            if use_mswd and not check_mswd(start, end):
+                continue
+            if not check_percent_released(start, end):
+                continue
+            potential_end = end
+
+        if potential_end:
+            idxs.append((start, potential_end))
+            spans.append(potential_end - start)
+
+    if spans:
+        return idxs[spans.index(max(spans))]
+    return idxs
+
+
+class PlateauRegressionTestCase(unittest.TestCase):
+    """
+        compare Plateau.find_plateaus to the brute force implementation over a corpus of random spectra
+    """
+
+    def _make_spectrum(self, rng, n):
+        from numpy import ones
+        age = rng.uniform(1, 500)
+        ages = age + rng.normal(0, age * 0.01, n)
+        # add some discordant steps
+        for i in rng.choice(n, rng.randint(0, max(1, n // 4)), replace=False):
+            ages[i] += rng.normal(0, age * 0.1)
+        errors = age * rng.uniform(0.001, 0.02, n)
+        signals = rng.uniform(0, 10, n) * ones(n)
+        excludes = sorted(rng.choice(n, rng.randint(0, 3), replace=False).tolist())
+        return ages, errors, signals, excludes
+
+    def _compare(self, method, nspectra, nmin, nmax):
+        from numpy.random import RandomState
+        rng = RandomState(123456)
+        for _ in range(nspectra):
+            n = rng.randint(nmin, nmax)
+            ages, errors, signals, excludes = self._make_spectrum(rng, n)
+            kw = dict(nsteps=rng.randint(2, 6),
+                      overlap_sigma=rng.choice((1, 2)),
+                      gas_fraction=rng.choice((30, 50, 60)))
+
+            p = Plateau(ages=ages, errors=errors, signals=signals, excludes=excludes, **kw)
+            pidx = p.find_plateaus(method)
+            ridx = reference_find_plateaus(ages, errors, signals, excludes, method=method, **kw)
+            if pidx:
+                pidx = tuple(int(i) for i in pidx)
+            self.assertEqual(pidx, ridx)
+
+    def test_fleck(self):
+        self._compare('fleck 1977', 300, 3, 60)
+
+    def test_mahon(self):
+        self._compare('mahon 1996', 20, 3, 20)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -17,7 +17,6 @@
 # ============= enthought library imports =======================
 from __future__ import absolute_import
 from __future__ import print_function
-import inspect
 import re
 import time
 from threading import Event
@@ -32,7 +31,7 @@ from pychron.hardware.core.exceptions import TimeoutError
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.lasers.laser_managers.ilaser_manager import ILaserManager
 from pychron.pychron_constants import EXTRACTION_COLOR, LINE_STR, NULL_STR
-from pychron.pyscripts.pyscript import verbose_skip, makeRegistry, calculate_duration
+from pychron.pyscripts.pyscript import verbose_skip, makeRegistry, calculate_duration, getargspec
 from pychron.pyscripts.valve_pyscript import ValvePyScript, ELPROTOCOL
 
 COMPRE = re.compile(r'[A-Za-z]*')
@@ -381,7 +380,7 @@ class ExtractionPyScript(ValvePyScript):
             func = self._make_waitfor_func(*func_or_tuple)
         else:
             func = func_or_tuple
-            args = inspect.getargspec(func).args
+            args = getargspec(func).args
             if len(args) == 1:
                 include_time = True
             elif len(args) == 2:
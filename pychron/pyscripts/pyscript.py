@@ -18,7 +18,6 @@
 from __future__ import absolute_import
 from __future__ import print_function
 import hashlib
-import inspect
 import os
 import sys
 import time
@@ -34,6 +33,12 @@ from pychron.loggable import Loggable
 from pychron.paths import paths
 from pychron.pyscripts.error import PyscriptError, IntervalError, GosubError, \
     KlassError, MainError
+from pychron.pyscripts.script_cache import SCRIPT_CACHE, context_key, text_hash
+
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
 
 BLOCK_LOCK = Lock()
 
@@ -73,7 +78,7 @@ def verbose_skip(func):
             if fname.startswith('_m_'):
                 fname = fname[3:]
 
-            args1, _, _, defaults = inspect.getargspec(func)
+            args1, _, _, defaults = getargspec(func)[:4]
 
             nd = sum([1 for di in defaults if di is not None]) if defaults else 0
 
@@ -120,7 +125,7 @@ def count_verbose_skip(func):
         if fname.startswith('_m_'):
             fname = fname[3:]
 
-        args1, _, _, defaults = inspect.getargspec(func)
+        args1, _, _, defaults = getargspec(func)[:4]
 
         nd = sum([1 for di in defaults if di is not None]) if defaults else 0
 
@@ -184,6 +189,8 @@ class PyScript(Loggable):
     testing_syntax = Bool(False)
     cancel_flag = Bool
     hash_key = None
+    # reuse compiled code and syntax check results from SCRIPT_CACHE
+    use_script_cache = True
 
     _ctx = None
     _exp_obj = None
@@ -198,6 +205,7 @@ class PyScript(Loggable):
     _truncate = False
 
     _syntax_error = None
+    _dependencies = None
     _gosub_script = None
     _wait_control = None
 
@@ -291,27 +299,34 @@ class PyScript(Loggable):
         if not self.syntax_checked:
             self.setup_context()
 
+            key = self._make_cache_key(argv)
+            if key:
+                result = SCRIPT_CACHE.get_result(key)
+                if result is not None:
+                    self.debug('using cached syntax check. {}'.format(SCRIPT_CACHE.stats()))
+                    self._add_dependencies(result.dependencies)
+                    self._estimated_duration = result.duration
+                    self.syntax_checked = True
+                    self._syntax_error = True
+                    self._test_finished(result.error)
+                    return
+
             self.debug('testing...')
             self._estimated_duration = 0
             self.syntax_checked = True
             self.testing_syntax = True
             self._syntax_error = True
+            self._dependencies = []
 
             r = self._execute(argv=argv)
-            if r is not None:
-                self.console_info('invalid syntax')
-                ee = PyscriptError(self.filename, r)
-                print('invalid pyscript', self.text)
-                print('error', r)
-                raise ee
-
-            elif not self._interval_stack.empty():
-                raise IntervalError()
+            if r is None and not self._interval_stack.empty():
+                r = IntervalError()
 
-            else:
-                self.console_info('syntax checking passed')
-                self._syntax_error = False
+            if key:
+                SCRIPT_CACHE.set_result(key, r, self._estimated_duration, self._dependencies)
+            self._dependencies = None
 
+            self._test_finished(r)
             self.testing_syntax = False
 
     def execute_snippet(self, snippet=None, trace=False, argv=None):
@@ -342,7 +357,10 @@ class PyScript(Loggable):
         else:
 
             try:
-                code = compile(snippet, '<string>', 'exec')
+                if self.use_script_cache:
+                    code = SCRIPT_CACHE.compile(snippet)
+                else:
+                    code = compile(snippet, '<string>', 'exec')
             except BaseException as e:
                 self.debug(traceback.format_exc())
                 return e
@@ -485,8 +503,14 @@ class PyScript(Loggable):
         self._interval_stack = LifoQueue()
 
         if self.root and self.name and load:
-            with open(self.filename, 'r') as f:
-                self.text = f.read()
+            if self.use_script_cache:
+                self.text = SCRIPT_CACHE.read(self.filename)
+            else:
+                with open(self.filename, 'r') as f:
+                    self.text = f.read()
+
+            if self.parent_script is not None:
+                self.parent_script._add_dependencies((self.filename,))
 
             return True
 
@@ -739,6 +763,52 @@ class PyScript(Loggable):
             self.console_info('{} completed successfully'.format(self.name))
             self._completed = True
 
+    def _test_finished(self, r):
+        if r is None:
+            self.console_info('syntax checking passed')
+            self._syntax_error = False
+
+        elif isinstance(r, IntervalError):
+            raise r
+
+        else:
+            self.console_info('invalid syntax')
+            ee = PyscriptError(self.filename, r)
+            print('invalid pyscript', self.text)
+            print('error', r)
+            raise ee
+
+    def _make_cache_key(self, argv=None):
+        """
+            key a syntax check by script class, text, root (gosub paths are relative to it), context,
+            variables, interpolation context, argv and the set of available commands
+        """
+        if not self.use_script_cache or not self.text:
+            return
+
+        variables = {v: getattr(self, v) for v in self.get_variables()}
+        cmds = sorted(repr(c) if isinstance(c, tuple) else c for c in self.get_commands())
+
+        sha1 = hashlib.sha1()
+        for v in (self.__class__.__module__, self.__class__.__name__, self.root, text_hash(self.text),
+                  context_key(self._ctx or {}, variables, self._get_interpolation_context() or {}),
+                  repr(argv)):
+            sha1.update(str(v).encode('utf-8'))
+
+        for c in cmds:
+            sha1.update(c.encode('utf-8'))
+
+        return sha1.hexdigest()
+
+    def _add_dependencies(self, ps):
+        """
+            record scripts loaded while testing syntax so a cached result is dropped if one of them changes
+        """
+        if self._dependencies is not None:
+            self._dependencies.extend(ps)
+        if self.parent_script is not None:
+            self.parent_script._add_dependencies(ps)
+
     def _get_application(self):
         app = self.application
         if app is None:
@@ -0,0 +1,165 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+
+import six
+
+# ============= local library imports  ==========================
+
+PRIMITIVES = (six.string_types, six.integer_types, float, bool, type(None), list, tuple, dict)
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8') if isinstance(text, six.text_type) else text).hexdigest()
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime, st.st_size
+    except OSError:
+        return
+
+
+def context_key(*ctxs):
+    """
+        return a hash of the values in the context dictionaries. non primitive values, e.g. EXPObject or
+        MeasurementCTXObject, are derived from the other values or the script text and only contribute their type
+    """
+    sha1 = hashlib.sha1()
+    for ctx in ctxs:
+        for k in sorted(ctx):
+            v = ctx[k]
+            v = repr(v) if isinstance(v, PRIMITIVES) else type(v).__name__
+            sha1.update('{}={};'.format(k, v).encode('utf-8'))
+        sha1.update(b'|')
+    return sha1.hexdigest()
+
+
+class TestResult(object):
+    """
+        outcome of a syntax check. error is None if the check passed. dependencies is a dict of path: signature
+        for every script loaded with gosub during the check
+    """
+
+    def __init__(self, error, duration, dependencies):
+        self.error = error
+        self.duration = duration
+        self.dependencies = dependencies
+
+
+class PyScriptCache(object):
+    """
+        process wide cache of pyscript text, compiled code objects and syntax check results.
+
+        - text is keyed by path and reread only if the (mtime, size) of the file changed
+        - code objects are keyed by the sha1 of the text
+        - syntax check results are keyed by the caller, see PyScript._make_cache_key. a result is dropped if any
+          script it gosub'd changed on disk
+    """
+
+    def __init__(self, max_size=500):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._texts = {}
+        self._code = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+    def read(self, path):
+        sig = file_signature(path)
+        with self._lock:
+            entry = self._texts.get(path)
+            if entry is not None and sig is not None and entry[0] == sig:
+                return entry[1]
+
+        with open(path, 'r') as rfile:
+            text = rfile.read()
+
+        with self._lock:
+            self._texts[path] = (sig, text)
+        return text
+
+    def compile(self, text, filename='<string>'):
+        """
+            return a code object for text. SyntaxErrors are not cached
+        """
+        key = (text_hash(text), filename)
+        with self._lock:
+            code = self._code.get(key)
+            if code is not None:
+                self._touch(self._code, key, code)
+                return code
+
+        code = compile(text, filename, 'exec')
+        with self._lock:
+            self._add(self._code, key, code)
+        return code
+
+    def get_result(self, key):
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                if all(file_signature(p) == sig for p, sig in result.dependencies.items()):
+                    self.hits += 1
+                    self._touch(self._results, key, result)
+                    return result
+
+                del self._results[key]
+
+            self.misses += 1
+
+    def set_result(self, key, error, duration, dependencies=None):
+        deps = {p: file_signature(p) for p in dependencies} if dependencies else {}
+        result = TestResult(error, duration, deps)
+        with self._lock:
+            self._add(self._results, key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._texts.clear()
+            self._code.clear()
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return 'code={}, results={}, hits={}, misses={}'.format(len(self._code), len(self._results),
+                                                               self.hits, self.misses)
+
+    def _touch(self, d, key, value):
+        del d[key]
+        d[key] = value
+
+    def _add(self, d, key, value):
+        d.pop(key, None)
+        d[key] = value
+        while len(d) > self.max_size:
+            d.popitem(last=False)
+
+
+SCRIPT_CACHE = PyScriptCache()
+
+# ============= EOF =============================================
@@ -0,0 +1,110 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+from pychron.pyscripts.error import PyscriptError
+from pychron.pyscripts.extraction_line_pyscript import ExtractionPyScript
+from pychron.pyscripts.pyscript import command_register
+from pychron.pyscripts.script_cache import SCRIPT_CACHE
+
+MAIN = '''
+def main():
+    sleep(duration)
+    gosub('sub')
+'''
+
+SUB = '''
+def main():
+    sleep(5)
+'''
+
+
+class ScriptCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        SCRIPT_CACHE.clear()
+        self._root = tempfile.mkdtemp()
+        self._write('main.py', MAIN)
+        self._write('sub.py', SUB)
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+        SCRIPT_CACHE.clear()
+
+    def _write(self, name, txt):
+        with open(os.path.join(self._root, name), 'w') as wfile:
+            wfile.write(txt)
+
+    def _script(self, duration=2, text=None):
+        s = ExtractionPyScript(root=self._root, name='main.py')
+        s.bootstrap()
+        if text is not None:
+            s.text = text
+        s.setup_context(analysis_type='unknown', duration=duration)
+        return s
+
+    def _test(self, **kw):
+        s = self._script(**kw)
+        s.test()
+        return s.get_estimated_duration()
+
+    def test_reuse(self):
+        d = self._test()
+        self.assertEqual(SCRIPT_CACHE.misses, 2)
+        self.assertEqual(SCRIPT_CACHE.hits, 0)
+
+        self.assertEqual(self._test(), d)
+        self.assertEqual(SCRIPT_CACHE.misses, 2)
+        self.assertEqual(SCRIPT_CACHE.hits, 1)
+
+    def test_context(self):
+        d = self._test(duration=2)
+        self.assertNotEqual(self._test(duration=3), d)
+        self.assertEqual(SCRIPT_CACHE.hits, 0)
+        self.assertEqual(self._test(duration=2), d)
+        self.assertEqual(SCRIPT_CACHE.hits, 1)
+
+    def test_file_changed(self):
+        d = self._test()
+        self._write('main.py', MAIN.replace('sleep(duration)', 'sleep(duration + 10)'))
+        s = self._script()
+        self.assertIn('duration + 10', s.text)
+        s.test()
+        self.assertGreater(s.get_estimated_duration(), d)
+
+    def test_gosub_changed(self):
+        d = self._test()
+        self._write('sub.py', SUB.replace('5', '500'))
+        self.assertGreater(self._test(), d)
+
+    def test_commands_changed(self):
+        self._test()
+        command_register.commands['_script_cache_test'] = 'sleep'
+        try:
+            self._test()
+        finally:
+            command_register.commands.pop('_script_cache_test')
+
+        self.assertEqual(SCRIPT_CACHE.hits, 0)
+        self._test()
+        self.assertEqual(SCRIPT_CACHE.hits, 1)
+
+    def test_syntax_error(self):
+        text = 'def main():\n    sleep(\n'
+        for i in range(2):
+            s = self._script(text=text)
+            self.assertRaises(PyscriptError, s.test)
+
+        self.assertEqual(SCRIPT_CACHE.hits, 1)
+        self.assertFalse(self._script(text=text).syntax_ok(warn=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
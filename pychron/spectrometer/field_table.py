@@ -22,7 +22,7 @@ import hashlib
 import os
 import shutil
 
-from numpy import asarray, array, nonzero, polyval
+from numpy import asarray, array, nonzero, polyval, full, nan, abs as nabs, argmin, isnan
 from scipy.optimize import leastsq, brentq
 from traits.api import HasTraits, List, Str, Dict, Bool, Property, Event
 
@@ -86,6 +86,9 @@ class FieldTable(Loggable):
         self._mftable = None
         self._detectors = None
         self._test_path = None
+        self._discrete = None
+        self._mftable_hash = None
+        self._mftable_signature = None
 
         if bind:
             self.bind_preferences()
@@ -153,11 +156,27 @@ class FieldTable(Loggable):
 
         return dac
 
+    def map_masses_to_dac(self, masses, detname):
+        """
+            vectorized map_mass_to_dac. masses is a sequence of masses and/or isotope names.
+
+            return an array of dacs. for a discrete mftable masses without a dac are nan
+        """
+        mws = self.molweights
+        masses = array([mws[m] if isinstance(m, (str, six.text_type)) else m for m in masses], dtype=float)
+
+        detname = get_detector_name(detname)
+        d = self._get_mftable()
+        if self.polynominal_mass_func:
+            return polyval(d[detname][3], masses)
+        else:
+            return self._discrete_dacs(detname, masses)
+
     def get_dac(self, det, mass):
         det = get_detector_name(det)
-        d = self._get_mftable()
-        dac = next((d for i, m, d in zip(*d[det][:3]) if abs(m - mass) < 0.15), None)
-        return dac
+        self._get_mftable()
+        dac = self._discrete_dacs(det, [mass])[0]
+        return None if isnan(dac) else dac
 
         # isotope = next((i for i, m in self.molweights.iteritems() if abs(m-mass)<1e-5), None)
         # if isotope is not None:
@@ -207,6 +226,7 @@ class FieldTable(Loggable):
                     p = None
                 d[k] = isoks, mws, ndacs, p
 
+            self._set_mftable(d)
             if save:
                 self.dump(isos, d, message)
 
@@ -313,7 +333,7 @@ class FieldTable(Loggable):
         self._set_mftable_hash(path)
         items = []
 
-        with open(path, 'U') as f:
+        with open(path, 'r') as f:
             reader = csv.reader(f)
             table = []
 
@@ -380,11 +400,40 @@ class FieldTable(Loggable):
 
                 d[k] = (isos, mws, ys, c)
 
-            self._mftable = d
+            self._set_mftable(d)
             # self._mftable={k: (isos, mws, table[2 + i], )
             # for i, k in enumerate(detectors)}
             self._detectors = detectors
 
+    def _set_mftable(self, d):
+        """
+            set the table and precompute the mass and dac arrays used for discrete mapping
+        """
+        discrete = {}
+        for k, (_, mws, dacs, _) in six.iteritems(d):
+            if any(di != NULL_STR for di in dacs):
+                xs, ys = self._clean_dacs(mws, dacs)
+                discrete[k] = (array(xs, dtype=float), array(ys, dtype=float))
+            else:
+                discrete[k] = (array([]), array([]))
+
+        self._mftable = d
+        self._discrete = discrete
+
+    def _discrete_dacs(self, det, masses, tol=0.15):
+        """
+            return the dac of the closest mass within tol for each of masses, otherwise nan
+        """
+        masses = asarray(masses, dtype=float)
+        xs, ys = self._discrete[det]
+        dacs = full(masses.shape, nan)
+        if xs.shape[0]:
+            ds = nabs(masses[:, None] - xs)
+            idx = argmin(ds, axis=1)
+            mask = ds[range(masses.shape[0]), idx] < tol
+            dacs[mask] = ys[idx[mask]]
+        return dacs
+
     def _clean_dacs(self, xx, dacs):
         """
         return xs, clean_dacs
@@ -416,7 +465,7 @@ class FieldTable(Loggable):
         self.debug('================================')
 
     def _get_mftable(self):
-        if not self._mftable or not self._check_mftable_hash():
+        if not self._mftable or self._check_mftable_hash():
             self.debug('using mftable at {}'.format(self.path))
             self.load_table()
 
@@ -425,16 +474,35 @@ class FieldTable(Loggable):
     def _check_mftable_hash(self):
         """
             return True if mftable externally modified
+
+            the file is only hashed if its mtime or size changed since it was last loaded or saved
         """
-        # p = paths.mftable
-        current_hash = self._make_hash(self.path)
-        return self._mftable_hash != current_hash
+        p = self.path
+        sig = self._make_signature(p)
+        if sig == self._mftable_signature:
+            return False
+
+        current_hash = self._make_hash(p)
+        if current_hash == self._mftable_hash:
+            # touched but not modified
+            self._mftable_signature = sig
+            return False
+
+        return True
+
+    def _make_signature(self, p):
+        try:
+            st = os.stat(p)
+            return st.st_mtime, st.st_size
+        except OSError:
+            return
 
     def _make_hash(self, p):
         with open(p, 'rb') as rfile:
-            return hashlib.md5(rfile.read())
+            return hashlib.md5(rfile.read()).hexdigest()
 
     def _set_mftable_hash(self, p):
+        self._mftable_signature = self._make_signature(p)
         self._mftable_hash = self._make_hash(p)
 
     def _add_to_archive(self, p, message):
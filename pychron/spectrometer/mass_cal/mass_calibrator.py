@@ -25,8 +25,8 @@ from numpy import array, hstack, Inf, savetxt
 import csv
 import os
 from threading import Thread
-import struct
 # ============= local library imports  ==========================
+from pychron.core.helpers.binpack import pack
 from pychron.core.helpers.filetools import unique_path
 from pychron.core.helpers.isotope_utils import sort_isotopes
 from pychron.paths import paths
@@ -119,9 +119,7 @@ class MassCalibratorSweep(MagnetSweep):
                     self._apply_calibration()
 
     def _pack(self, d):
-        data = ''.join([struct.pack('>ff', x, y)
-                        for x, y in d])
-        return data
+        return pack('>ff', d)
 
     def _save_to_db(self):
         db = self.db
@@ -1,9 +1,25 @@
 from __future__ import absolute_import
 import os
+import shutil
+import tempfile
 import unittest
 
+from numpy import allclose, isnan
+
+from pychron.globals import globalv
 from pychron.spectrometer.field_table import FieldTable
 
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+PARABOLIC = '''parabolic
+iso,H1,AX
+Ar40,5.8955,6.0067
+Ar39,5.7882,5.8969
+Ar38,5.6788,5.7861
+Ar36,5.4562,5.5607
+'''
+
 
 class Argon2CDDMFTableTestCase(unittest.TestCase):
     def setUp(self):
@@ -76,5 +92,68 @@ class MFTableTestCase(unittest.TestCase):
         self.assertNotEqual(dac, 5.8955)
 
 
+class MFTableChangeDetectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.path = p = os.path.join(self._root, 'mftable.csv')
+        with open(p, 'w') as wfile:
+            wfile.write(PARABOLIC)
+
+        self.mftable = mft = FieldTable(bind=False)
+        mft.molweights = {'Ar40': 39.962, 'Ar39': 38.964, 'Ar38': 37.963, 'Ar36': 35.967}
+        mft._test_path = p
+        mft.load_table()
+
+        self.nloads = 0
+        load_table = mft.load_table
+
+        def counting_load_table(*args, **kw):
+            self.nloads += 1
+            return load_table(*args, **kw)
+
+        mft.load_table = counting_load_table
+
+    def tearDown(self):
+        shutil.rmtree(self._root)
+
+    def test_no_reload(self):
+        for i in range(10):
+            self.mftable.map_mass_to_dac('Ar40', 'H1')
+        self.assertEqual(self.nloads, 0)
+
+    def test_touched(self):
+        st = os.stat(self.path)
+        os.utime(self.path, (st.st_atime, st.st_mtime + 10))
+        self.mftable.map_mass_to_dac('Ar40', 'H1')
+        self.mftable.map_mass_to_dac('Ar40', 'H1')
+        self.assertEqual(self.nloads, 0)
+
+    def test_modified(self):
+        dac = self.mftable.map_mass_to_dac('Ar40', 'H1')
+        with open(self.path, 'w') as wfile:
+            wfile.write(PARABOLIC.replace('5.8955', '5.9955'))
+        st = os.stat(self.path)
+        os.utime(self.path, (st.st_atime, st.st_mtime + 10))
+
+        ndac = self.mftable.map_mass_to_dac('Ar40', 'H1')
+        self.assertEqual(self.nloads, 1)
+        self.assertNotAlmostEqual(dac, ndac, places=3)
+
+    def test_map_masses_to_dac(self):
+        mft = self.mftable
+        masses = ['Ar40', 39.5, 'Ar36', 37.963]
+        dacs = mft.map_masses_to_dac(masses, 'AX')
+        self.assertTrue(allclose(dacs, [mft.map_mass_to_dac(m, 'AX') for m in masses]))
+
+    def test_map_masses_to_dac_discrete(self):
+        mft = self.mftable
+        mft.mass_cal_func = 'discrete'
+        dacs = mft.map_masses_to_dac(['Ar40', 39.0, 37.5], 'H1')
+        self.assertEqual(list(dacs[:2]), [5.8955, 5.7882])
+        self.assertTrue(isnan(dacs[2]))
+        self.assertEqual(mft.get_dac('H1', 35.967), 5.4562)
+        self.assertIsNone(mft.get_dac('H1', 37.5))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -21,7 +21,7 @@ def suite():
 
     from pychron.experiment.tests.peak_hop_parse import PeakHopYamlCase1
     from pychron.experiment.tests.peak_hop_parse import PeakHopYamlCase2
-    from pychron.spectrometer.tests.mftable import MFTableTestCase, DiscreteMFTableTestCase
+    from pychron.spectrometer.tests.mftable import MFTableTestCase, DiscreteMFTableTestCase, MFTableChangeDetectionTestCase
     from pychron.data_mapper.tests.usgs_vsc_file_source import USGSVSCFileSourceUnittest, USGSVSCIrradiationSourceUnittest
     from pychron.data_mapper.tests.nu_file_source import NuFileSourceUnittest
     from pychron.data_mapper.tests.nmgrl_legacy_source import NMGRLLegacySourceUnittest
@@ -49,13 +49,35 @@ def suite():
     from pychron.experiment.tests.renumber_aliquot_test import RenumberAliquotTestCase
 
     from pychron.external_pipette.tests.external_pipette import ExternalPipetteTestCase
-    from pychron.processing.tests.plateau import PlateauTestCase
+    from pychron.processing.tests.plateau import PlateauTestCase, PlateauRegressionTestCase
     from pychron.processing.tests.ratio import RatioTestCase
     from pychron.pyscripts.tests.extraction_script import WaitForTestCase
     from pychron.pyscripts.tests.measurement_pyscript import InterpolationTestCase, DocstrContextTestCase
-    from pychron.experiment.tests.conditionals import ConditionalsTestCase, ParseConditionalsTestCase
+    from pychron.experiment.tests.conditionals import ConditionalsTestCase, ParseConditionalsTestCase, CompiledConditionalTestCase
     from pychron.experiment.tests.identifier import IdentifierTestCase
     from pychron.experiment.tests.comment_template import CommentTemplaterTestCase
+    from pychron.dvc.tests.analysis_cache import AnalysisCacheTestCase
+    from pychron.core.helpers.tests.binpack import BinpackTestCase
+    from pychron.dvc.tests.data_sidecar import DataSidecarTestCase
+    from pychron.dvc.tests.meta_cache import MetaCacheTestCase
+    from pychron.core.stats.tests.monte_carlo_test import MonteCarloTestCase
+    from pychron.core.stats.tests.probability_curves_test import CumulativeProbabilityTestCase
+    from pychron.processing.tests.isotope import AppendDataTestCase, FitCacheTestCase
+    from pychron.experiment.tests.data_writer_test import H5DataWriterTestCase
+    from pychron.dvc.tests.repository_sync import RepositorySyncTestCase, DVCSyncRepositoriesTestCase
+    from pychron.dvc.tests.record_view_query import RecordViewQueryTestCase
+    from pychron.database.tests.database_adapter import DatabaseAdapterTestCase
+    from pychron.processing.tests.batch_age import BatchAgeTestCase
+    from pychron.hardware.tests.ethernet_communicator import EthernetCommunicatorTestCase, LatencyHistogramTestCase
+    from pychron.dvc.tests.publish_outbox import PublishOutboxTestCase
+    from pychron.pyscripts.tests.script_cache import ScriptCacheTestCase
+    from pychron.dashboard.tests.scheduler import PollSchedulerTestCase
+    from pychron.labspy.tests.measurement_buffer import MeasurementBufferTestCase, AddMeasurementsTestCase
+    from pychron.hardware.tests.scan_recorder import ScanRecorderTestCase, CSVScanWriterTestCase
+    from pychron.core.tests.progress import ProgressLoaderTestCase
+    from pychron.envisage.tests.device_bringup import DeviceBringupTestCase
+    from pychron.dvc.tests.dvc_persister import DVCPersisterInitializeTestCase
+    from pychron.mv.tests.window_sweep import WindowSweepTestCase
 
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -108,7 +130,37 @@ def suite():
              IdentifierTestCase,
              CommentTemplaterTestCase,
              FloatfmtTestCase,
-             CamelCaseTestCase)
+             CamelCaseTestCase,
+             PlateauRegressionTestCase,
+             AnalysisCacheTestCase,
+             BinpackTestCase,
+             DataSidecarTestCase,
+             MetaCacheTestCase,
+             MonteCarloTestCase,
+             CumulativeProbabilityTestCase,
+             AppendDataTestCase,
+             H5DataWriterTestCase,
+             CompiledConditionalTestCase,
+             RepositorySyncTestCase,
+             RecordViewQueryTestCase,
+             DatabaseAdapterTestCase,
+             MFTableChangeDetectionTestCase,
+             BatchAgeTestCase,
+             EthernetCommunicatorTestCase,
+             LatencyHistogramTestCase,
+             PublishOutboxTestCase,
+             ScriptCacheTestCase,
+             PollSchedulerTestCase,
+             MeasurementBufferTestCase,
+             AddMeasurementsTestCase,
+             ScanRecorderTestCase,
+             CSVScanWriterTestCase,
+             FitCacheTestCase,
+             ProgressLoaderTestCase,
+             DeviceBringupTestCase,
+             DVCPersisterInitializeTestCase,
+             DVCSyncRepositoriesTestCase,
+             WindowSweepTestCase)
 
     for t in tests:
         suite.addTest(loader.loadTestsFromTestCase(t))
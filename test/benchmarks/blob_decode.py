@@ -0,0 +1,93 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+compare the struct based blob decoding/encoding with the numpy implementation in binpack
+
+    python -m test.benchmarks.blob_decode
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import struct
+import timeit
+
+from numpy import array, linspace, random, allclose
+
+from pychron.core.helpers.binpack import unpack_xy, pack_xy
+
+NCOUNTS = 300
+NDETECTORS = 8
+NRUNS = 50
+
+
+def old_unpack(blob, endianness='>'):
+    x, y = zip(*[struct.unpack('{}ff'.format(endianness), blob[i:i + 8]) for i in range(0, len(blob), 8)])
+    return array(x), array(y)
+
+
+def old_pack(xs, ys, endianness='>'):
+    fmt = '{}ff'.format(endianness)
+    return b''.join((struct.pack(fmt, x, y) for x, y in zip(xs, ys)))
+
+
+def make_run():
+    """
+        one run = signal, baseline and sniff blob for each detector
+    """
+    xs = linspace(0, NCOUNTS * 1.048, NCOUNTS)
+    blobs = []
+    for i in range(NDETECTORS * 3):
+        ys = 100 * random.random() + random.normal(size=NCOUNTS)
+        blobs.append((xs, ys, old_pack(xs, ys)))
+    return blobs
+
+
+def main():
+    runs = [make_run() for _ in range(NRUNS)]
+
+    for blobs in runs:
+        for xs, ys, blob in blobs:
+            ox, oy = old_unpack(blob)
+            nx, ny = unpack_xy(blob)
+            assert allclose(ox, nx) and allclose(oy, ny)
+            assert old_pack(xs, ys) == pack_xy(xs, ys)
+
+    def decode(func):
+        def f():
+            for blobs in runs:
+                for _, _, blob in blobs:
+                    func(blob)
+        return f
+
+    def encode(func):
+        def f():
+            for blobs in runs:
+                for xs, ys, _ in blobs:
+                    func(xs, ys)
+        return f
+
+    n = 5
+    print('{} runs, {} detectors, {} counts'.format(NRUNS, NDETECTORS, NCOUNTS))
+    for name, old, new in (('decode', decode(old_unpack), decode(unpack_xy)),
+                           ('encode', encode(old_pack), encode(pack_xy))):
+        ot = min(timeit.repeat(old, number=1, repeat=n)) / NRUNS
+        nt = min(timeit.repeat(new, number=1, repeat=n)) / NRUNS
+        print('{:<8s} per run old={:0.3f}ms new={:0.3f}ms speedup={:0.1f}x'.format(name, ot * 1000, nt * 1000,
+                                                                                    ot / nt))
+
+
+if __name__ == '__main__':
+    main()
+# ============= EOF =============================================
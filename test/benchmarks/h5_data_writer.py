@@ -0,0 +1,119 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+compare the per row hdf5 writer with H5DataWriter. reports the write time per count
+
+    python -m test.benchmarks.h5_data_writer
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import time
+
+from numpy import random
+
+from pychron.experiment.automated_run.persistence import H5DataWriter
+from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+NDETECTORS = 10
+NCOUNTS = 1000
+# rows written per batch. the DataCollector drains its queue about once a second
+BATCH = 5
+
+
+class Detector(object):
+    def __init__(self, name, isotope):
+        self.name = name
+        self.isotope = isotope
+
+
+class Persister(object):
+    def __init__(self, dm):
+        self.data_manager = dm
+
+    def debug(self, msg):
+        pass
+
+
+def old_writer(dm, grpname):
+    """
+        the previous closure returned by AutomatedRunPersister.get_data_writer
+    """
+
+    def write_data(dets, x, keys, signals):
+        for det in dets:
+            k = det.name
+            if k in keys:
+                grp = '/{}/{}'.format(grpname, det.isotope)
+                t = dm.get_table(k, grp)
+                nrow = t.row
+                nrow['time'] = x
+                nrow['value'] = signals[keys.index(k)]
+                nrow.append()
+                t.flush()
+
+    return write_data
+
+
+def make_frame(path, dets):
+    dm = H5DataManager()
+    with dm.open_file(path, 'w'):
+        dm.new_group('signal')
+        for d in dets:
+            grp = dm.new_group(d.isotope, parent='/signal')
+            dm.new_table(grp, d.name, NCOUNTS)
+    return dm
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        dets = [Detector('D{}'.format(i), 'Ar{}'.format(i)) for i in range(NDETECTORS)]
+        keys = [d.name for d in dets]
+        rows = [(i, keys, random.random(NDETECTORS)) for i in range(NCOUNTS)]
+
+        p = os.path.join(root, 'old.hdf5')
+        dm = make_frame(p, dets)
+        writer = old_writer(dm, 'signal')
+        with dm.open_file(p):
+            st = time.time()
+            for x, ks, signals in rows:
+                writer(dets, x, ks, signals)
+            ot = time.time() - st
+
+        p = os.path.join(root, 'new.hdf5')
+        dm = make_frame(p, dets)
+        writer = H5DataWriter(Persister(dm), 'signal')
+        with dm.open_file(p):
+            st = time.time()
+            for i in range(0, NCOUNTS, BATCH):
+                writer.write_rows(dets, rows[i:i + BATCH])
+            writer.flush()
+            nt = time.time() - st
+
+        print('{} detectors, {} counts, batch={}'.format(NDETECTORS, NCOUNTS, BATCH))
+        print('per count old={:0.3f}ms new={:0.3f}ms speedup={:0.1f}x'.format(ot / NCOUNTS * 1000,
+                                                                              nt / NCOUNTS * 1000,
+                                                                              ot / nt))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
+# ============= EOF =============================================
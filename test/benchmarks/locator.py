@@ -0,0 +1,127 @@
+# ===============================================================================
+# Copyright 2018 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+    benchmark Locator.find over a folder of recorded frames, e.g. autocenter snapshots.
+
+    each frame is located sequentially (threshold_workers=1) and with the concurrent threshold sweep. the per-frame
+    latency of both and whether they found the same offset is reported
+
+    python -m test.benchmarks.locator /path/to/frames --dim 20 --workers 4
+"""
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from __future__ import absolute_import
+from __future__ import print_function
+
+import argparse
+import os
+import time
+
+# ============= local library imports  ==========================
+from pychron.globals import globalv
+from pychron.image.cv_wrapper import load_image
+
+EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+
+class BenchmarkImage(object):
+    """
+        minimal stand in for the FrameImage used by the autocenter managers
+    """
+
+    def __init__(self, frame):
+        self.source_frame = frame
+
+    def set_frame(self, frame):
+        pass
+
+
+def get_locator(kind, pxpermm):
+    if kind == 'diode':
+        from pychron.mv.diode_locator import DiodeLocator
+        return DiodeLocator(pxpermm=pxpermm)
+    else:
+        from pychron.mv.co2_locator import CO2Locator
+        return CO2Locator(pxpermm=pxpermm)
+
+
+def list_frames(root):
+    return [os.path.join(root, p) for p in sorted(os.listdir(root))
+            if os.path.splitext(p)[1].lower() in EXTENSIONS]
+
+
+def locate(locator, frame, dim, workers):
+    locator.threshold_workers = workers
+    st = time.time()
+    dx, dy = locator.find(BenchmarkImage(frame.copy()), frame.copy(), dim)
+    return time.time() - st, dx, dy
+
+
+def same(a, b, tol=1e-6):
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) < tol
+
+
+def benchmark(root, dim, workers=4, kind='co2', pxpermm=23.0):
+    """
+        return a list of (name, sequential latency, concurrent latency, parity)
+    """
+    locator = get_locator(kind, pxpermm)
+    rows = []
+    try:
+        for p in list_frames(root):
+            frame = load_image(p)
+            st, sdx, sdy = locate(locator, frame, dim, 1)
+            ct, cdx, cdy = locate(locator, frame, dim, workers)
+            rows.append((os.path.basename(p), st, ct, same(sdx, cdx) and same(sdy, cdy)))
+    finally:
+        locator.close()
+    return rows
+
+
+def report(rows):
+    print('{:<40s} {:>12s} {:>12s} {:>8s}'.format('frame', 'seq (ms)', 'conc (ms)', 'parity'))
+    for name, st, ct, parity in rows:
+        print('{:<40s} {:>12.1f} {:>12.1f} {:>8s}'.format(name, st * 1000, ct * 1000, str(parity)))
+
+    if rows:
+        n = len(rows)
+        sts = sum(r[1] for r in rows)
+        cts = sum(r[2] for r in rows)
+        print('frames={} mean seq={:0.1f}ms mean conc={:0.1f}ms speedup={:0.2f} parity={}/{}'.format(
+            n, sts / n * 1000, cts / n * 1000, sts / cts if cts else 0, sum(r[3] for r in rows), n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the machine vision threshold sweep')
+    parser.add_argument('root', help='folder of recorded frames')
+    parser.add_argument('--dim', type=float, default=20, help='target radius in pixels')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--kind', choices=('co2', 'diode'), default='co2')
+    parser.add_argument('--pxpermm', type=float, default=23.0)
+    args = parser.parse_args()
+
+    globalv.use_warning_display = False
+    globalv.use_logger_display = False
+
+    report(benchmark(args.root, args.dim, args.workers, args.kind, args.pxpermm))
+
+
+if __name__ == '__main__':
+    main()
+
+# ============= EOF =============================================